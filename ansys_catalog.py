@@ -0,0 +1,161 @@
+import collections
+import functools
+import os
+import pathlib
+import re
+
+# Директория с результатами ANSYS.
+RESULTS_DIR = str(pathlib.Path(__file__).parent.resolve()) + '/ANSYS/results/'
+# Директория с результатами локального расчета методом конечных элементов (см. fem.py) в том же формате.
+FEM_RESULTS_DIR = str(pathlib.Path(__file__).parent.resolve()) + '/ANSYS/fem_results/'
+
+# Величины, для которых строятся графики: прогиб W и напряжения S_X, S_XY.
+QUANTITIES = ('W', 'SX', 'SXY')
+
+# Шаблон имени файла (см. plot.get_file_name), например Steel_Rubber_conc012_h005_SX_uniform.txt.
+FILE_NAME_PATTERN = re.compile(r'^(?P<material>.+)_conc(?P<concentration>\d+)_h(?P<h>\d+)'
+                               r'_(?P<quantity>[A-Z]+)_(?P<type_of_loading>[a-z]+)\.txt$')
+
+# Запись каталога: параметры примера, извлеченные из имени файла, и само имя файла.
+Entry = collections.namedtuple('Entry', ('material', 'concentration', 'h', 'quantity', 'type_of_loading',
+                                         'file_name'))
+
+
+def get_concentration_code(concentration):
+    # Концентрация кодируется в имени файла так же, как в plot.get_file_name.
+    return int(concentration * 100)
+
+
+def get_h_code(h):
+    # Толщина кодируется в имени файла так же, как в plot.get_file_name.
+    return str(h).replace('.', '')
+
+
+def get_file_name(material, concentration, h, quantity, type_of_loading):
+    """
+    Данная функция возвращает имя файла с результатами ANSYS для примера (как plot.get_file_name).
+    :param material: начало названия файла (ansys_file_name в materials.py).
+    :param concentration: концентрация включений.
+    :param h: толщина пластины.
+    :param quantity: величина (см. QUANTITIES).
+    :param type_of_loading: вид нагрузки.
+    :return: имя файла, например Steel_Rubber_conc012_h005_SX_uniform.txt.
+    """
+    return f"{material}_conc0{get_concentration_code(concentration)}_h{get_h_code(h)}_{quantity}_{type_of_loading}.txt"
+
+
+class AnsysCatalog:
+    """
+    Каталог файлов с результатами ANSYS: директория просматривается один раз, имена файлов разбираются и
+    складываются в индекс, по которому затем выполняются все запросы (без обращений к файловой системе).
+    """
+
+    def __init__(self, path=RESULTS_DIR):
+        self.path = str(path)
+        self.entries = []
+        # Файлы, имена которых не соответствуют шаблону.
+        self.unparsed = []
+        self._index = {}
+
+        with os.scandir(self.path) as iterator:
+            names = sorted(entry.name for entry in iterator if entry.is_file())
+        for name in names:
+            match = FILE_NAME_PATTERN.match(name)
+            if match is None:
+                self.unparsed.append(name)
+                continue
+            concentration, h = match['concentration'], match['h']
+            entry = Entry(match['material'], int(concentration) / 100, float(h[0] + '.' + h[1:]), match['quantity'],
+                          match['type_of_loading'], name)
+            self.entries.append(entry)
+            self._index[(entry.material, int(concentration), h, entry.quantity, entry.type_of_loading)] = entry
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, material, concentration, h, quantity, type_of_loading):
+        """
+        Данная функция ищет файл с результатами для заданного примера.
+        :param material: начало названия файла (ansys_file_name в materials.py).
+        :param concentration: концентрация включений.
+        :param h: толщина пластины.
+        :param quantity: величина (см. QUANTITIES).
+        :param type_of_loading: вид нагрузки.
+        :return: запись каталога или None, если такого файла нет.
+        """
+        return self._index.get((material, get_concentration_code(concentration), get_h_code(h), quantity,
+                                type_of_loading))
+
+    def get_path(self, material, concentration, h, quantity, type_of_loading):
+        """
+        Данная функция ищет файл с результатами для заданного примера (см. get).
+        :return: путь к файлу или None, если такого файла нет.
+        """
+        entry = self.get(material, concentration, h, quantity, type_of_loading)
+        return None if entry is None else os.path.join(self.path, entry.file_name)
+
+    def find(self, material=None, concentration=None, h=None, quantity=None, type_of_loading=None):
+        """
+        Данная функция выбирает записи каталога, удовлетворяющие заданным условиям (None - любое значение).
+        :return: список записей каталога.
+        """
+        conditions = {'material': material, 'quantity': quantity, 'type_of_loading': type_of_loading}
+        conditions = {key: value for key, value in conditions.items() if value is not None}
+        result = []
+        for entry in self.entries:
+            if any(getattr(entry, key) != value for key, value in conditions.items()):
+                continue
+            if concentration is not None and \
+                    get_concentration_code(entry.concentration) != get_concentration_code(concentration):
+                continue
+            if h is not None and get_h_code(entry.h) != get_h_code(h):
+                continue
+            result.append(entry)
+        return result
+
+    def values(self, field, **conditions):
+        """
+        Данная функция возвращает все значения поля для записей, удовлетворяющих условиям (см. find). Например,
+        catalog.values('h', material='Steel_Rubber', concentration=0.12, quantity='W', type_of_loading='uniform').
+        :param field: поле записи (см. Entry).
+        :return: отсортированный список различных значений.
+        """
+        return sorted({getattr(entry, field) for entry in self.find(**conditions)})
+
+    def get_gaps(self, data, quantities=QUANTITIES):
+        """
+        Данная функция находит примеры, для которых нет результатов ANSYS.
+        :param data: список примеров (подробнее см. файл materials.py).
+        :param quantities: величины, результаты для которых должны быть в каталоге.
+        :return: список пар (пример, список отсутствующих величин).
+        """
+        gaps = []
+        for a in data:
+            missing = [quantity for quantity in quantities
+                       if self.get(a['ansys_file_name'], a['concentration'], a['h'], quantity,
+                                   a['type_of_loading']) is None]
+            if missing:
+                gaps.append((a, missing))
+        return gaps
+
+
+@functools.lru_cache(maxsize=None)
+def get_catalog(path=RESULTS_DIR):
+    """
+    Данная функция возвращает каталог для директории, просматривая ее только при первом обращении в данном процессе.
+    :param path: директория с результатами ANSYS.
+    :return: объект AnsysCatalog.
+    """
+    return AnsysCatalog(path)
+
+
+if __name__ == '__main__':
+    import materials
+
+    catalog = get_catalog()
+    print(f"Файлов с результатами ANSYS: {len(catalog)}")
+    for name in catalog.unparsed:
+        print(f"ERROR: имя файла не соответствует шаблону: {name}")
+    for a, missing in catalog.get_gaps(materials.data):
+        print(f"Нет результатов ANSYS для примера {a['ansys_file_name']} (concentration={a['concentration']}, "
+              f"h={a['h']}, {a['type_of_loading']}): {', '.join(missing)}")
@@ -0,0 +1,78 @@
+import hashlib
+import os
+import pathlib
+import tempfile
+import numpy as np
+
+# Директория бинарных копий (.npy) файлов с результатами ANSYS (по умолчанию .cache/ansys в корне репозитория).
+CACHE_DIR = os.environ.get('PLATE_BANDING_ANSYS_CACHE',
+                           str(pathlib.Path(__file__).parent.resolve()) + '/.cache/ansys')
+
+
+def parse_results(file_path, columns=2):
+    """
+    Данная функция считывает текстовый файл с результатами ANSYS (*MWRITE) целиком за один вызов np.loadtxt. Числа в
+    формате APDL вида "-.00176248" (без нуля перед точкой) поддерживаются.
+    :param file_path: путь к файлу.
+    :param columns: количество столбцов в файле.
+    :return: массив формы (количество строк, columns).
+    """
+    try:
+        data = np.loadtxt(file_path, dtype=float, ndmin=2)
+    except ValueError as error:
+        raise ValueError(f"Некорректный файл результатов ANSYS: {file_path} ({error})") from None
+    if data.size and data.shape[1] != columns:
+        raise ValueError(f"Некорректный файл результатов ANSYS: {file_path} (количество столбцов {data.shape[1]} "
+                         f"вместо {columns})")
+    return data.reshape(-1, columns)
+
+
+def load_results(file_path, a=1, b=0, columns=2, cache_dir=CACHE_DIR):
+    """
+    Данная функция загружает файл с результатами ANSYS. При первом чтении в кэше сохраняется бинарная копия
+    (.npy), которая затем отображается в память; копия считается устаревшей, если изменились размер или время
+    изменения исходного файла.
+    :param file_path: путь к файлу.
+    :param a: коэффициент растяжения оси x.
+    :param b: смещение оси x.
+    :param columns: количество столбцов в файле.
+    :param cache_dir: директория бинарных копий (None - без кэширования).
+    :return: два массива NumPy: значения x * a - b и y.
+    """
+    data = _load_cached(file_path, columns, cache_dir) if cache_dir else parse_results(file_path, columns)
+    # Поскольку размеры пластины для разных примеров бывают разными, то приходится приводить параметры
+    # к одному масштабу для дальнейшего сравнения результатов.
+    return data[:, 0] * a - b, np.array(data[:, 1])
+
+
+def clear_cache(cache_dir=CACHE_DIR):
+    """
+    Данная функция удаляет все бинарные копии файлов с результатами ANSYS.
+    """
+    for path in pathlib.Path(cache_dir).glob('*.npy'):
+        path.unlink(missing_ok=True)
+
+
+def _load_cached(file_path, columns, cache_dir):
+    # Имя бинарной копии состоит из хэша абсолютного пути, размера и времени изменения исходного файла.
+    stat = os.stat(file_path)
+    name = hashlib.sha256(str(pathlib.Path(file_path).resolve()).encode('utf-8')).hexdigest()
+    sidecar = pathlib.Path(cache_dir) / f"{name}_{stat.st_size}_{stat.st_mtime_ns}.npy"
+    try:
+        data = np.load(sidecar, mmap_mode='r')
+        if data.ndim == 2 and data.shape[1] == columns:
+            return data
+    except (OSError, ValueError):
+        pass
+
+    data = parse_results(file_path, columns)
+    sidecar.parent.mkdir(parents=True, exist_ok=True)
+    # Удаляем устаревшие копии этого же файла.
+    for stale in sidecar.parent.glob(name + '_*.npy'):
+        stale.unlink(missing_ok=True)
+    # Запись через временный файл, чтобы параллельные процессы не прочитали файл частично.
+    fd, tmp_path = tempfile.mkstemp(dir=sidecar.parent, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as file:
+        np.save(file, data)
+    os.replace(tmp_path, sidecar)
+    return data
@@ -0,0 +1,309 @@
+import json
+import os
+import pathlib
+import ansys_catalog
+import moduli
+import stiffness
+
+# Размеры пластины (см. ANSYS/input_files/input.txt): длина и ширина; толщина задается примером.
+LENGTH = 1
+WIDTH = 0.5
+
+# Разбиение по умолчанию: количество элементов вдоль осей Ox (длина), Oy (толщина) и Oz (ширина).
+MESH = (150, 40, 40)
+
+# Количество точек на каждой половине пути при выводе результатов.
+PATH_POINTS = 80
+
+# Директория, в которую по умолчанию записываются input-файлы и манифест.
+OUTPUT_DIR = str(pathlib.Path(__file__).parent.resolve()) + '/ANSYS/input_files/generated'
+
+# Имя файла манифеста: по одной строке JSON на каждый input-файл.
+MANIFEST = 'manifest.jsonl'
+
+# Сечения x, в которых выводятся напряжения S_X и S_XY (как в compute.py и theories.py).
+SECTIONS = {'uniform': {'SX': 'length/2', 'SXY': 'length/4'}, 'focused': {'SX': 'length/4', 'SXY': 'length/4'}}
+
+# Нагрузка на верхнюю грань пластины: равномерно распределенная с плотностью p0 = height**3 или сосредоточенная
+# в сечении x = length/2 с той же погонной плотностью (по ширине пластины), распределенная по узлам этой линии.
+LOADS = {
+    'uniform': """\
+! Задание равномерно распределенной нагрузки с плотностью p0 = (height)^3
+ASEL,S,LOC,Y,Height
+SFA,ALL,1,PRES,p0
+ALLSEL
+""",
+    'focused': """\
+! Задание сосредоточенной нагрузки в сечении x = length/2 с погонной плотностью p0 = (height)^3: сила p0*width
+! распределяется по узлам линии (крайним узлам - половина доли)
+NSEL,S,LOC,Y,Height
+NSEL,R,LOC,X,Length/2
+F,ALL,FY,-p0*Width/DZZ
+NSEL,R,LOC,Z,0.0
+F,ALL,FY,-p0*Width/DZZ/2
+NSEL,S,LOC,Y,Height
+NSEL,R,LOC,X,Length/2
+NSEL,R,LOC,Z,Width
+F,ALL,FY,-p0*Width/DZZ/2
+ALLSEL
+""",
+}
+
+# Материал задается эффективными модулями. Оси ANSYS: X - вдоль пластины (ось 1), Y - по толщине (ось 3),
+# Z - по ширине (ось 2); коэффициенты Пуассона PRXY, PRYZ, PRXZ - главные (nu_XY - сжатие вдоль Y при растяжении
+# вдоль X).
+PROPERTIES = {'EX': lambda m: m['E_1'], 'EY': lambda m: m['E_3'], 'EZ': lambda m: m['E_2'],
+              'PRXY': lambda m: m['n_13'], 'PRYZ': lambda m: m['E_3'] * m['n_23'] / m['E_2'],
+              'PRXZ': lambda m: m['n_12'], 'GXY': lambda m: m['G_13'], 'GYZ': lambda m: m['G_23'],
+              'GXZ': lambda m: m['G_12']}
+
+# Вывод результатов по пути из трех узлов: массив, путь и величина (прогиб выводится вдоль срединной линии
+# пластины, напряжения - по толщине в сечении SECTIONS).
+OUTPUTS = {'W': ('MARRAY', 'First', 'U,Y', 'UY'), 'SX': ('SARRAYX', 'Second', 'S,X', 'SX'),
+           'SXY': ('SARRAYXY', 'Third', 'S,XY', 'SXY')}
+
+DECK = """\
+!-------------------------------------------------------------------------------
+! {title}
+! Создан apdl.py, результаты: {outputs}
+!-------------------------------------------------------------------------------
+! Основные параметры
+!-------------------------------------------------------------------------------
+Length = {length}        ! Длина пластины
+Width = {width}       ! Ширина пластины
+Height = {height}     ! Высота пластины
+DXX = {dxx}          ! Количество элементов при разбиении вдоль оси Ox
+DYY = {dyy}          ! Количество элементов при разбиении вдоль оси Oy
+DZZ = {dzz}          ! Количество элементов при разбиении вдоль оси Oz
+p0 = Height**3    ! Плотность нагрузки, действующей на верхнюю грань пластины
+
+CSYS,0
+/PREP7
+
+! Задание элемента
+ET,1,SOLID185
+
+! Задание пластины в виде параллелепипеда с указанными значениями
+BLOCK,,Length,,Height,,Width,
+
+!-------------------------------------------------------------------------------
+!  Задание материала (эффективные модули)
+!-------------------------------------------------------------------------------
+MPTEMP,,,,,,,,
+MPTEMP,1,0
+{material}
+!-------------------------------------------------------------------------------
+!Разбиение
+!-------------------------------------------------------------------------------
+LESIZE,1,,,DYY
+LESIZE,3,,,DYY
+LESIZE,6,,,DYY
+LESIZE,8,,,DYY
+
+LESIZE,2,,,DXX
+LESIZE,4,,,DXX
+LESIZE,5,,,DXX
+LESIZE,7,,,DXX
+
+LESIZE,9,,,DZZ
+LESIZE,10,,,DZZ
+LESIZE,11,,,DZZ
+LESIZE,12,,,DZZ
+
+MSHKEY,1
+VMESH,1
+
+CSYS,0
+
+!-------------------------------------------------------------------------------
+! Закрепление и задание нагрузки
+!-------------------------------------------------------------------------------
+!Закрепление левого торца по перемещениям Ux,Uy,Uz
+NSEL,S,LOC,Y,height/2
+NSEL,R,LOC,X,0.0
+D,ALL,UX,0.0
+D,ALL,UY,0.0
+D,ALL,UZ,0.0
+ALLSEL
+
+!Закрепление правого торца лишь по Uy
+NSEL,S,LOC,Y,height/2
+NSEL,R,LOC,X,Length
+D,ALL,UY,0.0
+ALLSEL
+
+{load}
+!-------------------------------------------------------------------------------
+! Решение
+!-------------------------------------------------------------------------------
+/SOLU
+ANTYPE,STATIC
+SOLVE
+
+!-------------------------------------------------------------------------------
+! Постобработка
+!-------------------------------------------------------------------------------
+/POST1
+SET,LAST
+CSYS,0
+RSYS,0
+{outputs_block}"""
+
+
+def get_mesh_name(mesh):
+    # Название разбиения (директория с input-файлами), например mesh_150x40x40.
+    return 'mesh_' + 'x'.join(str(n) for n in mesh)
+
+
+def check_mesh(mesh, type_of_loading):
+    """
+    Данная функция проверяет разбиение: для сосредоточенной нагрузки в сечении x = length/2 должны быть узлы.
+    :param mesh: количество элементов (DXX, DYY, DZZ).
+    :param type_of_loading: вид нагрузки.
+    """
+    if len(mesh) != 3 or any(int(n) != n or n < 1 for n in mesh):
+        raise ValueError(f"Разбиение должно задаваться тремя натуральными числами (DXX, DYY, DZZ): {mesh}")
+    if type_of_loading == 'focused' and mesh[0] % 2:
+        raise ValueError(f"Для сосредоточенной нагрузки количество элементов DXX должно быть четным: {mesh}")
+
+
+def get_outputs(a, h=None, type_of_loading=None):
+    """
+    Данная функция возвращает имена файлов с результатами, которые создаст input-файл примера (они совпадают
+    с именами файлов в ANSYS/results, см. ansys_catalog.get_file_name).
+    :param a: данные для примера (подробнее см. файл materials.py).
+    :param h: толщина пластины (по умолчанию из примера).
+    :param type_of_loading: вид нагрузки (по умолчанию из примера).
+    :return: словарь: величина (см. ansys_catalog.QUANTITIES) - имя файла.
+    """
+    h = a['h'] if h is None else h
+    type_of_loading = a['type_of_loading'] if type_of_loading is None else type_of_loading
+    return {quantity: ansys_catalog.get_file_name(a['ansys_file_name'], a['concentration'], h, quantity,
+                                                  type_of_loading)
+            for quantity in ansys_catalog.QUANTITIES}
+
+
+def get_deck(a, modules, h=None, type_of_loading=None, mesh=MESH):
+    """
+    Данная функция формирует input-файл ANSYS APDL для примера (по образцу ANSYS/input_files/input.txt).
+    :param a: данные для примера (подробнее см. файл materials.py).
+    :param modules: эффективные модули (словарь или структурированный массив с полями moduli.MODULES).
+    :param h: толщина пластины (по умолчанию из примера).
+    :param type_of_loading: вид нагрузки (по умолчанию из примера).
+    :param mesh: количество элементов (DXX, DYY, DZZ).
+    :return: текст input-файла.
+    """
+    h = a['h'] if h is None else h
+    type_of_loading = a['type_of_loading'] if type_of_loading is None else type_of_loading
+    check_mesh(mesh, type_of_loading)
+    outputs = get_outputs(a, h, type_of_loading)
+
+    material = ''.join(f"MPDATA,{name},1,,{float(get(modules))!r}\n" for name, get in PROPERTIES.items())
+    blocks = []
+    for quantity, (array, path, item, label) in OUTPUTS.items():
+        if quantity == 'W':
+            nodes = ('0.0,height/2,width/2', 'length/2,height/2,width/2', 'length,height/2,width/2')
+            columns = (f"{array}(p, 2), PATH, , ITEM, {label}", f"{array}(p, 1), PATH, , ITEM, XG")
+        else:
+            x = SECTIONS[type_of_loading][quantity]
+            nodes = (f"{x},0.0,width/2", f"{x},height/2,width/2", f"{x},height,width/2")
+            columns = (f"{array}(p, 1), PATH, , ITEM, YG", f"{array}(p, 2), PATH, , ITEM, {label}")
+        name = outputs[quantity][:-len('.txt')]
+        blocks.append(f"""
+! Вывод результатов {quantity}
+path_points = {PATH_POINTS}
+
+*DIM, {array}, ARRAY, 2*path_points+1, 2
+
+ni = NODE({nodes[0]})
+nj = NODE({nodes[1]})
+nk = NODE({nodes[2]})
+
+PATH,{path},3,, path_points
+PPATH,1,ni
+PPATH,2,nj
+PPATH,3,nk
+
+PDEF, ,{item},AVG
+
+*DO, p, 1, 2*path_points+1
+*GET, {columns[0]}, PATHPT, p
+*GET, {columns[1]}, PATHPT, p
+*ENDDO
+
+*MWRITE, {array}(1,1),{name},txt
+%10.5F     %10.8F
+
+*CFCLOS
+""")
+    title = (f"{a['name']} ({a['type']}, {a['ansys_file_name']}), concentration={a['concentration']}, h={h}, "
+             f"{type_of_loading}")
+    return DECK.format(title=title, outputs=', '.join(outputs.values()), length=LENGTH, width=WIDTH, height=h,
+                       dxx=mesh[0], dyy=mesh[1], dzz=mesh[2], material=material, load=LOADS[type_of_loading],
+                       outputs_block=''.join(blocks))
+
+
+def write_decks(examples, path=OUTPUT_DIR, meshes=(MESH,), thicknesses=None, loadings=None, missing_only=False):
+    """
+    Данная функция записывает input-файлы для всех сочетаний примеров, толщин, видов нагрузки и разбиений, а также
+    манифест для очереди расчетов: path/<разбиение>/<имя>.inp и path/manifest.jsonl (по строке JSON на input-файл:
+    путь, ожидаемые файлы результатов, параметры примера и эффективные модули). Имя input-файла совпадает с именами
+    файлов результатов без величины, например Steel_Rubber_conc012_h005_uniform.inp.
+    :param examples: пары (номер примера, данные примера), например enumerate(materials.data).
+    :param path: директория для input-файлов.
+    :param meshes: разбиения (DXX, DYY, DZZ).
+    :param thicknesses: толщины пластины (по умолчанию толщина из примера).
+    :param loadings: виды нагрузки (по умолчанию вид нагрузки из примера).
+    :param missing_only: пропускать сочетания, для которых в ANSYS/results уже есть все результаты.
+    :return: список записей манифеста.
+    :raises ValueError: если разные сочетания получают одно имя (концентрация и толщина кодируются в имени файла с
+                        округлением, см. ansys_catalog.get_file_name).
+    """
+    path = pathlib.Path(path)
+    catalog = ansys_catalog.get_catalog() if missing_only else None
+    manifest = []
+    # Имя input-файла -> параметры, для которых он записан, и номер примера.
+    names = {}
+    for n, a in examples:
+        modules = moduli.get_modules(a)
+        if modules is None:
+            continue
+        modules = dict(zip(moduli.MODULES, modules))
+        if stiffness.get_stiffness_batch(modules)['flags']:
+            print(f"ERROR: Пример №{n} ({a['ansys_file_name']}): матрица податливости не является положительно "
+                  f"определенной, input-файл не создан")
+            continue
+        for h in thicknesses or (a['h'],):
+            for type_of_loading in loadings or (a['type_of_loading'],):
+                outputs = get_outputs(a, h, type_of_loading)
+                if catalog is not None and all(catalog.get(a['ansys_file_name'], a['concentration'], h, quantity,
+                                                           type_of_loading) for quantity in outputs):
+                    continue
+                stem = outputs['W'].replace('_W_', '_')[:-len('.txt')]
+                parameters = (tuple(modules.values()), h, type_of_loading)
+                for mesh in meshes:
+                    mesh = tuple(mesh)
+                    deck = os.path.join(get_mesh_name(mesh), stem + '.inp')
+                    # Одинаковые сочетания (например, повторяющиеся примеры) записываются один раз, а разные
+                    # сочетания с одним именем (например, концентрации 0.231 и 0.235) - ошибка: результаты одного из
+                    # них были бы потеряны.
+                    if deck in names:
+                        if names[deck][0] != parameters:
+                            raise ValueError(f"Пример №{n} (concentration={a['concentration']}, h={h}) и пример "
+                                             f"№{names[deck][1]} получают одно имя input-файла {deck}: концентрация "
+                                             f"и толщина кодируются в имени с округлением")
+                        continue
+                    names[deck] = (parameters, n)
+                    (path / get_mesh_name(mesh)).mkdir(parents=True, exist_ok=True)
+                    with open(path / deck, 'w', encoding='utf-8') as file:
+                        file.write(get_deck(a, modules, h, type_of_loading, mesh))
+                    manifest.append({'deck': deck, 'directory': get_mesh_name(mesh), 'outputs': outputs,
+                                     'example': n, 'name': a['name'], 'type': a['type'],
+                                     'ansys_file_name': a['ansys_file_name'], 'concentration': a['concentration'],
+                                     'h': h, 'type_of_loading': type_of_loading, 'mesh': list(mesh),
+                                     'modules': modules})
+    path.mkdir(parents=True, exist_ok=True)
+    with open(path / MANIFEST, 'w', encoding='utf-8') as file:
+        for record in manifest:
+            file.write(json.dumps(record, ensure_ascii=False) + '\n')
+    return manifest
@@ -0,0 +1,159 @@
+import functools
+import numpy as np
+import sympy as sym
+import profiling
+from lambdify_cache import cached_lambdify
+
+# Символьные переменные: "быстрая" координата z и упругие модули пластины.
+z = sym.Symbol('z')
+C1111, C1133, C3333, C1313 = sym.symbols('C1111 C1133 C3333 C1313')
+
+# Названия многочленов по z и констант, получаемых в рамках асимптотической теории.
+POLYNOMIALS = ('P1111', 'P13111', 'P111111', 'P331111')
+CONSTANTS = ('D1111', 'D111111')
+
+
+@functools.lru_cache(maxsize=None)
+@profiling.profiled('integrate')
+def get_recurrence():
+    """
+    Данная функция выполняет рекуррентную цепочку асимптотической теории (N311_ → N1111 → N31111) в символьном виде,
+    т.е. для произвольных модулей C1111, C1133, C3333, C1313. Вывод выполняется один раз за время работы программы.
+    :return: словарь с выражениями P1111, P13111, P111111, P331111 (многочлены по z), D1111 и D111111.
+    """
+    C3311 = C1133
+    half = sym.Rational(1, 2)
+
+    # Первое приближение асимптотической теории.
+    N311_ = (C3311 / C3333) * z
+    N311_int = sym.integrate(N311_, z)
+    N311_const = - sym.integrate(N311_int, (z, -half, half))
+    N311 = N311_int + N311_const
+    P1111 = -C1111 * z + C1133 * N311_
+
+    # Второе приближение асимптотической теории.
+    N1111_ = - (sym.integrate(P1111, (z, -half, z)) + C1313 * N311) / C1313
+    N1111_int = sym.integrate(N1111_, (z, -half, z))
+    N1111_const = - sym.integrate(N1111_int, (z, -half, half))
+    N1111 = N1111_int + N1111_const
+    P13111 = C1313 * N311 + C1313 * N1111_
+    P31111 = P13111
+
+    # Третье приближение асимптотической теории.
+    N31111_ = - (sym.integrate(P31111, (z, -half, z)) + C3311 * N1111) / C3333
+    P331111 = C1133 * N1111 + C3333 * N31111_
+    P111111 = C1111 * N1111 + C1133 * N31111_
+
+    # Тензор изгибных жесткостей.
+    D1111 = sym.integrate(z * P1111, (z, -half, half))
+    D111111 = sym.integrate(z * P111111, (z, -half, half))
+
+    return {'P1111': P1111, 'P13111': P13111, 'P111111': P111111, 'P331111': P331111,
+            'D1111': D1111, 'D111111': D111111}
+
+
+@functools.lru_cache(maxsize=None)
+def get_coefficient_expressions():
+    """
+    Данная функция возвращает величины асимптотической теории в виде списка выражений: коэффициенты многочленов
+    P1111, P13111, P111111, P331111 (по возрастанию степеней z), затем константы D1111, D111111.
+    """
+    recurrence = get_recurrence()
+    coefficients = []
+    for name in POLYNOMIALS:
+        coefficients += [sym.factor(c) for c in reversed(sym.Poly(sym.expand(recurrence[name]), z).all_coeffs())]
+    for name in CONSTANTS:
+        coefficients.append(sym.factor(recurrence[name]))
+    return coefficients
+
+
+@functools.lru_cache(maxsize=None)
+def get_kernel():
+    """
+    Данная функция строит численное ядро асимптотической теории: коэффициенты многочленов P1111, P13111, P111111,
+    P331111 (по возрастанию степеней z) и константы D1111, D111111 как функции модулей C1111, C1133, C3333, C1313.
+    :return: функция (C1111, C1133, C3333, C1313) -> список коэффициентов, совместимая с массивами NumPy.
+    """
+    return cached_lambdify((C1111, C1133, C3333, C1313), get_coefficient_expressions(), modules=['numpy'], cse=True)
+
+
+@functools.lru_cache(maxsize=None)
+def get_jacobian_kernel():
+    """
+    Данная функция строит численное ядро производных величин асимптотической теории (см. get_kernel) по модулям
+    C1111, C1133, C3333, C1313: производные вычисляются в символьном виде один раз.
+    :return: функция (C1111, C1133, C3333, C1313) -> список производных (для каждого коэффициента - по четырем
+             модулям подряд), совместимая с массивами NumPy.
+    """
+    derivatives = [sym.diff(c, C) for c in get_coefficient_expressions() for C in (C1111, C1133, C3333, C1313)]
+    return cached_lambdify((C1111, C1133, C3333, C1313), derivatives, modules=['numpy'], cse=True)
+
+
+@functools.lru_cache(maxsize=None)
+def get_degrees():
+    """
+    Данная функция определяет степени многочленов асимптотической теории.
+    :return: степени многочленов P1111, P13111, P111111, P331111 по z.
+    """
+    return tuple(sym.degree(sym.expand(get_recurrence()[name]), z) for name in POLYNOMIALS)
+
+
+def get_coefficients(c1111, c1133, c3333, c1313):
+    """
+    Данная функция вычисляет коэффициенты асимптотической теории для заданных модулей (скаляров или массивов).
+    :param c1111: модуль C1111.
+    :param c1133: модуль C1133 (он же C3311).
+    :param c3333: модуль C3333.
+    :param c1313: модуль C1313.
+    :return: словарь: для многочленов - массивы коэффициентов формы (..., степень + 1) по возрастанию степеней z,
+             для D1111 и D111111 - массивы формы (...).
+    """
+    c1111, c1133, c3333, c1313 = np.broadcast_arrays(*(np.asarray(c, dtype=float)
+                                                       for c in (c1111, c1133, c3333, c1313)))
+    values = [np.broadcast_to(v, c1111.shape) for v in get_kernel()(c1111, c1133, c3333, c1313)]
+    result, k = {}, 0
+    for name, degree in zip(POLYNOMIALS, get_degrees()):
+        result[name] = np.stack(values[k:k + degree + 1], axis=-1)
+        k += degree + 1
+    for name in CONSTANTS:
+        result[name] = values[k]
+        k += 1
+    return result
+
+
+def get_coefficient_jacobians(c1111, c1133, c3333, c1313):
+    """
+    Данная функция вычисляет производные величин асимптотической теории (см. get_coefficients) по модулям
+    C1111, C1133, C3333, C1313.
+    :return: словарь: для многочленов - массивы формы (..., степень + 1, 4), для D1111 и D111111 - формы (..., 4).
+    """
+    c1111, c1133, c3333, c1313 = np.broadcast_arrays(*(np.asarray(c, dtype=float)
+                                                       for c in (c1111, c1133, c3333, c1313)))
+    values = [np.broadcast_to(v, c1111.shape) for v in get_jacobian_kernel()(c1111, c1133, c3333, c1313)]
+    values = np.stack(values, axis=-1).reshape(c1111.shape + (-1, 4))
+    result, k = {}, 0
+    for name, degree in zip(POLYNOMIALS, get_degrees()):
+        result[name] = values[..., k:k + degree + 1, :]
+        k += degree + 1
+    for name in CONSTANTS:
+        result[name] = values[..., k, :]
+        k += 1
+    return result
+
+
+@profiling.profiled('asymptotic')
+def get_expressions(c1111, c1133, c3333, c1313, variable=z):
+    """
+    Данная функция возвращает величины асимптотической теории для одного материала в виде выражений SymPy, что
+    позволяет использовать их в plot.py вместо повторного символьного интегрирования для каждого примера.
+    :param c1111: модуль C1111.
+    :param c1133: модуль C1133 (он же C3311).
+    :param c3333: модуль C3333.
+    :param c1313: модуль C1313.
+    :param variable: символ координаты z.
+    :return: P1111, P13111, P111111, P331111 (многочлены по z), D1111, D111111 (числа).
+    """
+    coefficients = get_coefficients(c1111, c1133, c3333, c1313)
+    polynomials = [sum(float(c) * variable ** k for k, c in enumerate(coefficients[name])) for name in POLYNOMIALS]
+    constants = [float(coefficients[name]) for name in CONSTANTS]
+    return (*polynomials, *constants)
@@ -0,0 +1,137 @@
+import argparse
+import pathlib
+import sys
+import time
+import numpy as np
+
+root = pathlib.Path(__file__).parent.parent.resolve()
+sys.path.append(str(root))
+import inverse
+import materials
+import moduli
+import sensitivity
+import theories
+
+# Количество образцов в проверках подбора параметров (для каждого вида нагрузки).
+SPECIMENS = 5000
+
+# Относительный шаг центральных разностей в проверке градиентов sensitivity.get_output_gradients.
+STEP = 1e-6
+
+
+def get_specimens(n=SPECIMENS, seed=0):
+    # Образцы - примеры из materials.py (с корректной матрицей податливости), выбранные случайно с повторением (при
+    # n = None - все примеры по одному разу).
+    table = moduli.get_material_table(materials.data)
+    modules = moduli.get_modules_batch(*(table[key] for key in sensitivity.INPUTS), table['type'])
+    rows = np.flatnonzero(modules['flags'] == 0)
+    if n is not None:
+        rows = np.random.default_rng(seed).choice(rows, n)
+    h = np.array([a['h'] for a in materials.data])[rows]
+    return {key: value[rows] for key, value in table.items()}, modules[rows], h
+
+
+def check_fit_modules():
+    # Подбор E_1 и G_13 по кривым асимптотической теории, построенным для модулей, измененных в 0.5-2 раза.
+    table, modules, h = get_specimens()
+    rng = np.random.default_rng(1)
+    true = modules.copy()
+    for name in ('E_1', 'G_13'):
+        true[name] = modules[name] * np.exp(rng.uniform(np.log(0.5), np.log(2), len(modules)))
+    error, converged = 0, True
+    for type_of_loading in theories.LOADINGS:
+        curves = sensitivity.get_curve_jacobians(true, h, type_of_loading, inverse.X, inverse.Z)
+        fitted = inverse.fit_modules(modules, h, type_of_loading, w=curves['w'], s11=curves['s11'])
+        converged &= bool(fitted['converged'].all())
+        error = max(error, max(np.max(np.abs(fitted[name] / true[name] - 1)) for name in ('E_1', 'G_13')))
+    return error, converged
+
+
+def check_fit_constituents():
+    # Подбор концентрации по кривым асимптотической теории, построенным для концентрации, измененной на ±20%.
+    table, modules, h = get_specimens()
+    rng = np.random.default_rng(2)
+    true = dict(table, concentration=table['concentration'] * rng.uniform(0.8, 1.2, len(h)))
+    error, converged = 0, True
+    for type_of_loading in theories.LOADINGS:
+        curves = sensitivity.get_input_curve_jacobians(true, h, type_of_loading, inverse.X, inverse.Z)
+        fitted = inverse.fit_constituents(table, h, type_of_loading, w=curves['w'], s11=curves['s11'])
+        converged &= bool(fitted['converged'].all())
+        error = max(error, np.max(np.abs(fitted['concentration'] / true['concentration'] - 1)))
+    return error, converged
+
+
+def check_sensitivity_curves():
+    # Кривые sensitivity.get_curve_jacobians (собственные формулы асимптотической теории) и theories.get_curves.
+    table, modules, h = get_specimens(None)
+    index = theories.THEORIES.index('asymptotic')
+    error = 0
+    for type_of_loading in theories.LOADINGS:
+        result = sensitivity.get_curve_jacobians(modules, h, type_of_loading)
+        curves = theories.get_curves(modules, h, type_of_loading)
+        for key in ('w', 's11', 's13'):
+            expected = curves[key][..., index, :]
+            scale = np.max(np.abs(expected), axis=-1, keepdims=True)
+            error = max(error, np.max(np.abs(result[key] - expected) / scale))
+    return error, True
+
+
+def check_sensitivity_gradients():
+    # Градиенты sensitivity.get_output_gradients и центральные разности (погрешность - в долях величины на
+    # относительное изменение параметра, т.е. для коэффициентов эластичности).
+    table, modules, h = get_specimens(None)
+    names = sensitivity.INPUTS + ('h',)
+    error = 0
+    for type_of_loading in theories.LOADINGS:
+        result = sensitivity.get_output_gradients(table, h, type_of_loading)
+        for k, name in enumerate(names):
+            values = []
+            for sign in (1, -1):
+                shifted = dict(table)
+                if name == 'h':
+                    arguments = (shifted, h * (1 + sign * STEP))
+                else:
+                    shifted[name] = table[name] * (1 + sign * STEP)
+                    arguments = (shifted, h)
+                values.append(sensitivity.get_output_gradients(*arguments, type_of_loading))
+            value = h if name == 'h' else table[name]
+            for output in sensitivity.OUTPUTS:
+                difference = (values[0][output] - values[1][output]) / (2 * STEP * value)
+                error = max(error, np.max(np.abs(difference - result['d' + output][:, k]) * np.abs(value) /
+                                          np.abs(result[output])))
+    return error, True
+
+
+# Проверки: название, функция (возвращает наибольшую относительную погрешность и признак того, что все итерационные
+# процессы сошлись) и допустимая погрешность.
+CHECKS = {'fit_modules': (check_fit_modules, 1e-8),
+          'fit_constituents': (check_fit_constituents, 1e-8),
+          'sensitivity_curves': (check_sensitivity_curves, 1e-12),
+          'sensitivity_gradients': (check_sensitivity_gradients, 1e-6)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Проверки согласованности расчетных модулей.")
+    parser.add_argument('-k', '--select', nargs='+', choices=list(CHECKS), default=list(CHECKS),
+                        help="проверки, которые необходимо выполнить (по умолчанию все)")
+    args = parser.parse_args(argv)
+
+    failed = []
+    for name in args.select:
+        check, tolerance = CHECKS[name]
+        start = time.perf_counter()
+        error, converged = check()
+        elapsed = time.perf_counter() - start
+        passed = error <= tolerance and converged
+        if not passed:
+            failed.append(name)
+        print(f"{name:<23}погрешность {error:.2e} (допустимая {tolerance:.0e}){'' if converged else ', не сошлось'}, "
+              f"{elapsed:.1f} с  {'OK' if passed else 'ОШИБКА'}")
+    if failed:
+        print(f"\nНе пройдены: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
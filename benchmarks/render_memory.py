@@ -0,0 +1,60 @@
+import argparse
+import pathlib
+import resource
+import sys
+import tempfile
+import time
+import numpy as np
+
+sys.path.append(str(pathlib.Path(__file__).parent.parent.resolve()))
+import plot
+
+
+def get_rss():
+    """
+    Данная функция возвращает текущий объем резидентной памяти процесса в МБ.
+    """
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * resource.getpagesize() / 2 ** 20
+    except OSError:
+        # Вне Linux доступен лишь пиковый объем памяти.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2 ** 10
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Объем памяти при многократном построении графиков функцией "
+                                                 "plot.get_plot.")
+    parser.add_argument('-n', '--renders', type=int, default=1000, help="количество графиков (по умолчанию 1000)")
+    parser.add_argument('--step', type=int, default=100, help="через сколько графиков выводить объем памяти")
+    parser.add_argument('--filetype', default='.png', help="расширение файлов графиков (по умолчанию .png)")
+    args = parser.parse_args(argv)
+
+    plot.set_style()
+    # LaTeX не влияет на удержание фигур в памяти, но многократно замедляет построение.
+    plot.rc('text', usetex=False)
+
+    x = np.arange(0, 1, 0.001)
+    curves = [-(k + 1) * (x ** 4 - 2 * x ** 3 + x) for k in range(4)]
+    ansys = (np.linspace(0, 1, 161), -(np.linspace(0, 1, 161) ** 4 - 2 * np.linspace(0, 1, 161) ** 3))
+
+    rss = []
+    with tempfile.TemporaryDirectory() as path:
+        plot.results_path = path
+        pathlib.Path(path, 'results').mkdir()
+        start = time.perf_counter()
+        for n in range(args.renders):
+            plot.get_plot(x, curves, '', ansys, ['$x$', '$w(x)$'], 'Прогиб', 'Deflection',
+                          ('1', '2', '3', '4', 'МКЭ'), ('1', '2', '3', '4', 'FEM'), plot_name='plot',
+                          filetype=args.filetype)
+            if (n + 1) % args.step == 0:
+                rss.append(get_rss())
+                print(f"{n + 1:6d} графиков: {rss[-1]:8.1f} МБ, {(time.perf_counter() - start) / (n + 1) * 1e3:6.1f} мс "
+                      f"на график")
+
+    # Прирост памяти от первого замера до последнего: при отсутствии утечек он близок к нулю.
+    print(f"Прирост памяти: {rss[-1] - rss[0]:.1f} МБ")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,332 @@
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import pathlib
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+
+root = pathlib.Path(__file__).parent.parent.resolve()
+sys.path.append(str(root))
+import ansys_catalog
+import ansys_io
+import asymptotic
+import compute
+import lambdify_cache
+import materials
+import moduli
+import plot
+import theories
+
+# Порог относительного ухудшения (по медиане времени и по пиковой памяти), при превышении которого результат
+# считается регрессией.
+THRESHOLD = 0.2
+
+# Минимальная длительность одного повтора, с: быстрые функции вызываются в повторе несколько раз (как в timeit),
+# чтобы погрешность таймера не влияла на результат.
+MIN_TIME = 0.2
+
+
+def bench_get_modules():
+    # Эффективные модули для всех примеров из materials.py (по одному примеру за вызов).
+    def run():
+        for a in materials.data:
+            moduli.get_modules(a)
+    return run
+
+
+def bench_get_modules_batch():
+    # Эффективные модули для таблицы из 100 000 композитов.
+    rng = np.random.default_rng(0)
+    n = 100_000
+    E_c, nu_c, g = rng.uniform(1, 300, n), rng.uniform(0.1, 0.45, n), rng.uniform(0.05, 0.6, n)
+    type_code = rng.integers(0, 2, n)
+    return lambda: moduli.get_modules_batch(E_c, nu_c, g, 0.015, 0.45, type_code)
+
+
+def bench_recurrence():
+    # Символьная рекуррентная цепочка асимптотической теории (без кэша).
+    return asymptotic.get_recurrence.__wrapped__
+
+
+def bench_lambdify():
+    # Построение численного ядра асимптотической теории без дискового кэша lambdify.
+    asymptotic.get_recurrence()
+    path = tempfile.mkdtemp()
+
+    def reset():
+        lambdify_cache._functions.clear()
+        lambdify_cache.clear_cache()
+
+    def run():
+        with _patch(lambdify_cache, CACHE_DIR=path):
+            asymptotic.get_kernel.__wrapped__()
+    return run, reset
+
+
+def bench_lambdify_cached():
+    # Загрузка численного ядра асимптотической теории из дискового кэша lambdify.
+    asymptotic.get_recurrence()
+    path = tempfile.mkdtemp()
+    with _patch(lambdify_cache, CACHE_DIR=path):
+        asymptotic.get_kernel.__wrapped__()
+
+    def run():
+        with _patch(lambdify_cache, CACHE_DIR=path):
+            asymptotic.get_kernel.__wrapped__()
+    return run, lambdify_cache._functions.clear
+
+
+def bench_compute_material():
+    # Расчет всех примеров (compute.compute_material, кэш lambdify заполнен).
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            for a in materials.data:
+                compute.compute_material(a)
+    run()
+    return run
+
+
+def bench_curves():
+    # Вычисление w, σ11 и σ13 всех теорий для всех примеров (theories.get_curves).
+    table = moduli.get_material_table(materials.data)
+    modules = moduli.get_modules_batch(table['E_c'], table['nu_c'], table['concentration'], table['E_m'],
+                                       table['nu_m'], table['type'])
+    h = np.array([a['h'] for a in materials.data])
+
+    def run():
+        for loading in theories.LOADINGS:
+            theories.get_curves(modules, h, loading)
+    return run
+
+
+def bench_parse_ansys():
+    # Разбор всех текстовых файлов с результатами ANSYS (без кэша).
+    paths = [os.path.join(ansys_catalog.RESULTS_DIR, entry.file_name) for entry in ansys_catalog.AnsysCatalog().entries]
+
+    def run():
+        for path in paths:
+            ansys_io.parse_results(path)
+    return run
+
+
+def bench_load_ansys_cached():
+    # Загрузка всех файлов с результатами ANSYS из бинарных копий.
+    paths = [os.path.join(ansys_catalog.RESULTS_DIR, entry.file_name) for entry in ansys_catalog.AnsysCatalog().entries]
+    path = tempfile.mkdtemp()
+
+    def run():
+        for file_path in paths:
+            ansys_io.load_results(file_path, cache_dir=path)
+    run()
+    return run
+
+
+def bench_get_plot():
+    # Построение трех графиков (W, SX, SXY) в черновом режиме.
+    a = materials.data[1]
+    modules = moduli.get_modules_batch(a['E_c'], a['nu_c'], a['concentration'], a['E_m'], a['nu_m'],
+                                       moduli.TYPE_CODES[a['type']])
+    curves = theories.get_curves(modules, a['h'], a['type_of_loading'])
+    path = tempfile.mkdtemp()
+    pathlib.Path(path, 'results').mkdir()
+    plot.set_style(draft=True)
+
+    def run():
+        with _patch(plot, results_path=path):
+            for key, axis_x in (('w', theories.X), ('s11', theories.Z), ('s13', theories.Z)):
+                plot.get_plot(axis_x, list(curves[key]), '', [np.array([]), np.array([])], ['$x$', '$y$'],
+                              'Заголовок', 'Title', ('1', '2', '3', '4', 'МКЭ'), ('1', '2', '3', '4', 'FEM'),
+                              plot_name=key, filetype='.png')
+    run()
+    return run
+
+
+def bench_plot_run():
+    # Полный запуск plot.py (черновой режим) в копии репозитория с пустыми кэшами и хранилищем результатов.
+    path = pathlib.Path(tempfile.mkdtemp())
+    for source in root.glob('*.py'):
+        shutil.copy(source, path)
+    (path / 'ANSYS').mkdir()
+    (path / 'ANSYS' / 'results').symlink_to(root / 'ANSYS' / 'results')
+    (path / 'results').mkdir()
+    env = dict(os.environ, MPLBACKEND='Agg')
+
+    def reset():
+        shutil.rmtree(path / '.cache', ignore_errors=True)
+
+    def run():
+        subprocess.run([sys.executable, 'plot.py', '--draft'], cwd=path, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return run, reset
+
+
+# Набор замеров: название и функция подготовки, возвращающая замеряемую функцию (и, возможно, функцию, вызываемую
+# перед каждым повтором без замера времени).
+BENCHMARKS = {'get_modules': bench_get_modules,
+              'get_modules_batch': bench_get_modules_batch,
+              'recurrence': bench_recurrence,
+              'lambdify': bench_lambdify,
+              'lambdify_cached': bench_lambdify_cached,
+              'compute_material': bench_compute_material,
+              'curves': bench_curves,
+              'parse_ansys': bench_parse_ansys,
+              'load_ansys_cached': bench_load_ansys_cached,
+              'get_plot': bench_get_plot,
+              'plot_run': bench_plot_run}
+
+# Замеры, выполняемые в отдельном процессе: для них пиковая память - максимальный объем резидентной памяти процесса.
+SUBPROCESS_BENCHMARKS = ('plot_run',)
+
+
+def measure(name, repeat):
+    """
+    Данная функция выполняет замер: время одного вызова в каждом из повторов и пиковый объем памяти (отдельным
+    вызовом под tracemalloc, чтобы отслеживание памяти не искажало время).
+    :param name: название замера (см. BENCHMARKS).
+    :param repeat: количество повторов.
+    :return: словарь с результатами замера (время в секундах, память в байтах).
+    """
+    prepared = BENCHMARKS[name]()
+    run, reset = prepared if isinstance(prepared, tuple) else (prepared, None)
+
+    # Количество вызовов в повторе (для замеров с подготовкой перед каждым вызовом - один вызов).
+    number = 1
+    if reset is None:
+        while True:
+            start = time.perf_counter()
+            for _ in range(number):
+                run()
+            if time.perf_counter() - start >= MIN_TIME:
+                break
+            number *= 10
+
+    times = []
+    for _ in range(repeat):
+        if reset is not None:
+            reset()
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        times.append((time.perf_counter() - start) / number)
+
+    if reset is not None:
+        reset()
+    if name in SUBPROCESS_BENCHMARKS:
+        run()
+        peak_memory = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024
+    else:
+        tracemalloc.start()
+        run()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {'number': number, 'times': times, 'median': statistics.median(times), 'min': min(times),
+            'peak_memory': peak_memory}
+
+
+def get_environment():
+    """
+    Данная функция собирает сведения об окружении, в котором выполнялись замеры.
+    """
+    import matplotlib
+    import sympy
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=root, capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'date': datetime.datetime.now().isoformat(timespec='seconds'), 'commit': commit,
+            'python': platform.python_version(), 'platform': platform.platform(), 'cpu_count': os.cpu_count(),
+            'numpy': np.__version__, 'sympy': sympy.__version__, 'matplotlib': matplotlib.__version__}
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """
+    Данная функция сравнивает результаты замеров с базовыми.
+    :param results: результаты замеров (см. main).
+    :param baseline: базовые результаты в том же формате.
+    :param threshold: порог относительного ухудшения.
+    :return: список названий замеров с регрессиями.
+    """
+    regressions = []
+    print(f"{'замер':<20}{'время':>12}{'база':>12}{'отношение':>11}{'память':>11}{'база':>11}")
+    for name, result in results['benchmarks'].items():
+        base = baseline['benchmarks'].get(name)
+        if base is None:
+            print(f"{name:<20}{result['median']:>11.3e}s{'нет':>12}")
+            continue
+        time_ratio = result['median'] / base['median']
+        memory_ratio = result['peak_memory'] / max(base['peak_memory'], 1)
+        flags = []
+        if time_ratio > 1 + threshold:
+            flags.append('РЕГРЕССИЯ: время')
+        if memory_ratio > 1 + threshold:
+            flags.append('РЕГРЕССИЯ: память')
+        if flags:
+            regressions.append(name)
+        print(f"{name:<20}{result['median']:>11.3e}s{base['median']:>11.3e}s{time_ratio:>11.2f}"
+              f"{result['peak_memory'] / 2 ** 20:>9.1f}МБ{base['peak_memory'] / 2 ** 20:>9.1f}МБ  {', '.join(flags)}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замеры времени и памяти для основных этапов расчета.")
+    parser.add_argument('-k', '--select', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS),
+                        help="замеры, которые необходимо выполнить (по умолчанию все)")
+    parser.add_argument('-r', '--repeat', type=int, default=5, help="количество повторов (по умолчанию 5)")
+    parser.add_argument('-o', '--output', help="путь к JSON-файлу для сохранения результатов")
+    parser.add_argument('-b', '--baseline', help="JSON-файл с базовыми результатами для сравнения")
+    parser.add_argument('-t', '--threshold', type=float, default=THRESHOLD,
+                        help=f"порог относительного ухудшения (по умолчанию {THRESHOLD})")
+    args = parser.parse_args(argv)
+
+    results = {'environment': get_environment(), 'repeat': args.repeat, 'benchmarks': {}}
+    for name in args.select:
+        results['benchmarks'][name] = measure(name, args.repeat)
+        result = results['benchmarks'][name]
+        print(f"{name:<20} медиана {result['median']:.3e} с, минимум {result['min']:.3e} с, "
+              f"пиковая память {result['peak_memory'] / 2 ** 20:.1f} МБ")
+
+    if args.output:
+        pathlib.Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+        print()
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nРегрессии: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+@contextlib.contextmanager
+def _patch(module, **values):
+    # Временная замена глобальных переменных модуля.
+    old = {name: getattr(module, name) for name in values}
+    for name, value in values.items():
+        setattr(module, name, value)
+    try:
+        yield
+    finally:
+        for name, value in old.items():
+            setattr(module, name, value)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,415 @@
+import argparse
+import itertools
+import sys
+import ansys_catalog
+import material_catalog
+import materials
+
+# Модули с тяжелыми зависимостями (SymPy, matplotlib) импортируются внутри команд, которым они нужны, поэтому,
+# например, вывод эффективных модулей не тратит время на их загрузку.
+
+
+def select(examples, numbers=None, names=None, loadings=None):
+    """
+    Данная функция выбирает примеры по номерам, материалам и видам нагрузки (потоком: примеры не загружаются в память
+    все сразу).
+    :param examples: пары (номер примера, данные примера), например enumerate(materials.data) или
+                     material_catalog.read_catalog(path).
+    :param numbers: номера примеров (по умолчанию все).
+    :param names: материалы: начало названия файла ANSYS (ansys_file_name) или название компонент (name).
+    :param loadings: виды нагрузки.
+    :return: генератор пар (номер примера, данные примера).
+    """
+    numbers = None if numbers is None else set(numbers)
+    for n, a in examples:
+        if numbers is not None:
+            if n > max(numbers):
+                return
+            if n not in numbers:
+                continue
+        if (names is None or a['ansys_file_name'] in names or a['name'] in names) and \
+                (loadings is None or a['type_of_loading'] in loadings):
+            yield n, a
+
+
+def get_examples(args):
+    """
+    Данная функция возвращает выбранные примеры: из materials.py или из каталога, заданного ключом --catalog (см.
+    material_catalog.read_catalog).
+    :param args: разобранные параметры командной строки.
+    :return: генератор пар (номер примера, данные примера).
+    """
+    if args.catalog is None:
+        examples = itertools.islice(enumerate(materials.data), args.start, None)
+    else:
+        examples = material_catalog.read_catalog(args.catalog, args.start, 'skip' if args.skip_invalid else 'raise')
+    return select(examples, args.example, args.material, args.loading)
+
+
+def list_examples(args):
+    for n, a in get_examples(args):
+        print(f"{n:>3}  {a['type']:<13}{a['name']:<26}{a['ansys_file_name']:<18}{a['type_of_loading']:<9}"
+              f"c={a['concentration']:<6}h={a['h']}")
+    return 0
+
+
+def print_moduli(args):
+    import moduli
+
+    for n, a in get_examples(args):
+        modules = moduli.get_modules(a)
+        if modules is None:
+            continue
+        print(f"Пример №{n}. Модель: {a['type']}, материалы: {a['name']} ({a['ansys_file_name']}, "
+              f"concentration={a['concentration']})")
+        for name, value in zip(moduli.MODULES, modules):
+            print(f"{name}={value}")
+        print()
+    return 0
+
+
+def run(args):
+    import plot
+
+    profile = None
+    if args.profile:
+        profile = {'path': args.profile, 'memory': args.profile_memory, 'cprofile': args.cprofile}
+    stage = args.stage if args.command == 'run' else args.command
+    quantities = getattr(args, 'quantity', None) or ansys_catalog.QUANTITIES
+    checkpoint = None
+    if args.checkpoint:
+        # Расчет продолжается с контрольной точки, если она сохранена прерванным запуском.
+        checkpoint = material_catalog.Checkpoint(args.checkpoint)
+        args.start = max(args.start, checkpoint.start)
+    return plot.run(get_examples(args), plot.glob_language, stage, args.workers, args.store,
+                    getattr(args, 'draft', False), profile, tuple(quantities), checkpoint)
+
+
+def write_decks(args):
+    import apdl
+
+    meshes = [tuple(mesh) for mesh in args.mesh or (apdl.MESH,)]
+    try:
+        for mesh in meshes:
+            for type_of_loading in args.load or material_catalog.LOADINGS:
+                apdl.check_mesh(mesh, type_of_loading)
+    except ValueError as error:
+        print(f"ERROR: {error}")
+        return 1
+    output = args.output or apdl.OUTPUT_DIR
+    try:
+        manifest = apdl.write_decks(get_examples(args), output, meshes, args.h, args.load, args.missing)
+    except ValueError as error:
+        print(f"ERROR: {error}")
+        return 1
+    print(f"Input-файлов: {len(manifest)}, манифест: {output}/{apdl.MANIFEST}")
+    return 0
+
+
+def write_fem_results(args):
+    import fem
+
+    catalog = ansys_catalog.get_catalog() if args.missing else None
+    output = args.output or fem.RESULTS_DIR
+    total = 0
+    for n, a in get_examples(args):
+        if catalog is not None and not any(missing for _, missing in catalog.get_gaps([a])):
+            continue
+        try:
+            total += len(fem.write_results(a, output, tuple(args.mesh)))
+        except ValueError as error:
+            print(f"ERROR: Пример №{n} ({a['ansys_file_name']}): {error}")
+    print(f"Файлов с результатами МКЭ: {total} (директория {output})")
+    return 0
+
+
+def fit_examples(args):
+    import numpy as np
+    import inverse
+    import moduli
+    import sensitivity
+
+    if all(name in sensitivity.INPUTS + ('h',) for name in args.parameter):
+        fit = inverse.fit_constituents
+    elif all(name in sensitivity.PARAMETERS for name in args.parameter):
+        fit = inverse.fit_modules
+    else:
+        print(f"ERROR: параметры должны быть либо эффективными модулями ({', '.join(sensitivity.PARAMETERS)}), либо "
+              f"свойствами компонент ({', '.join(sensitivity.INPUTS + ('h',))})")
+        return 1
+    failed = False
+    data = [a for _, a in get_examples(args)]
+    w, s11 = inverse.load_curves(data, args.results or ansys_catalog.RESULTS_DIR)
+    if args.curve == 'w':
+        s11 = None
+    elif args.curve == 's11':
+        w = None
+    for type_of_loading in material_catalog.LOADINGS:
+        rows = [k for k, a in enumerate(data) if a['type_of_loading'] == type_of_loading]
+        if not rows:
+            continue
+        table = moduli.get_material_table([data[k] for k in rows])
+        h = np.array([data[k]['h'] for k in rows])
+        curves = {'w': None if w is None else w[rows], 's11': None if s11 is None else s11[rows]}
+        start = table
+        if fit is inverse.fit_modules:
+            start = moduli.get_modules_batch(*(table[key] for key in sensitivity.INPUTS), table['type'])
+        fitted = fit(start, h, type_of_loading, parameters=tuple(args.parameter), **curves)
+        # Примеры без результатов МКЭ не подбираются (inverse._fit возвращает для них начальные значения).
+        found = np.any([np.isfinite(curve).any(axis=-1) for curve in curves.values() if curve is not None], axis=0)
+        for j, k in enumerate(rows):
+            a = data[k]
+            if not found[j]:
+                print(f"ERROR: нет результатов МКЭ для примера {a['ansys_file_name']} (concentration="
+                      f"{a['concentration']}, h={a['h']}, {type_of_loading})")
+                failed = True
+                continue
+            values = ', '.join(f"{name}={start[name][j] if name != 'h' else h[j]:.6g} -> {fitted[name][j]:.6g}"
+                               for name in args.parameter)
+            status = '' if fitted['converged'][j] else \
+                ' (не сошлось: шаг не уменьшает невязку)' if fitted['stalled'][j] else ' (не сошлось)'
+            print(f"{a['ansys_file_name']} (concentration={a['concentration']}, h={a['h']}, {type_of_loading}): "
+                  f"{values}, rms={fitted['rms'][j]:.3g}{status}")
+    return 1 if failed else 0
+
+
+def print_gradients(args):
+    import numpy as np
+    import moduli
+    import sensitivity
+
+    data = [a for _, a in get_examples(args)]
+    names = sensitivity.INPUTS + ('h',)
+    for type_of_loading in material_catalog.LOADINGS:
+        rows = [k for k, a in enumerate(data) if a['type_of_loading'] == type_of_loading]
+        if not rows:
+            continue
+        table = moduli.get_material_table([data[k] for k in rows])
+        result = sensitivity.get_output_gradients(table, np.array([data[k]['h'] for k in rows]), type_of_loading)
+        for j, k in enumerate(rows):
+            a = data[k]
+            print(f"{a['ansys_file_name']} (concentration={a['concentration']}, h={a['h']}, {type_of_loading}):")
+            for output in sensitivity.OUTPUTS:
+                gradient = ', '.join(f"d/d{name}={value:.6g}" for name, value in zip(names, result['d' + output][j]))
+                print(f"  {output}={result[output][j]:.6g}: {gradient}")
+    return 0
+
+
+def run_design(args):
+    import numpy as np
+    import design
+
+    try:
+        space = design.get_space(args.inclusion, args.matrix, args.type,
+                                 np.linspace(args.concentration[0], args.concentration[1], int(args.concentration[2])),
+                                 args.h)
+        result = design.design(args.load, args.w_max, args.tau_max, args.objective, space, args.theory, args.workers)
+    except ValueError as error:
+        print(f"ERROR: {error}")
+        return 1
+    front = result['front']
+    print(f"Вариантов: {result['evaluated']}, допустимых: {result['feasible']}, на фронте Парето: {len(front['w'])}")
+    # Выводятся варианты, равномерно распределенные вдоль фронта (от легких/дешевых к жестким).
+    rows = np.unique(np.linspace(0, len(front['w']) - 1, min(args.top, len(front['w']))).astype(int))
+    for k in rows:
+        print(f"{space['inclusion'][front['inclusion'][k]]:<9}{space['matrix'][front['matrix'][k]]:<11}"
+              f"{space['type'][front['model'][k]]:<13}c={front['concentration'][k]:<8.4f}h={front['h'][k]:<6g}"
+              f"w={front['w'][k]:<12.6g}s13={front['s13'][k]:<12.6g}mass={front['mass'][k]:<10.4g}"
+              f"cost={front['cost'][k]:.4g}")
+    if args.output:
+        design.write_catalog(design.get_examples(result, args.load), args.output)
+        print(f"Каталог вариантов фронта Парето: {args.output}")
+    return 0
+
+
+def print_uncertainty(args):
+    import numpy as np
+    import moduli
+    import theories
+    import uncertainty
+
+    tolerances = dict(uncertainty.TOLERANCES)
+    for name, distribution, value in args.tolerance or ():
+        if name not in uncertainty.TOLERANCES and name != 'h' or distribution not in uncertainty.DISTRIBUTIONS:
+            print(f"ERROR: допуск задается для {', '.join(tuple(uncertainty.TOLERANCES) + ('h',))} распределением "
+                  f"{' или '.join(uncertainty.DISTRIBUTIONS)}")
+            return 1
+        tolerances[name] = (distribution, float(value))
+    if args.plot:
+        import plot
+        plot.set_style(args.draft)
+    percentiles = ', '.join(f"{q}%" for q in uncertainty.PERCENTILES)
+    for n, a in get_examples(args):
+        try:
+            result = uncertainty.propagate(a, samples=args.samples, tolerances=tolerances, seed=args.seed,
+                                           workers=args.workers)
+        except ValueError as error:
+            print(f"ERROR: {error}")
+            return 1
+        print(f"{a['ansys_file_name']} (concentration={a['concentration']}, h={a['h']}, {a['type_of_loading']}): "
+              f"выборок {result['valid']} из {result['samples']}, процентили {percentiles}")
+        # Процентили в характерных точках: прогиб в середине пластины, σ11 на верхней грани, σ13 на срединной линии.
+        for key, points, point in (('w', result['x'], 1 / 2), ('s11', result['z'], 1 / 2), ('s13', result['z'], 0)):
+            k = np.argmin(np.abs(points - point))
+            for j, theory in enumerate(theories.THEORIES):
+                values = ', '.join(f"{value:.6g}" for value in result[key][:, j, k])
+                nominal = result['nominal'][key][j, k]
+                print(f"  {f'{key}({points[k]:g})':<10}{theory:<15}{values} (номинальное {nominal:.6g})")
+        if args.plot:
+            modules = moduli.get_modules_batch(a['E_c'], a['nu_c'], a['concentration'], a['E_m'], a['nu_m'],
+                                               moduli.TYPE_CODES.get(a['type'], -1))
+            curves = theories.get_curves(modules, a['h'], a['type_of_loading'])
+            plot.render_material(a, dict(curves, x=theories.X, z=theories.Z), plot.glob_language,
+                                 filetype='.png' if args.draft else '.pdf',
+                                 bands=uncertainty.get_bands(result, theories.X, theories.Z))
+    return 0
+
+
+def get_parser():
+    """
+    Данная функция создает разбор параметров командной строки.
+    """
+    selection = argparse.ArgumentParser(add_help=False)
+    selection.add_argument('-n', '--example', type=int, nargs='+',
+                           help="номера примеров (по умолчанию все, список - команда list)")
+    selection.add_argument('-m', '--material', nargs='+',
+                           help="материалы: начало названия файла ANSYS (например, Steel_Rubber) или название "
+                                "компонент")
+    selection.add_argument('-l', '--loading', nargs='+', choices=material_catalog.LOADINGS, help="виды нагрузки")
+    selection.add_argument('--catalog',
+                           help="каталог материалов (JSONL, CSV или Parquet) вместо materials.py; номер примера - "
+                                "номер записи в каталоге")
+    selection.add_argument('--start', type=int, default=0,
+                           help="номер примера (записи каталога), с которого начинается чтение")
+    selection.add_argument('--skip-invalid', action='store_true',
+                           help="пропускать записи каталога с ошибками (по умолчанию ошибка прерывает чтение)")
+
+    execution = argparse.ArgumentParser(add_help=False)
+    execution.add_argument('-j', '--workers', type=int, default=1,
+                           help="количество параллельных процессов (0 - по числу ядер, по умолчанию 1)")
+    execution.add_argument('--store', default=None,
+                           help="директория хранилища результатов расчета (по умолчанию .cache/results или "
+                                "PLATE_BANDING_STORE)")
+    execution.add_argument('--profile', metavar='DIR',
+                           help="профилирование: время этапов расчета для каждого примера, отчет в директории DIR "
+                                "(profile.json и profile.txt)")
+    execution.add_argument('--profile-memory', action='store_true',
+                           help="профилирование: пиковый объем памяти этапов (tracemalloc, замедляет расчет)")
+    execution.add_argument('--cprofile', action='store_true',
+                           help="профилирование: полный профиль cProfile для каждого примера (DIR/<номер>.prof)")
+
+    execution.add_argument('--checkpoint', metavar='FILE',
+                           help="файл контрольной точки: в нем сохраняется номер записи, до которой расчет завершен, "
+                                "а повторный запуск продолжается с нее")
+
+    rendering = argparse.ArgumentParser(add_help=False)
+    rendering.add_argument('--draft', action='store_true',
+                           help="черновой режим: без LaTeX (mathtext), графики в формате PNG")
+    rendering.add_argument('-q', '--quantity', nargs='+', choices=ansys_catalog.QUANTITIES,
+                           help="величины, для которых строятся графики (по умолчанию все)")
+
+    parser = argparse.ArgumentParser(description="Расчет прогибов и напряжений пластины для примеров из materials.py.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', parents=[selection], help="список примеров")
+    commands.add_parser('moduli', parents=[selection], help="эффективные модули композита")
+    commands.add_parser('compute', parents=[selection, execution],
+                        help="расчет кривых и сохранение в хранилище результатов")
+    commands.add_parser('render', parents=[selection, execution, rendering],
+                        help="построение графиков по сохраненным результатам")
+    command = commands.add_parser('run', parents=[selection, execution, rendering],
+                                  help="расчет и построение графиков (как plot.py)")
+    command.add_argument('--stage', choices=('compute', 'render', 'all'), default='all',
+                         help="этап: расчет кривых (compute), построение графиков (render) или оба (по умолчанию)")
+    command = commands.add_parser('apdl', parents=[selection],
+                                  help="input-файлы ANSYS APDL и манифест очереди расчетов")
+    command.add_argument('-o', '--output',
+                         help="директория для input-файлов и манифеста (по умолчанию ANSYS/input_files/generated)")
+    command.add_argument('--h', type=float, nargs='+', help="толщины пластины (по умолчанию толщина из примера)")
+    command.add_argument('--load', nargs='+', choices=material_catalog.LOADINGS,
+                         help="виды нагрузки для input-файлов (по умолчанию вид нагрузки из примера)")
+    command.add_argument('--mesh', type=int, nargs=3, action='append', metavar=('DXX', 'DYY', 'DZZ'),
+                         help="разбиение: количество элементов вдоль длины, толщины и ширины пластины (можно задать "
+                              "несколько раз; по умолчанию 150 40 40)")
+    command.add_argument('--missing', action='store_true',
+                         help="только сочетания, для которых в ANSYS/results нет результатов")
+    command = commands.add_parser('fem', parents=[selection],
+                                  help="локальный расчет МКЭ вместо ANSYS (файлы W, SX, SXY в формате ANSYS)")
+    command.add_argument('-o', '--output',
+                         help="директория для файлов (по умолчанию ANSYS/fem_results, в ней их ищет plot.py)")
+    command.add_argument('--mesh', type=int, nargs=2, default=(160, 40), metavar=('NX', 'NY'),
+                         help="количество элементов вдоль длины и по толщине пластины (по умолчанию 160 40)")
+    command.add_argument('--missing', action='store_true',
+                         help="только примеры, для которых в ANSYS/results нет результатов")
+    commands.add_parser('gradients', parents=[selection],
+                        help="максимальный прогиб, напряжения σ11 на грани и σ13 на срединной линии и их производные "
+                             "по свойствам компонент и толщине")
+    command = commands.add_parser('design', help="подбор композитов по ограничениям на прогиб и напряжения σ13")
+    command.add_argument('--load', choices=material_catalog.LOADINGS, required=True, help="вид нагрузки")
+    command.add_argument('--w-max', type=float, help="допустимый максимальный прогиб (модуль)")
+    command.add_argument('--tau-max', type=float, help="допустимое максимальное напряжение σ13 (модуль)")
+    command.add_argument('--objective', choices=('mass', 'cost'), default='mass',
+                         help="критерий, с которым сопоставляется жесткость (по умолчанию масса)")
+    command.add_argument('--inclusion', nargs='+', help="включения из design.INCLUSIONS (по умолчанию все)")
+    command.add_argument('--matrix', nargs='+', help="матрицы из design.MATRICES (по умолчанию все)")
+    command.add_argument('--type', nargs='+', choices=material_catalog.TYPES, default=material_catalog.TYPES,
+                         help="модели композита (по умолчанию обе)")
+    command.add_argument('--concentration', type=float, nargs=3, default=(0.01, 0.6, 1000),
+                         metavar=('MIN', 'MAX', 'N'), help="значения концентрации (по умолчанию 0.01 0.6 1000)")
+    command.add_argument('--h', type=float, nargs='+', default=(0.05,), help="толщины пластины (по умолчанию 0.05)")
+    command.add_argument('--theory', choices=('kirchhoff_love', 'reissner', 'third_order', 'asymptotic'),
+                         default='asymptotic', help="теория, по которой оцениваются варианты")
+    command.add_argument('-j', '--workers', type=int, default=1,
+                         help="количество параллельных процессов (0 - по числу ядер, по умолчанию 1)")
+    command.add_argument('--top', type=int, default=20, help="количество выводимых вариантов фронта (по умолчанию 20)")
+    command.add_argument('-o', '--output',
+                         help="каталог JSONL с вариантами фронта Парето (для python cli.py run --catalog)")
+    command = commands.add_parser('fit', parents=[selection],
+                                  help="подбор модулей (или свойств компонент) по результатам ANSYS или МКЭ")
+    command.add_argument('-p', '--parameter', nargs='+', default=['E_1', 'G_13'],
+                         help="подбираемые параметры: эффективные модули (E_1, ..., G_23) и h или свойства компонент "
+                              "(E_c, nu_c, concentration, E_m, nu_m) и h (по умолчанию E_1 G_13)")
+    command.add_argument('--curve', choices=('w', 's11', 'all'), default='all',
+                         help="кривые, по которым подбираются параметры (по умолчанию прогиб и напряжения σ11)")
+    command.add_argument('--results', help="директория с результатами (по умолчанию ANSYS/results)")
+    command = commands.add_parser('uncertainty', parents=[selection],
+                                  help="распространение допусков свойств компонент (Монте-Карло): процентили прогиба и "
+                                       "напряжений")
+    command.add_argument('--samples', type=int, default=10 ** 6,
+                         help="объем выборки для каждого примера (по умолчанию 1000000)")
+    command.add_argument('--seed', type=int, default=0, help="начальное значение генератора случайных чисел")
+    command.add_argument('--tolerance', nargs=3, action='append', metavar=('NAME', 'DIST', 'VALUE'),
+                         help="допуск свойства (E_c, nu_c, concentration, E_m, nu_m, h): распределение normal или "
+                              "uniform и относительное отклонение (можно задать несколько раз; остальные - по "
+                              "uncertainty.TOLERANCES)")
+    command.add_argument('-j', '--workers', type=int, default=1,
+                         help="количество параллельных процессов (0 - по числу ядер, по умолчанию 1)")
+    command.add_argument('--plot', action='store_true',
+                         help="графики с огибающими крайних процентилей (файлы с суффиксом _mc в results)")
+    command.add_argument('--draft', action='store_true',
+                         help="черновой режим: без LaTeX (mathtext), графики в формате PNG")
+    return parser
+
+
+# Обработчики команд.
+COMMANDS = {'list': list_examples, 'moduli': print_moduli, 'compute': run, 'render': run, 'run': run,
+            'apdl': write_decks, 'fem': write_fem_results, 'fit': fit_examples,
+            'gradients': print_gradients, 'design': run_design, 'uncertainty': print_uncertainty}
+
+
+def main(argv=None):
+    parser = get_parser()
+    args = parser.parse_args(argv)
+    # Команда design не выбирает примеры (у нее нет ключей выбора).
+    if getattr(args, 'catalog', None) is None:
+        for n in getattr(args, 'example', None) or ():
+            if not 0 <= n < len(materials.data):
+                parser.error(f"Примера №{n} нет (всего примеров: {len(materials.data)}).")
+    try:
+        return COMMANDS[args.command](args)
+    except material_catalog.CatalogError as error:
+        print(f"ERROR: {error}")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+import collections
+import functools
+import numpy as np
+import asymptotic
+import theories
+from moduli import MODULES, get_modules
+from stiffness import FLAG_NOT_POSITIVE_DEFINITE, get_plate_stiffness, get_stiffness_batch
+
+# Свойства компонент композита: от них зависят эффективные модули, упругие модули пластины и величины асимптотической
+# теории, но не зависят вид нагрузки и толщина пластины.
+MATERIAL_KEYS = ('type', 'E_c', 'nu_c', 'concentration', 'E_m', 'nu_m')
+
+# Количество материалов, величины которых хранятся в памяти процесса (см. get_material).
+MATERIAL_CACHE_SIZE = 256
+
+# Величины, общие для всех примеров с одним материалом: эффективные модули (E_1, ..., G_23), упругие модули
+# (C1111, C1133, C3333, C1313) и величины асимптотической теории (коэффициенты многочленов P1111, P13111, P111111,
+# P331111 и D1111, D111111, см. asymptotic.get_coefficients).
+Material = collections.namedtuple('Material', ('modules', 'stiffness', 'asymptotic'))
+
+
+@functools.lru_cache(maxsize=MATERIAL_CACHE_SIZE)
+def get_material(type, E_c, nu_c, concentration, E_m, nu_m):
+    """
+    Данная функция вычисляет величины, зависящие только от свойств компонент композита, один раз для каждого
+    материала: примеры, отличающиеся лишь видом нагрузки или толщиной пластины, используют готовый результат.
+    :param type: модель композита.
+    :param E_c: модуль Юнга включений.
+    :param nu_c: коэффициент Пуассона включений.
+    :param concentration: концентрация включений.
+    :param E_m: модуль Юнга матрицы.
+    :param nu_m: коэффициент Пуассона матрицы.
+    :return: объект Material; None, если модель не найдена или матрица податливости не является положительно
+             определенной.
+    """
+    # Считаем эффективные модули на основе модели и исходных модулей материалов.
+    modules = get_modules({'type': type, 'E_c': E_c, 'nu_c': nu_c, 'concentration': concentration, 'E_m': E_m,
+                           'nu_m': nu_m})
+    if modules is None:
+        return None
+
+    # Вычисление упругих модулей: обращение матрицы податливости с проверкой ее положительной определенности.
+    result = get_stiffness_batch(dict(zip(MODULES, modules)))
+    if result['flags']:
+        problem = "не положительно определена" if result['flags'] & FLAG_NOT_POSITIVE_DEFINITE else "некорректна"
+        print(f"ERROR: Матрица податливости материала {problem} (эффективные модули: {modules})")
+        return None
+    stiffness = tuple(float(g) for g in get_plate_stiffness(result['stiffness']))
+    return Material(tuple(modules), stiffness, asymptotic.get_coefficients(*stiffness))
+
+
+def compute_material(i):
+    """
+    Данная функция выполняет расчет для одного примера: эффективные модули, прогибы и напряжения для всех теорий.
+    Кривые вычисляются по многочленам theories.get_polynomials - тем же, что используют validation.py, sweep.py,
+    design.py и uncertainty.py.
+    :param i: данные для примера (подробнее см. файл materials.py).
+    :return: словарь с массивами: 'x' и 'z' - координаты, 'w' - прогибы (4 × len(x)), 's11' и 's13' - напряжения
+             S_X и S_XY (4 × len(z)) в порядке построения на графиках, 'modules' - эффективные модули
+             (E_1, E_2, E_3, n_12, n_21, n_13, n_23, G_12, G_13, G_23). None, если вид нагрузки или модель не найдены
+             либо эффективные модули не задают положительно определенную матрицу податливости.
+    """
+    # Эффективные модули, упругие модули и величины асимптотической теории вычисляются один раз для каждого материала;
+    # для примера остается лишь составить многочлены для его толщины и вида нагрузки.
+    material = get_material(*(i[key] for key in MATERIAL_KEYS))
+    if material is None:
+        return None
+    E_1, E_2, E_3, n_12, n_21, n_13, n_23, G_12, G_13, G_23 = material.modules
+
+    # Печать результатов вычисления эффективных модулей в консоль.
+    print(f"Модель: {i['type']}, материалы: {i['name']}\nE_1={E_1}\nE_2={E_2}\nE_3={E_3}\n"
+          f"n_12={n_12}\nn_13={n_13}\nn_23={n_23}\nG_12={G_12}\nG_13={G_13}\nG_23={G_23}\n")
+
+    if i['type_of_loading'] not in theories.LOADINGS:
+        print("ERROR: нагрузка не найдена.")
+        return None
+
+    # Кривые сохраняются в порядке построения на графиках (см. plot.py): для S_XY первой идет формула Журавского,
+    # для сосредоточенной нагрузки прогиб теории 3-го порядка совпадает с прогибом теории Рейсснера.
+    curves = theories.get_curves(dict(zip(MODULES, material.modules)), i['h'], i['type_of_loading'],
+                                 coefficients=material.asymptotic)
+    return {'x': theories.X, 'z': theories.Z, 'w': curves['w'], 's11': curves['s11'], 's13': curves['s13'],
+            'modules': np.array(material.modules)}
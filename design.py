@@ -0,0 +1,232 @@
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import numpy as np
+import moduli
+import theories
+
+# Библиотека включений: модуль Юнга и коэффициент Пуассона (как в materials.py), плотность (г/см³) и условная
+# стоимость единицы массы (относительно стали). Ключ - начало названия файла ANSYS (см. ansys_file_name).
+INCLUSIONS = {'Steel': {'name': 'сталь', 'E': 200, 'nu': 0.25, 'density': 7.85, 'cost': 1},
+              'Textile': {'name': 'текстиль', 'E': 1.7, 'nu': 0.001, 'density': 1.14, 'cost': 3},
+              'Tin': {'name': 'олово', 'E': 35, 'nu': 0.44, 'density': 7.29, 'cost': 25},
+              'Aluminum': {'name': 'алюминий', 'E': 70, 'nu': 0.34, 'density': 2.70, 'cost': 2.5},
+              'Copper': {'name': 'медь', 'E': 110, 'nu': 0.35, 'density': 8.96, 'cost': 9},
+              'Titan': {'name': 'титан', 'E': 112, 'nu': 0.32, 'density': 4.51, 'cost': 15},
+              'Tungsten': {'name': 'вольфрам', 'E': 350, 'nu': 0.29, 'density': 19.3, 'cost': 40},
+              'Carbon': {'name': 'углерод', 'E': 850, 'nu': 0.27, 'density': 1.8, 'cost': 30}}
+
+# Библиотека матриц (в тех же единицах).
+MATRICES = {'Rubber': {'name': 'резина', 'E': 15 / 1000, 'nu': 0.499, 'density': 1.1, 'cost': 2},
+            'SoftRubber': {'name': 'мягкая резина', 'E': 3 / 1000, 'nu': 0.499, 'density': 1.1, 'cost': 2},
+            'Epoxy': {'name': 'эпоксидная смола', 'E': 2.4, 'nu': 0.35, 'density': 1.2, 'cost': 5}}
+
+# Критерии, с которыми сопоставляется жесткость (максимальный прогиб) на фронте Парето: масса или стоимость единицы
+# площади пластины.
+OBJECTIVES = ('mass', 'cost')
+
+# Значения концентрации включений по умолчанию (в допустимых границах).
+CONCENTRATION = np.linspace(0.01, 0.6, 1000)
+
+# Количество вариантов композита, вычисляемых за один раз.
+CHUNK_SIZE = 65536
+
+
+def get_space(inclusions=None, matrices=None, types=moduli.TYPE_CODES, concentration=CONCENTRATION, h=(0.05,)):
+    """
+    Данная функция задает пространство поиска: все сочетания включений, матриц, моделей композита, концентраций и
+    толщин пластины.
+    :param inclusions: названия включений из INCLUSIONS (по умолчанию все).
+    :param matrices: названия матриц из MATRICES (по умолчанию все).
+    :param types: модели композита (см. moduli.TYPE_CODES).
+    :param concentration: значения концентрации включений.
+    :param h: значения толщины пластины.
+    :return: словарь с осями пространства поиска.
+    """
+    space = {'inclusion': list(INCLUSIONS if inclusions is None else inclusions),
+             'matrix': list(MATRICES if matrices is None else matrices),
+             'type': list(types),
+             'concentration': np.atleast_1d(np.asarray(concentration, dtype=float)),
+             'h': np.atleast_1d(np.asarray(h, dtype=float))}
+    for key, library in (('inclusion', INCLUSIONS), ('matrix', MATRICES), ('type', moduli.TYPE_CODES)):
+        unknown = [name for name in space[key] if name not in library]
+        if unknown:
+            raise ValueError(f"Неизвестные значения ({key}): {', '.join(unknown)}")
+    return space
+
+
+def get_size(space):
+    return int(np.prod([len(space[key]) for key in ('inclusion', 'matrix', 'type', 'concentration', 'h')]))
+
+
+def get_candidates(space, start, stop):
+    """
+    Данная функция строит таблицу вариантов композита с номерами start:stop (в порядке C по осям пространства поиска).
+    :param space: пространство поиска (см. get_space).
+    :param start: номер первого варианта.
+    :param stop: номер, следующий за последним вариантом.
+    :return: словарь массивов: свойства компонент (в формате moduli.get_material_table), h, плотность 'density' и
+             условная стоимость единицы массы 'unit_cost' композита, номера включения, матрицы и модели.
+    """
+    shape = tuple(len(space[key]) for key in ('inclusion', 'matrix', 'type', 'concentration', 'h'))
+    i, j, k, n, m = np.unravel_index(np.arange(start, stop), shape)
+    inclusions = [INCLUSIONS[name] for name in space['inclusion']]
+    matrices = [MATRICES[name] for name in space['matrix']]
+
+    def get_property(library, key, index):
+        return np.array([item[key] for item in library], dtype=float)[index]
+
+    g = space['concentration'][n]
+    density_c, density_m = get_property(inclusions, 'density', i), get_property(matrices, 'density', j)
+    density = g * density_c + (1 - g) * density_m
+    unit_cost = (g * density_c * get_property(inclusions, 'cost', i) +
+                 (1 - g) * density_m * get_property(matrices, 'cost', j)) / density
+    return {'E_c': get_property(inclusions, 'E', i), 'nu_c': get_property(inclusions, 'nu', i), 'concentration': g,
+            'E_m': get_property(matrices, 'E', j), 'nu_m': get_property(matrices, 'nu', j),
+            'type': np.array([moduli.TYPE_CODES[name] for name in space['type']], dtype=np.int8)[k],
+            'h': space['h'][m], 'density': density, 'unit_cost': unit_cost,
+            'inclusion': i, 'matrix': j, 'model': k}
+
+
+def evaluate(candidates, type_of_loading, theory='asymptotic'):
+    """
+    Данная функция вычисляет для вариантов композита точные максимумы модуля прогиба и напряжений (см.
+    theories.get_extrema), массу и стоимость единицы площади пластины.
+    :param candidates: таблица вариантов (см. get_candidates).
+    :param type_of_loading: вид нагрузки: 'uniform' или 'focused'.
+    :param theory: теория из theories.THEORIES, по которой оцениваются варианты.
+    :return: словарь массивов 'w', 's11', 's13' (максимумы модуля), 'mass', 'cost' и 'flags' (см.
+             moduli.get_modules_batch).
+    """
+    modules = moduli.get_modules_batch(candidates['E_c'], candidates['nu_c'], candidates['concentration'],
+                                       candidates['E_m'], candidates['nu_m'], candidates['type'])
+    index = theories.THEORIES.index(theory)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        extrema = theories.get_extrema(modules, candidates['h'], type_of_loading)
+    result = {key: np.abs(extrema[key][1][..., index]) for key in ('w', 's11', 's13')}
+    result['mass'] = candidates['density'] * candidates['h']
+    result['cost'] = result['mass'] * candidates['unit_cost']
+    result['flags'] = modules['flags']
+    return result
+
+
+def get_pareto_front(w, objective):
+    """
+    Данная функция находит варианты, не доминируемые ни одним другим по паре критериев (максимальный прогиб,
+    масса или стоимость): оба критерия минимизируются.
+    :param w: максимальные прогибы.
+    :param objective: второй критерий.
+    :return: номера вариантов фронта Парето по возрастанию второго критерия.
+    """
+    order = np.lexsort((w, objective))
+    # Вариант входит во фронт, если его прогиб меньше прогибов всех вариантов с меньшим (или равным) вторым критерием.
+    best = np.minimum.accumulate(w[order])
+    front = np.ones(len(order), dtype=bool)
+    front[1:] = w[order][1:] < best[:-1]
+    return order[front]
+
+
+def search_range(space, start, stop, type_of_loading, w_max, tau_max, objective='mass', theory='asymptotic',
+                 chunk_size=CHUNK_SIZE):
+    """
+    Данная функция перебирает варианты с номерами start:stop по частям и оставляет фронт Парето допустимых вариантов
+    (фронт объединения частей совпадает с фронтом объединения их фронтов, поэтому память ограничена).
+    :return: словарь массивов вариантов фронта (поля get_candidates и evaluate, 'number' - номер варианта) и
+             количество допустимых вариантов.
+    """
+    front, feasible = None, 0
+    for chunk in range(start, stop, chunk_size):
+        candidates = get_candidates(space, chunk, min(chunk + chunk_size, stop))
+        result = evaluate(candidates, type_of_loading, theory)
+        mask = (result['flags'] == 0) & np.isfinite(result['w']) & np.isfinite(result['s13'])
+        if w_max is not None:
+            mask &= result['w'] <= w_max
+        if tau_max is not None:
+            mask &= result['s13'] <= tau_max
+        feasible += int(np.count_nonzero(mask))
+        rows = {key: value[mask] for key, value in {**candidates, **result}.items()}
+        rows['number'] = np.flatnonzero(mask) + chunk
+        if front is not None:
+            rows = {key: np.concatenate([front[key], value]) for key, value in rows.items()}
+        front = {key: value[get_pareto_front(rows['w'], rows[objective])] for key, value in rows.items()}
+    return front, feasible
+
+
+def design(type_of_loading, w_max=None, tau_max=None, objective='mass', space=None, theory='asymptotic',
+           workers=1, chunk_size=CHUNK_SIZE):
+    """
+    Данная функция подбирает композиты (включения, матрицу, модель и концентрацию), удовлетворяющие ограничениям
+    max|w| <= w_max и max|σ13| <= tau_max, и возвращает фронт Парето "жесткость (максимальный прогиб) - масса или
+    стоимость". Варианты вычисляются векторно частями по chunk_size, части распределяются по процессам.
+    :param type_of_loading: вид нагрузки: 'uniform' или 'focused'.
+    :param w_max: допустимый максимальный прогиб (None - без ограничения).
+    :param tau_max: допустимое максимальное касательное напряжение σ13 (None - без ограничения).
+    :param objective: второй критерий: 'mass' или 'cost' (см. OBJECTIVES).
+    :param space: пространство поиска (см. get_space; по умолчанию все сочетания из INCLUSIONS и MATRICES).
+    :param theory: теория из theories.THEORIES, по которой оцениваются варианты.
+    :param workers: количество параллельных процессов (0 - по числу ядер).
+    :param chunk_size: количество вариантов, вычисляемых за один раз.
+    :return: словарь: 'front' - массивы вариантов фронта Парето по возрастанию второго критерия, 'evaluated' и
+             'feasible' - количество просмотренных и допустимых вариантов, 'space' - пространство поиска.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Критерий не найден: {objective}")
+    if type_of_loading not in theories.LOADINGS:
+        raise ValueError(f"Вид нагрузки не найден: {type_of_loading}")
+    space = get_space() if space is None else space
+    workers = workers or os.cpu_count()
+    size = get_size(space)
+    if size == 0:
+        raise ValueError("Пространство поиска пусто: не задано ни одного варианта (см. get_space)")
+    arguments = (type_of_loading, w_max, tau_max, objective, theory, chunk_size)
+
+    if workers == 1:
+        parts = [search_range(space, 0, size, *arguments)]
+    else:
+        # Каждый процесс получает диапазон номеров вариантов и сам строит их таблицу (большие массивы не передаются).
+        bounds = np.linspace(0, size, min(workers * 4, max(size // chunk_size, 1) * workers) + 1).astype(int)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers,
+                                                    mp_context=multiprocessing.get_context('spawn')) as executor:
+            futures = [executor.submit(search_range, space, start, stop, *arguments)
+                       for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+            parts = [future.result() for future in futures]
+
+    # Фронт None - у процесса не было ни одного варианта.
+    fronts = [front for front, _ in parts if front is not None]
+    rows = {key: np.concatenate([front[key] for front in fronts]) for key in fronts[0]}
+    front = {key: value[get_pareto_front(rows['w'], rows[objective])] for key, value in rows.items()}
+    return {'front': front, 'evaluated': size, 'feasible': sum(feasible for _, feasible in parts), 'space': space}
+
+
+def get_examples(result, type_of_loading):
+    """
+    Данная функция преобразует варианты фронта Парето в примеры в формате materials.py (например, для расчета и
+    построения графиков командой python cli.py run --catalog).
+    :param result: результат design.
+    :param type_of_loading: вид нагрузки.
+    :return: список словарей с данными для примеров.
+    """
+    front, space = result['front'], result['space']
+    examples = []
+    for k in range(len(front['number'])):
+        inclusion, matrix = space['inclusion'][front['inclusion'][k]], space['matrix'][front['matrix'][k]]
+        examples.append({'type': space['type'][front['model'][k]],
+                         'name': f"{INCLUSIONS[inclusion]['name']}-{MATRICES[matrix]['name']}",
+                         'E_c': float(front['E_c'][k]), 'nu_c': float(front['nu_c'][k]),
+                         'concentration': float(front['concentration'][k]),
+                         'E_m': float(front['E_m'][k]), 'nu_m': float(front['nu_m'][k]),
+                         'ansys_file_name': f"{inclusion}_{matrix}", 'type_of_loading': type_of_loading,
+                         'h': float(front['h'][k])})
+    return examples
+
+
+def write_catalog(examples, path):
+    """
+    Данная функция записывает примеры в каталог JSONL (см. material_catalog.read_catalog).
+    :param examples: список словарей с данными для примеров.
+    :param path: путь к файлу.
+    """
+    with open(path, 'w', encoding='utf-8') as file:
+        for a in examples:
+            file.write(json.dumps(a, ensure_ascii=False) + '\n')
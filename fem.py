@@ -0,0 +1,238 @@
+import json
+import os
+import numpy as np
+import scipy.sparse
+import scipy.sparse.linalg
+import ansys_catalog
+import moduli
+import stiffness
+
+# Длина пластины (см. ANSYS/input_files/input.txt); толщина задается примером.
+LENGTH = 1
+
+# Разбиение по умолчанию: количество элементов вдоль длины (кратно 4, чтобы сечения x = 0.25, 0.5 проходили по узлам)
+# и по толщине (четное, чтобы срединная линия проходила по узлам).
+MESH = (160, 40)
+
+# Количество точек на каждой половине пути при выводе результатов (как path_points в input.txt).
+PATH_POINTS = 80
+
+# Директория, в которую по умолчанию записываются результаты расчета (в формате файлов ANSYS).
+RESULTS_DIR = ansys_catalog.FEM_RESULTS_DIR
+# Файл в директории результатов, в котором для каждого записанного файла хранятся концентрация и толщина пластины (в
+# имени файла они округлены, см. write_results).
+INDEX = 'index.json'
+
+# Сечения x, в которых выводятся напряжения S_X и S_XY (как в compute.py и theories.py).
+SECTIONS = {'uniform': {'SX': 0.5, 'SXY': 0.25}, 'focused': {'SX': 0.25, 'SXY': 0.25}}
+
+# Точки Гаусса (2 × 2) и координаты узлов элемента в локальных координатах (ξ, η) ∈ [-1, 1]²; узлы нумеруются против
+# часовой стрелки, начиная с левого нижнего.
+GAUSS = np.array([-1, 1]) / np.sqrt(3)
+CORNERS = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]])
+
+
+def get_plane_strain_stiffness(modules):
+    """
+    Данная функция вычисляет матрицу упругих модулей плоской деформации в плоскости x1x3 (ε22 = 0) - строки и столбцы
+    11, 33, 13 матрицы жесткости ортотропного материала (см. stiffness.get_stiffness_batch).
+    :param modules: эффективные модули (словарь с полями moduli.MODULES).
+    :return: массив 3 × 3 для (ε11, ε33, γ13).
+    """
+    result = stiffness.get_stiffness_batch(modules)
+    if result['flags']:
+        raise ValueError("Матрица податливости материала не является положительно определенной")
+    return result['stiffness'][np.ix_([0, 2, 4], [0, 2, 4])]
+
+
+def get_element_stiffness(D, dx, dy):
+    """
+    Данная функция вычисляет матрицу жесткости прямоугольного четырехузлового элемента с несовместными модами
+    (элемент Вильсона-Тейлора QM6: билинейные перемещения дополняются модами 1 - ξ², 1 - η², которые исключаются
+    на уровне элемента). В отличие от билинейного элемента, такой элемент не "запирается" при изгибе, поэтому тонкая
+    пластина описывается небольшим количеством элементов по толщине.
+    :param D: матрица упругих модулей 3 × 3.
+    :param dx: размер элемента вдоль x.
+    :param dy: размер элемента вдоль y.
+    :return: K - матрица жесткости 8 × 8 (перемещения узлов u1, v1, ..., u4, v4), R - матрица 4 × 8, выражающая
+             амплитуды несовместных мод через перемещения узлов, B - функция (ξ, η) -> матрицы деформаций 3 × 8 и 3 × 4.
+    """
+    def get_b(xi, eta):
+        # Производные функций формы по x и y (якобиан прямоугольника постоянен).
+        dn_dx = CORNERS[:, 0] * (1 + eta * CORNERS[:, 1]) / 4 * 2 / dx
+        dn_dy = CORNERS[:, 1] * (1 + xi * CORNERS[:, 0]) / 4 * 2 / dy
+        b = np.zeros((3, 8))
+        b[0, 0::2] = dn_dx
+        b[1, 1::2] = dn_dy
+        b[2, 0::2] = dn_dy
+        b[2, 1::2] = dn_dx
+        # Несовместные моды: u = a1 (1 - ξ²) + a2 (1 - η²), v = a3 (1 - ξ²) + a4 (1 - η²).
+        d_xi, d_eta = -2 * xi * 2 / dx, -2 * eta * 2 / dy
+        b_i = np.array([[d_xi, 0, 0, 0],
+                        [0, 0, 0, d_eta],
+                        [0, d_eta, d_xi, 0]])
+        return b, b_i
+
+    K_cc, K_ci, K_ii = np.zeros((8, 8)), np.zeros((8, 4)), np.zeros((4, 4))
+    weight = dx * dy / 4
+    for xi in GAUSS:
+        for eta in GAUSS:
+            b, b_i = get_b(xi, eta)
+            K_cc += b.T @ D @ b * weight
+            K_ci += b.T @ D @ b_i * weight
+            K_ii += b_i.T @ D @ b_i * weight
+    R = -np.linalg.solve(K_ii, K_ci.T)
+    return K_cc + K_ci @ R, R, get_b
+
+
+def solve(modules, h, type_of_loading, mesh=MESH, p=1):
+    """
+    Данная функция решает задачу изгиба пластины из input.txt в постановке плоской деформации (полоса длины LENGTH
+    и толщины h): левый торец закреплен в узле на срединной линии по перемещениям u и v, правый - только по v;
+    на верхнюю грань действует равномерно распределенная нагрузка плотности p h³ или сосредоточенная сила p h³
+    (на единицу ширины) в сечении x = LENGTH/2. Система уравнений собирается в разреженном формате (scipy.sparse).
+    :param modules: эффективные модули (словарь с полями moduli.MODULES).
+    :param h: толщина пластины.
+    :param type_of_loading: вид нагрузки: 'uniform' или 'focused'.
+    :param mesh: количество элементов вдоль длины и по толщине.
+    :param p: множитель нагрузки.
+    :return: словарь: 'x', 'y' - координаты узлов (nx + 1, ny + 1), 'u' - перемещения узлов формы (ny + 1, nx + 1, 2),
+             'stress' - напряжения σ11, σ33, σ13 в узлах (осредненные по элементам) формы (ny + 1, nx + 1, 3).
+    """
+    nx, ny = mesh
+    if nx < 1 or ny < 2 or ny % 2:
+        raise ValueError(f"Количество элементов по толщине должно быть четным, вдоль длины - положительным: {mesh}")
+    if type_of_loading == 'focused' and nx % 2:
+        raise ValueError(f"Для сосредоточенной нагрузки количество элементов вдоль длины должно быть четным: {mesh}")
+    if type_of_loading not in ('uniform', 'focused'):
+        raise ValueError(f"Вид нагрузки не найден: {type_of_loading}")
+    dx, dy = LENGTH / nx, h / ny
+    D = get_plane_strain_stiffness(modules)
+    K_e, R, get_b = get_element_stiffness(D, dx, dy)
+
+    # Номера узлов элементов (против часовой стрелки) и номера степеней свободы (u, v) узла n: 2n, 2n + 1.
+    nodes = np.arange((nx + 1) * (ny + 1)).reshape(ny + 1, nx + 1)
+    elements = np.stack([nodes[:-1, :-1], nodes[:-1, 1:], nodes[1:, 1:], nodes[1:, :-1]], axis=-1).reshape(-1, 4)
+    dofs = np.stack([2 * elements, 2 * elements + 1], axis=-1).reshape(-1, 8)
+
+    # Все элементы одинаковы, поэтому глобальная матрица собирается из одной матрицы элемента.
+    size = 2 * nodes.size
+    K = scipy.sparse.coo_matrix((np.broadcast_to(K_e, (len(dofs), 8, 8)).ravel(),
+                                 (np.repeat(dofs, 8, axis=1).ravel(), np.tile(dofs, (1, 8)).ravel())),
+                                shape=(size, size)).tocsr()
+
+    # Нагрузка на верхнюю грань (y = h), направленная вниз.
+    f = np.zeros(size)
+    top = nodes[-1]
+    if type_of_loading == 'uniform':
+        np.add.at(f, 2 * top[:-1] + 1, -p * h ** 3 * dx / 2)
+        np.add.at(f, 2 * top[1:] + 1, -p * h ** 3 * dx / 2)
+    else:
+        f[2 * top[nx // 2] + 1] = -p * h ** 3
+
+    # Закрепление: узел (0, h/2) - по u и v, узел (LENGTH, h/2) - по v.
+    fixed = [2 * nodes[ny // 2, 0], 2 * nodes[ny // 2, 0] + 1, 2 * nodes[ny // 2, -1] + 1]
+    free = np.setdiff1d(np.arange(size), fixed)
+    u = np.zeros(size)
+    u[free] = scipy.sparse.linalg.spsolve(K[free][:, free].tocsc(), f[free])
+
+    # Напряжения в точках Гаусса каждого элемента экстраполируются в узлы элемента и осредняются по элементам.
+    u_e = u[dofs]
+    alpha = u_e @ R.T
+    gauss_stress = []
+    for xi, eta in CORNERS / np.sqrt(3):
+        b, b_i = get_b(xi, eta)
+        gauss_stress.append((u_e @ b.T + alpha @ b_i.T) @ D.T)
+    # Значения в узлах - билинейная экстраполяция по точкам Гаусса (узлы элемента в координатах точек Гаусса - ±√3).
+    extrapolation = (1 + np.sqrt(3) * CORNERS[:, None, 0] * CORNERS[None, :, 0]) * \
+                    (1 + np.sqrt(3) * CORNERS[:, None, 1] * CORNERS[None, :, 1]) / 4
+    node_stress = np.einsum('cg,gek->eck', extrapolation, np.array(gauss_stress))
+    stress = np.zeros((nodes.size, 3))
+    count = np.zeros(nodes.size)
+    np.add.at(stress, elements, node_stress)
+    np.add.at(count, elements, 1)
+    stress /= count[:, None]
+
+    return {'x': np.linspace(0, LENGTH, nx + 1), 'y': np.linspace(0, h, ny + 1), 'u': u.reshape(ny + 1, nx + 1, 2),
+            'stress': stress.reshape(ny + 1, nx + 1, 3)}
+
+
+def get_curves(solution, type_of_loading, path_points=PATH_POINTS):
+    """
+    Данная функция выбирает из решения кривые, которые выводит input.txt: прогиб срединной линии и распределения
+    напряжений σ11 и σ13 по толщине в сечениях SECTIONS (по 2 * path_points + 1 точек, с линейной интерполяцией
+    между узлами).
+    :param solution: решение (см. solve).
+    :param type_of_loading: вид нагрузки.
+    :param path_points: количество точек на каждой половине пути.
+    :return: словарь: величина (см. ansys_catalog.QUANTITIES) - пара массивов (координата, значение) в формате файлов
+             ANSYS (x - для прогиба, y от 0 до h - для напряжений).
+    """
+    x, y = solution['x'], solution['y']
+    points = 2 * path_points + 1
+    curves = {}
+    x_path = np.linspace(x[0], x[-1], points)
+    curves['W'] = (x_path, np.interp(x_path, x, solution['u'][(len(y) - 1) // 2, :, 1]))
+    y_path = np.linspace(y[0], y[-1], points)
+    for quantity, component in (('SX', 0), ('SXY', 2)):
+        section = SECTIONS[type_of_loading][quantity] * LENGTH
+        # Напряжения в сечении: интерполяция между соседними столбцами узлов.
+        column = [np.interp(section, x, row) for row in solution['stress'][:, :, component]]
+        curves[quantity] = (y_path, np.interp(y_path, y, column))
+    return curves
+
+
+def format_results(x, y):
+    """
+    Данная функция формирует текст файла результатов в формате *MWRITE из input.txt (%10.5F     %10.8F): как
+    и в ANSYS, у отрицательных чисел, не помещающихся в поле, опускается ноль перед точкой.
+    :return: строка.
+    """
+    def number(value, precision):
+        text = f"{value:10.{precision}f}"
+        return text.replace('-0.', '-.') if len(text) > 10 else text
+
+    return ''.join(f"{number(a, 5)}     {number(b, 8)}\n" for a, b in zip(x, y))
+
+
+def write_results(a, path=RESULTS_DIR, mesh=MESH):
+    """
+    Данная функция выполняет расчет для примера и записывает файлы W, SX и SXY с теми же именами и в том же
+    формате, что и результаты ANSYS (см. ansys_catalog.get_file_name), поэтому они читаются ansys_io и plot.py.
+    :param a: данные для примера (подробнее см. файл materials.py).
+    :param path: директория для файлов.
+    :param mesh: количество элементов вдоль длины и по толщине.
+    :return: список путей к записанным файлам; пустой, если модель композита не найдена.
+    :raises ValueError: если в директории уже есть файлы с тем же именем для другой концентрации или толщины
+                        (в имени файла они округлены, например 0.231 и 0.235 - conc023).
+    """
+    index_path = os.path.join(path, INDEX)
+    index = {}
+    if os.path.exists(index_path):
+        with open(index_path, 'r', encoding='utf-8') as file:
+            index = json.load(file)
+    names = [ansys_catalog.get_file_name(a['ansys_file_name'], a['concentration'], a['h'], quantity,
+                                         a['type_of_loading']) for quantity in ansys_catalog.QUANTITIES]
+    parameters = {'concentration': a['concentration'], 'h': a['h']}
+    for name in names:
+        if index.get(name, parameters) != parameters:
+            raise ValueError(f"Файл {name} уже содержит результаты для concentration={index[name]['concentration']}, "
+                             f"h={index[name]['h']}: концентрация и толщина кодируются в имени с округлением")
+
+    modules = moduli.get_modules(a)
+    if modules is None:
+        return []
+    solution = solve(dict(zip(moduli.MODULES, modules)), a['h'], a['type_of_loading'], mesh)
+    os.makedirs(path, exist_ok=True)
+    curves = get_curves(solution, a['type_of_loading'])
+    paths = []
+    for name, quantity in zip(names, ansys_catalog.QUANTITIES):
+        x, y = curves[quantity]
+        file_path = os.path.join(path, name)
+        with open(file_path, 'w', encoding='utf-8') as file:
+            file.write(format_results(x, y))
+        paths.append(file_path)
+        index[name] = parameters
+    with open(index_path, 'w', encoding='utf-8') as file:
+        json.dump(index, file, ensure_ascii=False, indent=1)
+    return paths
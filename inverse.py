@@ -0,0 +1,231 @@
+import os
+import numpy as np
+import ansys_catalog
+import ansys_io
+import moduli
+import sensitivity
+import stiffness
+
+# Точки, в которых сравниваются кривые: прогиб w(x) и напряжения σ11(z) (результаты ANSYS интерполируются на них).
+X = np.linspace(0, 1, 41)
+Z = np.linspace(-1 / 2, 1 / 2, 41)
+
+# Параметры, которые подбираются в логарифмическом масштабе (они положительны и меняются на порядки).
+LOG_PARAMETERS = ('E_1', 'E_2', 'E_3', 'G_12', 'G_13', 'G_23', 'E_c', 'E_m', 'h')
+# Допустимые интервалы для остальных параметров: шаг, выводящий за интервал, укорачивается до его границы.
+BOUNDS = {'concentration': (1e-6, 1 - 1e-6), 'nu_c': (-1 + 1e-6, 1 / 2 - 1e-6), 'nu_m': (-1 + 1e-6, 1 / 2 - 1e-6)}
+
+# Параметры метода Левенберга-Марквардта: начальный коэффициент регуляризации, множитель его изменения, нижняя
+# граница (система остается невырожденной, даже если параметры влияют на кривые только в некоторой комбинации) и
+# предельное значение, после которого подбор строки останавливается (шаг уже не уменьшает невязку, см. 'stalled').
+DAMPING = 1e-3
+DAMPING_FACTOR = 10
+MIN_DAMPING = 1e-9
+MAX_DAMPING = 1e12
+# Наибольшая длина шага (для параметров в логарифмическом масштабе 1 - изменение не более чем в e раз за итерацию):
+# без этого ограничения первые шаги могут увести подбор туда, где от параметра кривые почти не зависят.
+MAX_STEP = 1
+
+
+def fit_modules(modules, h, type_of_loading, x=X, w=None, z=Z, s11=None, parameters=('E_1', 'G_13'),
+                iterations=100, tolerance=1e-10):
+    """
+    Данная функция подбирает эффективные модули (и/или толщину пластины), при которых кривые асимптотической теории
+    ближе всего (методом наименьших квадратов) к заданным прогибам и напряжениям. Все образцы обрабатываются одним
+    пакетом; производные кривых вычисляются точно (см. sensitivity.get_curve_jacobians).
+    :param modules: начальные значения эффективных модулей (структурированный массив или словарь массивов формы (n,));
+                    модули, которые не подбираются, остаются равными заданным.
+    :param h: толщина пластины (массив формы (n,) или число).
+    :param type_of_loading: вид нагрузки: 'uniform' или 'focused'.
+    :param x: точки, в которых задан прогиб.
+    :param w: прогибы: массив формы (n, len(x)) или None (NaN - точка не учитывается).
+    :param z: точки, в которых заданы напряжения σ11.
+    :param s11: напряжения σ11: массив формы (n, len(z)) или None.
+    :param parameters: подбираемые параметры (из sensitivity.PARAMETERS).
+    :param iterations: максимальное количество итераций.
+    :param tolerance: относительное уменьшение невязки, при котором итерации прекращаются.
+    :return: словарь: подобранные значения параметров (массивы формы (n,)) и 'rms' - относительная среднеквадратичная
+             невязка, 'iterations' - количество итераций, 'converged' - признак сходимости для каждого образца,
+             'stalled' - признак остановки без сходимости (регуляризация превысила MAX_DAMPING). Образцы без
+             пригодных точек (все значения NaN или нули) не подбираются: для них 'converged' - False, 'rms' - NaN.
+    """
+    start = {name: np.asarray(modules[name], dtype=float) for name in stiffness.COMPLIANCE_MODULES}
+    start['h'] = np.broadcast_to(np.asarray(h, dtype=float), start['E_1'].shape)
+    columns = [sensitivity.PARAMETERS.index(name) for name in parameters]
+
+    def evaluate(values, rows):
+        arguments = {name: value[rows] for name, value in start.items()}
+        arguments.update(zip(parameters, values.T))
+        result = sensitivity.get_curve_jacobians(arguments, arguments.pop('h'), type_of_loading, x, z)
+        return result, columns
+
+    return _fit(evaluate, start, parameters, w, s11, iterations, tolerance)
+
+
+def fit_constituents(table, h, type_of_loading, x=X, w=None, z=Z, s11=None, parameters=('concentration',),
+                     iterations=100, tolerance=1e-10):
+    """
+    Данная функция подбирает свойства компонент композита (например, концентрацию включений), при которых кривые
+    асимптотической теории ближе всего к заданным (см. fit_modules).
+    :param table: начальные значения: таблица материалов (см. moduli.get_material_table).
+    :param parameters: подбираемые параметры (из sensitivity.INPUTS и 'h').
+    :return: см. fit_modules.
+    """
+    start = {name: np.asarray(table[name], dtype=float) for name in sensitivity.INPUTS}
+    start['h'] = np.broadcast_to(np.asarray(h, dtype=float), start['E_c'].shape)
+    type_code = np.asarray(table['type'])
+    columns = [(sensitivity.INPUTS + ('h',)).index(name) for name in parameters]
+
+    def evaluate(values, rows):
+        arguments = {name: value[rows] for name, value in start.items()}
+        arguments.update(zip(parameters, values.T))
+        arguments['type'] = type_code[rows]
+        result = sensitivity.get_input_curve_jacobians(arguments, arguments.pop('h'), type_of_loading, x, z)
+        return result, columns
+
+    return _fit(evaluate, start, parameters, w, s11, iterations, tolerance)
+
+
+def load_curves(data, path=ansys_catalog.RESULTS_DIR, x=X, z=Z):
+    """
+    Данная функция загружает прогибы W и напряжения SX из файлов с результатами ANSYS (или МКЭ, см. fem.py) и
+    интерполирует их на общие точки x, z (приведение координат - как в plot.render_material).
+    :param data: список примеров (подробнее см. файл materials.py).
+    :param path: директория с результатами.
+    :param x: точки для прогиба.
+    :param z: точки для напряжений.
+    :return: два массива: прогибы формы (len(data), len(x)) и напряжения формы (len(data), len(z)); для примеров, у
+             которых нет файла, строка состоит из NaN.
+    """
+    catalog = ansys_catalog.get_catalog(path)
+    curves = []
+    for quantity, points in (('W', x), ('SX', z)):
+        values = np.full((len(data), len(points)), np.nan)
+        for k, a in enumerate(data):
+            file_path = catalog.get_path(a['ansys_file_name'], a['concentration'], a['h'], quantity,
+                                         a['type_of_loading'])
+            if file_path is None or not os.path.exists(file_path):
+                continue
+            if quantity == 'W':
+                axis, value = ansys_io.load_results(file_path, 1, 0)
+            else:
+                axis, value = ansys_io.load_results(file_path, 1 / a['h'], 0.5)
+            order = np.argsort(axis)
+            values[k] = np.interp(points, axis[order], value[order])
+        curves.append(values)
+    return curves[0], curves[1]
+
+
+def _fit(evaluate, start, parameters, w, s11, iterations, tolerance):
+    # Невязки каждой кривой нормируются на ее максимум по модулю и на корень из количества точек, поэтому прогиб и
+    # напряжения входят в сумму квадратов с одинаковым весом независимо от масштаба и числа точек.
+    observed, weights = [], []
+    for key, curve in (('w', w), ('s11', s11)):
+        if curve is None:
+            continue
+        curve = np.atleast_2d(np.asarray(curve, dtype=float))
+        valid = np.isfinite(curve)
+        scale = np.max(np.where(valid, np.abs(curve), 0), axis=-1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weight = np.where(valid & (scale > 0), 1 / (scale * np.sqrt(np.maximum(valid.sum(-1, keepdims=True), 1))),
+                              0)
+        observed.append((key, np.where(valid, curve, 0)))
+        weights.append(weight)
+    if not observed:
+        raise ValueError("Не заданы кривые для подбора параметров (w или s11)")
+
+    n = observed[0][1].shape[0]
+    log = np.array([name in LOG_PARAMETERS for name in parameters])
+    lower = np.array([BOUNDS.get(name, (-np.inf, np.inf))[0] for name in parameters])
+    upper = np.array([BOUNDS.get(name, (-np.inf, np.inf))[1] for name in parameters])
+    values = np.stack([np.broadcast_to(start[name], (n,)) for name in parameters], axis=-1).astype(float)
+    theta = np.where(log, np.log(np.where(log, values, 1)), values)
+
+    def get_residuals(theta, rows):
+        # Невязки (строки, точки) и их производные по theta (строки, точки, параметры).
+        values = np.where(log, np.exp(theta), theta)
+        result, columns = evaluate(values, rows)
+        residuals, jacobian = [], []
+        for (key, curve), weight in zip(observed, weights):
+            residuals.append((result[key] - curve[rows]) * weight[rows])
+            jacobian.append(result['d' + key][..., columns] * weight[rows][..., None])
+        jacobian = np.concatenate(jacobian, axis=1)
+        return np.concatenate(residuals, axis=1), jacobian * np.where(log, values, 1)[:, None, :]
+
+    rows = np.arange(n)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        residuals, jacobian = get_residuals(theta, rows)
+    cost = np.sum(residuals ** 2, axis=-1)
+    damping = np.full(n, DAMPING)
+    converged = np.zeros(n, dtype=bool)
+    counts = np.zeros(n, dtype=int)
+    stalled = np.zeros(n, dtype=bool)
+    # Строки без пригодных точек (все веса нулевые: невязка равна нулю при любых параметрах) и строки, для которых
+    # кривые не вычисляются (некорректные начальные значения), не подбираются.
+    usable = np.any(np.concatenate(weights, axis=-1) > 0, axis=-1)
+    active = usable & np.isfinite(cost)
+
+    for _ in range(iterations):
+        rows = np.flatnonzero(active)
+        if not len(rows):
+            break
+        counts[rows] += 1
+        J, r = jacobian[rows], residuals[rows]
+        A = np.einsum('nmi,nmj->nij', J, J)
+        g = np.einsum('nmi,nm->ni', J, r)
+        # Регуляризация Марквардта: к диагонали добавляется ее доля; нулевые элементы диагонали (параметр не влияет на
+        # кривые) заменяются малой величиной, чтобы система оставалась невырожденной.
+        diagonal = np.einsum('nii->ni', A).copy()
+        diagonal = np.maximum(diagonal, 1e-12 * np.max(diagonal, axis=-1, keepdims=True) + np.finfo(float).tiny)
+        A[:, np.arange(len(parameters)), np.arange(len(parameters))] += damping[rows, None] * diagonal
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            step = np.linalg.solve(A, -g[..., None])[..., 0]
+        norm = np.linalg.norm(step, axis=-1, keepdims=True)
+        step *= np.minimum(1, MAX_STEP / np.where(norm > 0, norm, 1))
+        trial = np.clip(theta[rows] + step, lower, upper)
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            trial_residuals, trial_jacobian = get_residuals(trial, rows)
+        trial_cost = np.sum(trial_residuals ** 2, axis=-1)
+
+        # Шаг принимается, если он уменьшает невязку; иначе регуляризация усиливается.
+        accepted = np.isfinite(trial_cost) & (trial_cost <= cost[rows])
+        done = accepted & (cost[rows] - trial_cost <= tolerance * cost[rows])
+        rows_accepted = rows[accepted]
+        theta[rows_accepted] = trial[accepted]
+        residuals[rows_accepted], jacobian[rows_accepted] = trial_residuals[accepted], trial_jacobian[accepted]
+        cost[rows_accepted] = trial_cost[accepted]
+        damping[rows] = np.where(accepted, np.maximum(damping[rows] / DAMPING_FACTOR, MIN_DAMPING),
+                                 damping[rows] * DAMPING_FACTOR)
+        stall = ~done & (damping[rows] > MAX_DAMPING)
+        converged[rows[done]] = True
+        stalled[rows[stall]] = True
+        active[rows[done | stall]] = False
+
+    values = np.where(log, np.exp(theta), theta)
+    result = {name: values[:, k] for k, name in enumerate(parameters)}
+    result['rms'] = np.where(usable, np.sqrt(cost / len(observed)), np.nan)
+    result['iterations'] = counts
+    result['converged'] = converged
+    result['stalled'] = stalled
+    return result
+
+
+if __name__ == '__main__':
+    import materials
+
+    data = materials.data
+    w, s11 = load_curves(data)
+    table = moduli.get_material_table(data)
+    h = np.array([a['h'] for a in data])
+    for type_of_loading in ('uniform', 'focused'):
+        rows = [k for k, a in enumerate(data) if a['type_of_loading'] == type_of_loading]
+        if not rows:
+            continue
+        selected = {key: value[rows] for key, value in table.items()}
+        modules = moduli.get_modules_batch(*(selected[key] for key in sensitivity.INPUTS), selected['type'])
+        fitted = fit_modules(modules, h[rows], type_of_loading, w=w[rows], parameters=('E_1', 'G_13'))
+        for j, k in enumerate(rows):
+            a = data[k]
+            print(f"{a['ansys_file_name']} (concentration={a['concentration']}, h={a['h']}, {type_of_loading}): "
+                  f"E_1={modules['E_1'][j]:.6g} -> {fitted['E_1'][j]:.6g}, "
+                  f"G_13={modules['G_13'][j]:.6g} -> {fitted['G_13'][j]:.6g}, rms={fitted['rms'][j]:.3g}")
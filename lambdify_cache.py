@@ -0,0 +1,135 @@
+import hashlib
+import inspect
+import os
+import pathlib
+import tempfile
+import sympy as sym
+import profiling
+from sympy.utilities.lambdify import lambdify
+
+# Директория кэша (по умолчанию .cache/lambdify в корне репозитория) и ограничение на ее размер в байтах.
+CACHE_DIR = os.environ.get('PLATE_BANDING_CACHE',
+                           str(pathlib.Path(__file__).parent.resolve()) + '/.cache/lambdify')
+CACHE_SIZE = int(os.environ.get('PLATE_BANDING_CACHE_SIZE', 64 * 1024 * 1024))
+# Доля CACHE_SIZE, до которой сокращается кэш при вытеснении: запас позволяет не просматривать директорию при каждой
+# следующей записи.
+EVICTION_TARGET = 0.75
+
+# Функции, уже загруженные в текущем процессе, и пространства имен для каждого набора модулей.
+_functions = {}
+_namespaces = {}
+# Размер кэша по оценке текущего процесса: размер директории при последнем просмотре и записанные с тех пор файлы
+# (None - директория еще не просматривалась).
+_cache_size = None
+
+
+def get_key(args, expr, modules, **kwargs):
+    """
+    Данная функция вычисляет ключ кэша для набора аргументов lambdify.
+    :param args: символы-аргументы функции.
+    :param expr: выражение SymPy (или список выражений).
+    :param modules: модули, используемые lambdify (например, ['numpy']).
+    :param kwargs: прочие параметры lambdify (например, cse=True).
+    :return: шестнадцатеричная строка SHA-256.
+    """
+    key = hashlib.sha256()
+    for part in (sym.srepr(args), sym.srepr(expr), repr(modules), repr(sorted(kwargs.items())), sym.__version__):
+        key.update(part.encode('utf-8'))
+        key.update(b'\0')
+    return key.hexdigest()
+
+
+@profiling.profiled('lambdify')
+def cached_lambdify(args, expr, modules=None, **kwargs):
+    """
+    Данная функция является заменой sympy lambdify: сгенерированный исходный код функции сохраняется на диск и
+    переиспользуется при последующих запусках (в том числе из других процессов).
+    :param args: символы-аргументы функции.
+    :param expr: выражение SymPy (или список выражений).
+    :param modules: модули, используемые lambdify (по умолчанию ['numpy']).
+    :param kwargs: прочие параметры lambdify.
+    :return: численная функция.
+    """
+    modules = ['numpy'] if modules is None else modules
+    key = get_key(args, expr, modules, **kwargs)
+    if key in _functions:
+        return _functions[key]
+
+    file_path = os.path.join(CACHE_DIR, key + '.py')
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            source = file.read()
+        # Обновляем время последнего обращения для вытеснения давно не используемых записей (LRU).
+        os.utime(file_path)
+    except OSError:
+        source = None
+
+    if source is None:
+        with profiling.stage('generate'):
+            func = lambdify(args, expr, modules=modules, **kwargs)
+            source = inspect.getsource(func)
+            _write(file_path, source)
+    else:
+        with profiling.stage('load'):
+            func = _load(source, file_path, modules)
+
+    _functions[key] = func
+    return func
+
+
+def clear_cache():
+    """
+    Данная функция удаляет все записи кэша.
+    """
+    global _cache_size
+    _functions.clear()
+    _cache_size = None
+    for path in pathlib.Path(CACHE_DIR).glob('*.py'):
+        path.unlink(missing_ok=True)
+
+
+def _load(source, file_path, modules):
+    # Пространство имен совпадает с тем, которое lambdify строит для данного набора модулей.
+    modules_key = repr(modules)
+    if modules_key not in _namespaces:
+        _namespaces[modules_key] = lambdify((), 0, modules=modules).__globals__
+    namespace = dict(_namespaces[modules_key])
+    exec(compile(source, file_path, 'exec'), namespace)
+    return namespace['_lambdifygenerated']
+
+
+def _write(file_path, source):
+    global _cache_size
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Запись через временный файл, чтобы параллельные процессы не прочитали файл частично.
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as file:
+        file.write(source)
+    size = os.path.getsize(tmp_path)
+    os.replace(tmp_path, file_path)
+    # Директория просматривается только при первой записи и когда оценка размера превысит CACHE_SIZE (записи других
+    # процессов учитываются при следующем просмотре), поэтому заполнение кэша не требует квадратичного времени.
+    _cache_size = None if _cache_size is None else _cache_size + size
+    if _cache_size is None or _cache_size > CACHE_SIZE:
+        _cache_size = _evict()
+
+
+def _evict():
+    # Если размер кэша превышает CACHE_SIZE, удаляем записи с наиболее давним временем обращения, пока он не станет
+    # меньше EVICTION_TARGET * CACHE_SIZE; возвращаем итоговый размер кэша.
+    entries = []
+    for path in pathlib.Path(CACHE_DIR).glob('*.py'):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    if total <= CACHE_SIZE:
+        return total
+    for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+        if total <= EVICTION_TARGET * CACHE_SIZE:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+    return total
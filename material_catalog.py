@@ -0,0 +1,233 @@
+import csv
+import itertools
+import json
+import math
+import os
+import pathlib
+import tempfile
+import time
+
+# Модели композита (см. moduli.TYPE_CODES) и виды нагрузки (см. theories.LOADINGS).
+TYPES = ('fiber', 'polydisperse')
+LOADINGS = ('uniform', 'focused')
+
+# Схема записи каталога (см. materials.py): поле и проверка значения (возвращает текст ошибки или None).
+NUMBER_FIELDS = {'E_c': lambda v: None if v > 0 else "модуль Юнга включений должен быть положительным",
+                 'nu_c': lambda v: None if -1 < v < 0.5 else "коэффициент Пуассона включений вне (-1, 0.5)",
+                 'concentration': lambda v: None if 0 <= v <= 1 else "концентрация вне [0, 1]",
+                 'E_m': lambda v: None if v > 0 else "модуль Юнга матрицы должен быть положительным",
+                 'nu_m': lambda v: None if -1 < v < 0.5 else "коэффициент Пуассона матрицы вне (-1, 0.5)",
+                 'h': lambda v: None if v > 0 else "толщина пластины должна быть положительной"}
+STRING_FIELDS = {'type': lambda v: None if v in TYPES else f"модель композита не из {TYPES}",
+                 'ansys_file_name': lambda v: None if v else "пустое название файла ANSYS",
+                 'type_of_loading': lambda v: None if v in LOADINGS else f"вид нагрузки не из {LOADINGS}"}
+
+# Форматы каталогов по расширению файла.
+FORMATS = {'.jsonl': 'jsonl', '.ndjson': 'jsonl', '.csv': 'csv', '.parquet': 'parquet', '.pq': 'parquet'}
+
+# Количество строк Parquet, читаемых за один раз.
+BATCH_SIZE = 4096
+
+
+class CatalogError(ValueError):
+    """
+    Ошибка в записи каталога материалов.
+    """
+
+
+def validate(record):
+    """
+    Данная функция проверяет запись каталога по схеме из materials.py и приводит значения к нужным типам (например,
+    числа из CSV-файла).
+    :param record: словарь с полями записи (или ошибка разбора строки, см. iter_rows).
+    :return: словарь в формате materials.data (поле name по умолчанию равно ansys_file_name; прочие поля
+             сохраняются).
+    """
+    if not isinstance(record, dict):
+        raise CatalogError(f"запись не является объектом ({record})")
+    missing = [field for field in (*NUMBER_FIELDS, *STRING_FIELDS) if record.get(field) in (None, '')]
+    if missing:
+        raise CatalogError(f"нет полей {', '.join(missing)}")
+
+    result = dict(record)
+    for field, check in NUMBER_FIELDS.items():
+        value = record[field]
+        try:
+            if isinstance(value, bool):
+                raise ValueError
+            value = float(value)
+        except (TypeError, ValueError):
+            raise CatalogError(f"{field}={record[field]!r} не является числом") from None
+        error = check(value) if math.isfinite(value) else "значение не является конечным числом"
+        if error is not None:
+            raise CatalogError(f"{field}={record[field]!r}: {error}")
+        result[field] = value
+    for field, check in STRING_FIELDS.items():
+        if not isinstance(record[field], str):
+            raise CatalogError(f"{field}={record[field]!r} не является строкой")
+        error = check(record[field])
+        if error is not None:
+            raise CatalogError(f"{field}={record[field]!r}: {error}")
+    if not result.get('name'):
+        result['name'] = result['ansys_file_name']
+    return result
+
+
+def get_format(path):
+    """
+    Данная функция определяет формат каталога по расширению файла.
+    """
+    suffix = pathlib.Path(path).suffix.lower()
+    if suffix not in FORMATS:
+        raise ValueError(f"Неизвестный формат каталога материалов: {path} (поддерживаются {', '.join(FORMATS)})")
+    return FORMATS[suffix]
+
+
+def iter_rows(path, start=0, file_format=None):
+    """
+    Данная функция читает записи каталога без проверки (по одной, не загружая файл в память целиком).
+    :param path: путь к файлу JSONL, CSV или Parquet.
+    :param start: номер записи, с которой начинается чтение (предшествующие записи пропускаются без разбора).
+    :param file_format: формат ('jsonl', 'csv' или 'parquet'; по умолчанию определяется по расширению).
+    :return: генератор пар (номер записи, словарь); для строки JSONL, которую не удалось разобрать, вместо словаря
+             выдается ошибка разбора.
+    """
+    file_format = file_format or get_format(path)
+    if file_format == 'jsonl':
+        with open(path, 'rb') as file:
+            lines = (line for line in file if line.strip())
+            for row, line in enumerate(itertools.islice(lines, start, None), start):
+                try:
+                    record = json.loads(line)
+                except ValueError as error:
+                    record = error
+                yield row, record
+    elif file_format == 'csv':
+        with open(path, newline='', encoding='utf-8') as file:
+            reader = csv.DictReader(file)
+            yield from enumerate(itertools.islice(reader, start, None), start)
+    elif file_format == 'parquet':
+        yield from _iter_parquet(path, start)
+    else:
+        raise ValueError(f"Неизвестный формат каталога материалов: {file_format}")
+
+
+def read_catalog(path, start=0, errors='raise', file_format=None):
+    """
+    Данная функция читает каталог материалов потоком: записи проверяются по схеме (см. validate) и выдаются по
+    одной, поэтому объем памяти не зависит от размера каталога.
+    :param path: путь к файлу JSONL, CSV или Parquet (для Parquet необходим пакет pyarrow).
+    :param start: номер записи, с которой начинается чтение (для продолжения прерванного расчета, см. Checkpoint).
+    :param errors: 'raise' - ошибка в записи прерывает чтение (CatalogError), 'skip' - запись пропускается
+                   с сообщением об ошибке.
+    :param file_format: формат ('jsonl', 'csv' или 'parquet'; по умолчанию определяется по расширению).
+    :return: генератор пар (номер записи, пример в формате materials.data).
+    """
+    for row, record in iter_rows(path, start, file_format):
+        try:
+            record = validate(record)
+        except CatalogError as error:
+            message = f"{path}, запись №{row}: {error}"
+            if errors == 'raise':
+                raise CatalogError(message) from None
+            print(f"ERROR: {message}")
+            continue
+        yield row, record
+
+
+def _iter_parquet(path, start):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Для чтения каталогов Parquet необходим пакет pyarrow") from None
+
+    parquet_file = pq.ParquetFile(path)
+    # Группы строк, целиком предшествующие start, пропускаются без чтения.
+    row, first = 0, 0
+    while first < parquet_file.num_row_groups and row + parquet_file.metadata.row_group(first).num_rows <= start:
+        row += parquet_file.metadata.row_group(first).num_rows
+        first += 1
+    if first == parquet_file.num_row_groups:
+        return
+    for batch in parquet_file.iter_batches(batch_size=BATCH_SIZE,
+                                           row_groups=list(range(first, parquet_file.num_row_groups))):
+        for record in batch.to_pylist():
+            if row >= start:
+                yield row, record
+            row += 1
+
+
+class Checkpoint:
+    """
+    Контрольная точка потоковой обработки каталога: номер записи, начиная с которой обработка еще не завершена.
+    Записи могут завершаться не по порядку (параллельный расчет), поэтому сохраняется номер, следующий за последней
+    записью, до которой включительно все выданные записи обработаны.
+    """
+
+    def __init__(self, path, interval=1.0):
+        """
+        :param path: файл контрольной точки (если он существует, обработка продолжается с сохраненного номера).
+        :param interval: минимальный интервал между записями файла, с.
+        """
+        self.path = str(path)
+        self.interval = interval
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                self.start = int(file.read().strip() or 0)
+        except FileNotFoundError:
+            self.start = 0
+        self.position = self.start
+        # Выданные, но еще не обработанные записи (в порядке выдачи) и уже обработанные из них.
+        self._pending = []
+        self._done = set()
+        self._saved = self.start
+        self._save_time = 0
+
+    def submit(self, row):
+        # Запись выдана на обработку.
+        self._pending.append(row)
+
+    def complete(self, row):
+        # Запись обработана: контрольная точка сдвигается за все обработанные подряд записи.
+        self._done.add(row)
+        k = 0
+        while k < len(self._pending) and self._pending[k] in self._done:
+            self._done.remove(self._pending[k])
+            self.position = self._pending[k] + 1
+            k += 1
+        del self._pending[:k]
+        if time.monotonic() - self._save_time >= self.interval:
+            self.save()
+
+    def save(self):
+        """
+        Данная функция записывает контрольную точку в файл (через временный файл).
+        """
+        self._save_time = time.monotonic()
+        if self.position == self._saved:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            file.write(str(self.position))
+        os.replace(tmp_path, self.path)
+        self._saved = self.position
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Проверка каталога материалов (JSONL, CSV или Parquet).")
+    parser.add_argument('path', help="путь к каталогу")
+    args = parser.parse_args()
+
+    total = invalid = 0
+    for row, record in iter_rows(args.path):
+        total += 1
+        try:
+            validate(record)
+        except CatalogError as error:
+            invalid += 1
+            print(f"ERROR: запись №{row}: {error}")
+    print(f"Записей: {total}, с ошибками: {invalid}")
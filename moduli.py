@@ -0,0 +1,166 @@
+import numpy as np
+
+# Названия эффективных модулей композита (в порядке, возвращаемом get_modules).
+MODULES = ('E_1', 'E_2', 'E_3', 'n_12', 'n_21', 'n_13', 'n_23', 'G_12', 'G_13', 'G_23')
+
+# Коды моделей композита для пакетных вычислений.
+TYPE_CODES = {'fiber': 0, 'polydisperse': 1}
+
+# Флаги некорректных входных данных (побитовые).
+FLAG_UNKNOWN_TYPE = 1
+FLAG_POISSON = 2
+FLAG_CONCENTRATION = 4
+FLAG_YOUNG = 8
+FLAG_NOT_FINITE = 16
+
+# Тип записи структурированного массива, возвращаемого get_modules_batch.
+MODULES_DTYPE = np.dtype([(name, float) for name in MODULES] + [('flags', np.uint8)])
+
+
+def get_fiber_modules(E_c, nu_c, g_c, E_r, nu_r):
+    """
+    Данная функция вычисляет эффективные модули волокнистого композита (для скаляров или массивов NumPy).
+    :param E_c: модуль Юнга корда.
+    :param nu_c: коэффициент Пуассона корда.
+    :param g_c: концентрация корда.
+    :param E_r: модуль Юнга матрицы.
+    :param nu_r: коэффициент Пуассона матрицы.
+    :return: эффективные модули композита: E_1, E_2, E_3, n_12, n_21, n_13, n_23, G_12, G_13, G_23.
+    """
+    g_r = 1 - g_c
+
+    # Расчет эффективных модулей на основании формул для волокнистого композита.
+    _E_1 = E_c * g_c + E_r * g_r
+    _E_2 = 1 / (g_c / E_c + g_r / E_r - g_r * g_c * (nu_r / E_r - nu_c / E_c) * (nu_r / E_r - nu_c / E_c) / (
+            g_c / E_r + g_r / E_c))
+    _E_3 = _E_2
+    _n_12 = nu_c * g_c + nu_r * g_r
+    _n_21 = _n_12 * _E_2 / _E_1
+    _n_13 = _n_12
+    _n_23 = _n_12
+    _G_12 = 1 / (2 * g_c * (1 + nu_c) / E_c + 2 * g_r * (1 + nu_r) / E_r)
+    _G_13 = _G_12
+    _G_23 = _G_12
+    return [_E_1, _E_2, _E_3, _n_12, _n_21, _n_13, _n_23, _G_12, _G_13, _G_23]
+
+
+def get_polydisperse_modules(E_f, nu_f, g_f, E_m, nu_m):
+    """
+    Данная функция вычисляет эффективные модули полидисперсной среды (для скаляров или массивов NumPy).
+    :param E_f: модуль Юнга цилиндрических включений.
+    :param nu_f: коэффициент Пуассона цилиндрических включений.
+    :param g_f: концентрация включений.
+    :param E_m: модуль Юнга матрицы.
+    :param nu_m: коэффициент Пуассона матрицы.
+    :return: эффективные модули композита: E_1, E_2, E_3, n_12, n_21, n_13, n_23, G_12, G_13, G_23.
+    """
+    g_m = 1 - g_f
+
+    # Расчет эффективных модулей на основании формул для полидисперсной среды.
+    k_f = E_f / (3 * (1 - 2 * nu_f))
+    k_m = E_m / (3 * (1 - 2 * nu_m))
+    G_f = E_f / (2 * (1 + nu_f))
+    G_m = E_m / (2 * (1 + nu_m))
+    _E_1 = g_f * E_f + g_m * E_m + (4 * g_f * g_m * (nu_f - nu_m) ** 2 * G_m) / (
+            g_m * G_m / (k_f + G_f / 3) + g_f * G_m / (k_m + G_m / 3) + 1)
+    _n_12 = g_m * nu_m + g_f * nu_f + (
+            g_f * g_m * (nu_f - nu_m) * (G_m / (k_m + G_m / 3) - G_m / (k_f + G_f / 3))) / (
+                    g_m * G_m / (k_f + G_f / 3) + g_f * G_m / (k_m + G_m / 3) + 1)
+    K_23 = k_m + G_m / 3 + g_f / (1 / (k_f - k_m + 4 * (G_f - G_m) / 3) + g_m / (k_m + 4 * G_m / 3))
+    _G_12 = G_m * (G_f * (1 + g_f) + G_m * g_m) / (G_f * g_m + G_m * (1 + g_f))
+    _G_23 = G_m + g_f / (1 / (G_f - G_m) + g_m * (k_m + G_m / 3 + 2 * G_m) / (2 * G_m * (k_m + G_m / 3 + G_m)))
+    _E_2 = 4 * _G_23 * K_23 / (K_23 + _G_23 + 4 * _n_12 ** 2 * _G_23 * K_23 / _E_1)
+    _n_23 = (K_23 - _G_23 - 4 * _n_12 ** 2 * _G_23 * K_23 / _E_1) / (
+            K_23 + _G_23 + 4 * _n_12 ** 2 * _G_23 * K_23 / _E_1)
+    _n_21 = 4 * _n_12 * _G_23 * K_23 / (_E_1 * (K_23 + _G_23) + 4 * _n_12 ** 2 * _G_23 * K_23)
+    _E_3 = _E_2
+    _n_13 = _n_12
+    _G_13 = _G_12
+    return [_E_1, _E_2, _E_3, _n_12, _n_21, _n_13, _n_23, _G_12, _G_13, _G_23]
+
+
+def get_modules(a):
+    """
+    Данная функция позволяет определить эффективные модули композита по заданной модели и модулям материалов,
+    используемых в данной модели.
+    :param a: данные для примера (подробнее см. файл  materials.py).
+    :return: эффективные модули композита: E_1, E_2, E_3, n_12, n_21, n_13, n_23, G_12, G_13, G_23.
+    """
+    if a['type'] == "fiber":
+        # Параметры корда и матрицы.
+        return get_fiber_modules(a['E_c'], a['nu_c'], a['concentration'], a['E_m'], a['nu_m'])
+    elif a['type'] == "polydisperse":
+        # Параметры цилиндрических включений и матрицы.
+        return get_polydisperse_modules(a['E_c'], a['nu_c'], a['concentration'], a['E_m'], a['nu_m'])
+    else:
+        print("ERROR: Модель не найдена")
+        return None
+
+
+def get_material_table(data):
+    """
+    Данная функция преобразует список примеров (см. файл materials.py) в таблицу из массивов NumPy.
+    :param data: список словарей с данными для примеров.
+    :return: словарь с массивами E_c, nu_c, concentration, E_m, nu_m и type (код модели, см. TYPE_CODES; -1 для
+             неизвестной модели).
+    """
+    data = list(data)
+    table = {key: np.array([a[key] for a in data], dtype=float)
+             for key in ('E_c', 'nu_c', 'concentration', 'E_m', 'nu_m')}
+    table['type'] = np.array([TYPE_CODES.get(a['type'], -1) for a in data], dtype=np.int8)
+    return table
+
+
+def get_modules_batch(E_c, nu_c, concentration, E_m, nu_m, type_code):
+    """
+    Данная функция вычисляет эффективные модули сразу для массива композитов (аналог get_modules для таблицы
+    материалов, хранящейся в виде отдельных массивов).
+    :param E_c: модули Юнга включений.
+    :param nu_c: коэффициенты Пуассона включений.
+    :param concentration: концентрации включений.
+    :param E_m: модули Юнга матрицы.
+    :param nu_m: коэффициенты Пуассона матрицы.
+    :param type_code: коды моделей композита (см. TYPE_CODES).
+    :return: структурированный массив с полями E_1, ..., G_23 (см. MODULES) и flags - побитовыми признаками
+             некорректных входных данных (FLAG_*). Для строк с ненулевыми флагами модули равны NaN.
+    """
+    E_c, nu_c, g, E_m, nu_m = np.broadcast_arrays(*(np.asarray(v, dtype=float)
+                                                    for v in (E_c, nu_c, concentration, E_m, nu_m)))
+    type_code = np.broadcast_to(np.asarray(type_code), E_c.shape)
+
+    # Проверка входных данных.
+    flags = np.zeros(E_c.shape, dtype=np.uint8)
+    flags[~np.isin(type_code, list(TYPE_CODES.values()))] |= FLAG_UNKNOWN_TYPE
+    flags[~((-1 < nu_c) & (nu_c < 0.5) & (-1 < nu_m) & (nu_m < 0.5))] |= FLAG_POISSON
+    flags[~((0 <= g) & (g <= 1))] |= FLAG_CONCENTRATION
+    flags[~((E_c > 0) & (E_m > 0))] |= FLAG_YOUNG
+
+    # Модули сначала вычисляются в отдельные (непрерывные в памяти) массивы, и лишь затем записываются в результат.
+    columns = [np.full(E_c.shape, np.nan) for _ in MODULES]
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for code, get in ((TYPE_CODES['fiber'], get_fiber_modules),
+                          (TYPE_CODES['polydisperse'], get_polydisperse_modules)):
+            mask = type_code == code
+            if mask.all():
+                # Все композиты описываются одной моделью: обходимся без выборки по маске.
+                columns = [np.broadcast_to(value, E_c.shape) for value in get(E_c, nu_c, g, E_m, nu_m)]
+            elif mask.any():
+                values = get(E_c[mask], nu_c[mask], g[mask], E_m[mask], nu_m[mask])
+                for column, value in zip(columns, values):
+                    column[mask] = value
+
+    # Строки с корректными входными данными, в которых хотя бы один знаменатель обратился в ноль.
+    finite = np.isfinite(columns[0])
+    for column in columns[1:]:
+        finite &= np.isfinite(column)
+    flags[~finite & (flags == 0)] |= FLAG_NOT_FINITE
+
+    result = np.empty(E_c.shape, dtype=MODULES_DTYPE)
+    for name, column in zip(MODULES, columns):
+        result[name] = column
+    result['flags'] = flags
+    invalid = flags != 0
+    if invalid.any():
+        for name in MODULES:
+            result[name][invalid] = np.nan
+    return result
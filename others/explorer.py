@@ -0,0 +1,262 @@
+import argparse
+import pathlib
+import sys
+import time
+import numpy as np
+import matplotlib.pyplot as plt
+import matplotlib.ticker as ticker
+from matplotlib.widgets import RadioButtons, Slider
+
+sys.path.append(str(pathlib.Path(__file__).parent.parent.resolve()))
+import materials
+import moduli
+import theories
+
+# Слайдеры: ключ в данных примера (см. materials.py), подпись, минимальное и максимальное значения.
+SLIDERS = (('E_c', '$E_c$', 0.01, 500.0),
+           ('nu_c', '$\\nu_c$', 0.0, 0.49),
+           ('concentration', '$c$', 0.0, 1.0),
+           ('E_m', '$E_m$', 0.001, 10.0),
+           ('nu_m', '$\\nu_m$', 0.0, 0.499),
+           ('h', '$h$', 0.005, 0.2))
+
+# Допустимое время обработки одного кадра, с (60 кадров в секунду).
+FRAME_BUDGET = 0.016
+
+# Точки, в которых вычисляются кривые. Кривые - многочлены невысокой степени (см. theories.get_polynomials), поэтому
+# для изображения на экране достаточно шага 0.004: это в 4 раза сокращает время отрисовки кадра.
+x = np.arange(0, 1, 0.004)
+z = np.arange(-1 / 2, 1 / 2, 0.004)
+
+# Графики: ключ в результатах theories.get_curves, заголовок, подписи осей и ось x.
+PLOTS = (('w', 'Прогиб пластины', ('$x$', '$w(x)$'), x),
+         ('s11', 'Распределение напряжений $\\sigma_{11}$', ('$z$', '$\\sigma_{11}$'), z),
+         ('s13', 'Распределение напряжений $\\sigma_{13}$', ('$z$', '$\\sigma_{13}$'), z))
+
+# Параметры линий.
+line_width = 1.0
+marker_size = 8
+colors = [(0.93, 0.6940, 0.0),
+          (0.90, 0.5140, 0.0),
+          (0.301, 0.7450, 0.9330),
+          (0.361, 0.4050, 1.0),
+          (0.0, 0.70, 0.0),
+          (0.0, 0.45, 0.0),
+          (0.4940, 0.1840, 0.5560),
+          (0.3540, 0.1840, 0.4560)]
+markers = ["v", "^", "s", "o"]
+legend = ('Kirchhoff-Love theory', 'Reissner-Mindlin theory', 'Reddy theory', 'Asymptotic theory')
+axis_color = 'lightgoldenrodyellow'
+
+
+class Explorer:
+    """
+    Интерактивный график прогибов и напряжений всех теорий. Параметры композита и пластины задаются слайдерами,
+    модель композита и вид нагрузки - переключателями. События слайдеров объединяются: пока кадр не обработан, новые
+    события лишь запоминают значения, а кадр строится по последним из них. Каждая кривая вычисляется один раз за кадр
+    (см. theories.get_curves), а на экран перерисовываются только линии (blitting); полная перерисовка выполняется,
+    лишь когда кривые выходят за пределы осей или заметно уменьшаются.
+    """
+
+    def __init__(self, a):
+        """
+        :param a: данные для примера (подробнее см. файл materials.py), задающие начальные значения.
+        """
+        self.type = a['type']
+        self.type_of_loading = a['type_of_loading']
+        self.frame_times = []
+        self.redraws = 0
+        self.background = None
+        self.pending = False
+        self.status_time = 0
+
+        # Насечки на осях
+        plt.rcParams['ytick.right'] = True
+        plt.rcParams['ytick.direction'] = 'in'
+        plt.rcParams['xtick.top'] = True
+        plt.rcParams['xtick.direction'] = 'in'
+
+        self.fig = plt.figure(figsize=[12.0, 10.0])
+        self.fig.subplots_adjust(left=0.1, right=0.7, top=0.95, bottom=0.06, hspace=0.45)
+
+        # Линии анимируются: при полной перерисовке они не рисуются, а накладываются на сохраненный фон.
+        self.axes, self.lines = {}, {}
+        for n, (key, title, labels, axis_x) in enumerate(PLOTS):
+            ax = self.fig.add_subplot(len(PLOTS), 1, n + 1)
+            ax.set_title(title, fontsize=11)
+            ax.set(xlabel=labels[0], ylabel=labels[1])
+            self.lines[key] = [ax.plot(axis_x, np.zeros_like(axis_x), linewidth=line_width, linestyle='--',
+                                       color=colors[2 * j], marker=markers[j], markersize=marker_size,
+                                       markevery=(5 * j, 20), markeredgecolor=colors[2 * j + 1], animated=True)[0]
+                               for j in range(len(theories.THEORIES))]
+            ax.legend(legend, loc='upper right', fontsize=8, framealpha=0.95)
+            ax.set_xlim([axis_x[0], axis_x[-1]])
+            ax.ticklabel_format(style='sci', axis='y', scilimits=(0, 0))
+            ax.grid(which='major', color='k', linestyle=':', linewidth=0.6)
+            ax.minorticks_on()
+            ax.xaxis.set_major_locator(ticker.MultipleLocator(0.1))
+            ax.xaxis.set_minor_locator(ticker.MultipleLocator(0.025))
+            self.axes[key] = ax
+
+        # Слайдеры.
+        self.sliders = {}
+        for n, (key, label, minimum, maximum) in enumerate(SLIDERS):
+            ax = self.fig.add_axes([0.74 + 0.04 * n, 0.36, 0.012, 0.58], facecolor=axis_color)
+            self.sliders[key] = Slider(ax, label, minimum, maximum, valinit=a[key], orientation="vertical")
+            self.sliders[key].on_changed(self.request_update)
+
+        # Переключатели модели композита и вида нагрузки.
+        self.type_buttons = RadioButtons(self.fig.add_axes([0.74, 0.19, 0.22, 0.1], facecolor=axis_color),
+                                         list(moduli.TYPE_CODES), active=list(moduli.TYPE_CODES).index(self.type))
+        self.type_buttons.on_clicked(self.set_type)
+        self.loading_buttons = RadioButtons(self.fig.add_axes([0.74, 0.07, 0.22, 0.1], facecolor=axis_color),
+                                            list(theories.LOADINGS),
+                                            active=list(theories.LOADINGS).index(self.type_of_loading))
+        self.loading_buttons.on_clicked(self.set_type_of_loading)
+
+        # Таймер, по которому обрабатываются накопившиеся события.
+        self.timer = self.fig.canvas.new_timer(interval=1)
+        self.timer.single_shot = True
+        self.timer.add_callback(self.update)
+        self.fig.canvas.mpl_connect('draw_event', self.on_draw)
+
+        self.update()
+
+    def get_curves(self):
+        """
+        Данная функция вычисляет кривые всех теорий для текущих значений слайдеров.
+        :return: результат theories.get_curves или None, если входные данные некорректны.
+        """
+        values = {key: slider.val for key, slider in self.sliders.items()}
+        modules = moduli.get_modules_batch(values['E_c'], values['nu_c'], values['concentration'], values['E_m'],
+                                           values['nu_m'], moduli.TYPE_CODES[self.type])
+        if modules['flags']:
+            return None
+        return theories.get_curves(modules, values['h'], self.type_of_loading, x, z)
+
+    def request_update(self, _=None):
+        # Объединение событий: кадр строится по таймеру, а события, пришедшие до этого, лишь запоминают значения.
+        if not self.pending:
+            self.pending = True
+            self.timer.start()
+
+    def set_type(self, label):
+        self.type = label
+        self.request_update()
+
+    def set_type_of_loading(self, label):
+        self.type_of_loading = label
+        self.request_update()
+
+    def update(self):
+        """
+        Данная функция строит кадр по текущим значениям слайдеров и переключателей.
+        """
+        self.pending = False
+        start = time.perf_counter()
+        curves = self.get_curves()
+        if curves is None:
+            # Некорректные входные данные: линии скрываются.
+            for lines in self.lines.values():
+                for line in lines:
+                    line.set_ydata(np.full_like(line.get_xdata(), np.nan))
+            self._blit()
+            self._show_status('некорректные входные данные')
+            return
+
+        redraw = False
+        for key, lines in self.lines.items():
+            for line, y in zip(lines, curves[key]):
+                line.set_ydata(y)
+            redraw |= self._update_limits(self.axes[key], curves[key].min(), curves[key].max())
+
+        if redraw or self.background is None:
+            # Пределы осей изменились: фон (оси, подписи, сетка) необходимо перерисовать полностью.
+            self.redraws += 1
+            self.fig.canvas.draw()
+        else:
+            self._blit()
+
+        self.frame_times.append(time.perf_counter() - start)
+        # Время кадра выводится в заголовок окна не чаще 4 раз в секунду (вывод текста на график занимал бы
+        # заметную часть кадра).
+        if start - self.status_time > 0.25:
+            self.status_time = start
+            self._show_status(f"кадр: {np.median(self.frame_times[-30:]) * 1e3:.1f} мс")
+
+    def _show_status(self, text):
+        if self.fig.canvas.manager is not None:
+            self.fig.canvas.manager.set_window_title(f"Сравнение теорий: {text}")
+
+    def on_draw(self, _):
+        # После полной перерисовки сохраняем фон и накладываем на него анимируемые линии.
+        self.background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+
+    def _blit(self):
+        if self.background is None:
+            return
+        self.fig.canvas.restore_region(self.background)
+        self._draw_animated()
+        self.fig.canvas.blit(self.fig.bbox)
+
+    def _draw_animated(self):
+        for key, lines in self.lines.items():
+            for line in lines:
+                self.axes[key].draw_artist(line)
+
+    @staticmethod
+    def _update_limits(ax, y_min, y_max):
+        # Пределы оси y меняются (с запасом 25%), только если кривые выходят за них или занимают менее четверти
+        # высоты графика: это делает полную перерисовку редкой при плавном движении слайдеров.
+        y_min, y_max = min(y_min, 0), max(y_max, 0)
+        bottom, top = ax.get_ylim()
+        span = max(y_max - y_min, 1e-300)
+        if bottom <= y_min and y_max <= top and span >= (top - bottom) / 4:
+            return False
+        ax.set_ylim([y_min - 0.25 * span if y_min < 0 else 0, y_max + 0.25 * span if y_max > 0 else 0])
+        return True
+
+
+def benchmark(explorer, frames, seed=0):
+    """
+    Данная функция имитирует перетаскивание слайдеров и измеряет время обработки кадров.
+    :param explorer: объект Explorer.
+    :param frames: количество кадров.
+    :param seed: начальное значение генератора случайных чисел.
+    """
+    rng = np.random.default_rng(seed)
+    explorer.frame_times.clear()
+    explorer.redraws = 0
+    for n in range(frames):
+        # Каждые 20 кадров перетаскивается другой слайдер: на каждом кадре он смещается на 0.5% диапазона.
+        if n % 20 == 0:
+            key, _, minimum, maximum = SLIDERS[rng.integers(len(SLIDERS))]
+            step = rng.choice([-1, 1]) * 0.005 * (maximum - minimum)
+        slider = explorer.sliders[key]
+        slider.eventson = False
+        slider.set_val(np.clip(slider.val + step, minimum, maximum))
+        slider.eventson = True
+        explorer.update()
+
+    times = np.array(explorer.frame_times) * 1e3
+    print(f"Кадров: {times.size} (полных перерисовок: {explorer.redraws}), медиана: {np.median(times):.2f} мс, "
+          f"95%: {np.percentile(times, 95):.2f} мс, максимум: {times.max():.2f} мс, "
+          f"в пределах {FRAME_BUDGET * 1e3:.0f} мс: {np.mean(times <= FRAME_BUDGET * 1e3) * 100:.1f}%")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Интерактивное сравнение теорий изгиба пластины.")
+    parser.add_argument('-n', '--example', type=int, default=0,
+                        help="номер примера из materials.py для начальных значений (по умолчанию 0)")
+    parser.add_argument('--benchmark', type=int, default=0, metavar='FRAMES',
+                        help="без окна: измерить время обработки заданного количества кадров")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        plt.switch_backend('Agg')
+    explorer = Explorer(materials.data[args.example])
+    if args.benchmark:
+        benchmark(explorer, args.benchmark)
+    else:
+        plt.show()
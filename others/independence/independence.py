@@ -1,15 +1,11 @@
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
 from matplotlib import rc
+import pathlib
+import sys
 
-
-def get_data(file_name, k_1=1, k_2=0.0):
-    res_x, res_y = [], []
-    for line in open(file_name, 'r'):
-        values = [float(s) for s in line.split()]
-        res_x.append(values[0] * k_1 - k_2)
-        res_y.append(values[1])
-    return res_x, res_y
+sys.path.append(str(pathlib.Path(__file__).parent.parent.parent.resolve()))
+from ansys_io import load_results
 
 
 rc('font', **{'family': 'sans-serif', 'sans-serif': ['Helvetica']})
@@ -65,7 +61,7 @@ filenames_w = ['ansys_results//Results_U_100.txt',
 w_x, w_y = [], []
 
 for i in filenames_w:
-    a, b = get_data(i)
+    a, b = load_results(i)
     w_x.append(a)
     w_y.append(b)
 
@@ -100,7 +96,7 @@ filenames_s = ['ansys_results//Results_S_100.txt',
 s_x, s_y = [], []
 
 for i in filenames_s:
-    a, b = get_data(i, 20, 0.5)
+    a, b = load_results(i, 20, 0.5)
     s_x.append(a)
     s_y.append(b)
 
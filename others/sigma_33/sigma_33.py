@@ -4,15 +4,11 @@ import sympy as sym
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
 from matplotlib import rc
+import pathlib
+import sys
 
-
-def get_data(file_name, k_1=1, k_2=0.0):
-    res_x, res_y = [], []
-    for line in open(file_name, 'r'):
-        values = [float(s) for s in line.split()]
-        res_x.append(values[0] * k_1 - k_2)
-        res_y.append(values[1])
-    return res_x, res_y
+sys.path.append(str(pathlib.Path(__file__).parent.parent.parent.resolve()))
+from ansys_io import load_results
 
 
 rc('font', **{'family': 'serif', 'size': 30})
@@ -75,7 +71,7 @@ ax = fig_s.add_subplot(1, 1, 1)
 s_x, s_y = [], []
 
 for i in filenames_s:
-    a, b = get_data(i, 20, 0.5)
+    a, b = load_results(i, 20, 0.5)
     s_x.append(a)
     s_y.append(b)
 
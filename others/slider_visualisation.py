@@ -1,10 +1,14 @@
-from sympy.utilities.lambdify import lambdify
 from sympy.abc import x
 import numpy as np
 import sympy as sym
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
 from matplotlib.widgets import Slider
+import pathlib
+import sys
+
+sys.path.append(str(pathlib.Path(__file__).parent.parent.resolve()))
+from lambdify_cache import cached_lambdify
 
 x = sym.Symbol('x')
 z = sym.Symbol('z')
@@ -144,15 +148,15 @@ high = 0.05
 axE_1 = plt.axes([0.88, 0.06, 0.01, 0.86], facecolor=axis_color)
 axG_13 = plt.axes([0.94, 0.06, 0.01, 0.86], facecolor=axis_color)
 
-evalfunc_w = lambdify((E_1, G_13, x), w, modules=['numpy'])
-evalfunc_w_KL = lambdify((E_1, G_13, x), w_KL, modules=['numpy'])
-evalfunc_w_RM = lambdify((E_1, G_13, x), w_RM, modules=['numpy'])
-evalfunc_w_R = lambdify((E_1, G_13, x), w_R, modules=['numpy'])
+evalfunc_w = cached_lambdify((E_1, G_13, x), w, modules=['numpy'])
+evalfunc_w_KL = cached_lambdify((E_1, G_13, x), w_KL, modules=['numpy'])
+evalfunc_w_RM = cached_lambdify((E_1, G_13, x), w_RM, modules=['numpy'])
+evalfunc_w_R = cached_lambdify((E_1, G_13, x), w_R, modules=['numpy'])
 
-evalfunc_s = lambdify((E_1, G_13, z), s11_variable, modules=['numpy'])
-evalfunc_s_KL = lambdify((E_1, G_13, z), s11_KL_variable, modules=['numpy'])
-evalfunc_s_RM = lambdify((E_1, G_13, z), s11_RM_variable, modules=['numpy'])
-evalfunc_s_R = lambdify((E_1, G_13, z), s11_R_variable, modules=['numpy'])
+evalfunc_s = cached_lambdify((E_1, G_13, z), s11_variable, modules=['numpy'])
+evalfunc_s_KL = cached_lambdify((E_1, G_13, z), s11_KL_variable, modules=['numpy'])
+evalfunc_s_RM = cached_lambdify((E_1, G_13, z), s11_RM_variable, modules=['numpy'])
+evalfunc_s_R = cached_lambdify((E_1, G_13, z), s11_R_variable, modules=['numpy'])
 
 SE_1 = Slider(axE_1, 'E_1', 1.0, 1000.0, valinit=1, valstep=1, orientation="vertical")
 SG_13 = Slider(axG_13, 'G_13', 0.001, 10.0, valinit=1, valstep=0.01, orientation="vertical")
@@ -219,21 +223,17 @@ ay.xaxis.set_minor_locator(ticker.MultipleLocator(0.025))
 def update(val):
     _E_1 = SE_1.val
     _G_13 = SG_13.val
-    l_1.set_ydata(evalfunc_w(_E_1, _G_13, x))
-    l_2.set_ydata(evalfunc_w_KL(_E_1, _G_13, x))
-    l_3.set_ydata(evalfunc_w_RM(_E_1, _G_13, x))
-    l_4.set_ydata(evalfunc_w_R(_E_1, _G_13, x))
-    l_5.set_ydata(evalfunc_s(_E_1, _G_13, z))
-    l_6.set_ydata(evalfunc_s_KL(_E_1, _G_13, z))
-    l_7.set_ydata(evalfunc_s_RM(_E_1, _G_13, z))
-    l_8.set_ydata(evalfunc_s_R(_E_1, _G_13, z))
-
-    w_min = min(evalfunc_w(_E_1, _G_13, x).min(), evalfunc_w_KL(_E_1, _G_13, x).min(),
-                evalfunc_w_RM(_E_1, _G_13, x).min(), evalfunc_w_R(_E_1, _G_13, x).min())
-    s_min = min(evalfunc_s(_E_1, _G_13, z).min(), evalfunc_s_KL(_E_1, _G_13, z).min(),
-                evalfunc_s_RM(_E_1, _G_13, z).min(), evalfunc_s_R(_E_1, _G_13, z).min())
-    s_max = max(evalfunc_s(_E_1, _G_13, z).max(), evalfunc_s_KL(_E_1, _G_13, z).max(),
-                evalfunc_s_RM(_E_1, _G_13, z).max(), evalfunc_s_R(_E_1, _G_13, z).max())
+    # Каждая кривая вычисляется один раз: полученные значения используются и для линий, и для пределов осей.
+    values_w = [evalfunc_w(_E_1, _G_13, x), evalfunc_w_KL(_E_1, _G_13, x), evalfunc_w_RM(_E_1, _G_13, x),
+                evalfunc_w_R(_E_1, _G_13, x)]
+    values_s = [evalfunc_s(_E_1, _G_13, z), evalfunc_s_KL(_E_1, _G_13, z), evalfunc_s_RM(_E_1, _G_13, z),
+                evalfunc_s_R(_E_1, _G_13, z)]
+    for line, values in zip((l_1, l_2, l_3, l_4, l_5, l_6, l_7, l_8), values_w + values_s):
+        line.set_ydata(values)
+
+    w_min = min(values.min() for values in values_w)
+    s_min = min(values.min() for values in values_s)
+    s_max = max(values.max() for values in values_s)
 
     ax.set_ylim([1.05 * w_min, 0])
     ax.yaxis.set_major_locator(ticker.MultipleLocator(-1 * w_min / 10))
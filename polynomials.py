@@ -0,0 +1,132 @@
+import numpy as np
+
+
+def polyval(c, t):
+    """
+    Данная функция вычисляет значения многочленов по схеме Горнера сразу для массива многочленов.
+    :param c: коэффициенты по возрастанию степеней: массив формы (..., степень + 1).
+    :param t: точки: массив формы (n,).
+    :return: массив формы (..., n).
+    """
+    # Точки приводятся к типу коэффициентов (float32 остается float32, целые приводятся к float64).
+    c = np.asarray(c)
+    t = np.asarray(t, dtype=np.result_type(c, 1.0))
+    result = np.broadcast_to(c[..., -1:], c.shape[:-1] + t.shape).astype(t.dtype)
+    for k in range(c.shape[-1] - 2, -1, -1):
+        result *= t
+        result += c[..., k:k + 1]
+    return result
+
+
+def piecewise_polyval(c, breaks, t):
+    """
+    Данная функция вычисляет значения кусочно-многочленных функций (например, прогибов, см. theories.get_polynomials).
+    :param c: коэффициенты: массив формы (..., участок, m, степень + 1).
+    :param breaks: точки разбиения (участок k - это breaks[k] <= t < breaks[k + 1]).
+    :param t: точки: массив формы (n,).
+    :return: массив формы (..., m, n).
+    """
+    c = np.asarray(c)
+    t = np.asarray(t, dtype=np.result_type(c, 1.0))
+    pieces = np.clip(np.searchsorted(breaks, t, side='right') - 1, 0, len(breaks) - 2)
+    result = np.empty(c.shape[:-3] + c.shape[-2:-1] + t.shape, dtype=t.dtype)
+    for k in range(len(breaks) - 1):
+        index = np.flatnonzero(pieces == k)
+        if not len(index):
+            continue
+        # Для упорядоченных точек участок - непрерывный диапазон: запись по срезу намного быстрее, чем по маске.
+        if index[-1] - index[0] + 1 == len(index):
+            index = slice(index[0], index[-1] + 1)
+        result[..., index] = polyval(c[..., k, :, :], t[index])
+    return result
+
+
+def polyder(c, m=1):
+    """
+    Данная функция вычисляет коэффициенты производной многочленов (точно).
+    :param c: коэффициенты по возрастанию степеней: массив формы (..., степень + 1).
+    :param m: порядок производной.
+    :return: массив коэффициентов той же формы (старшие коэффициенты равны нулю).
+    """
+    c = np.asarray(c, dtype=float)
+    for _ in range(m):
+        c = np.concatenate([c[..., 1:] * np.arange(1, c.shape[-1]), np.zeros(c.shape[:-1] + (1,))], axis=-1)
+    return c
+
+
+def polyint(c, m=1, lbnd=0):
+    """
+    Данная функция вычисляет коэффициенты первообразной многочленов (точно), равной нулю в точке lbnd.
+    :param c: коэффициенты по возрастанию степеней: массив формы (..., степень + 1).
+    :param m: кратность интегрирования.
+    :param lbnd: нижний предел интегрирования.
+    :return: массив коэффициентов формы (..., степень + 1 + m).
+    """
+    c = np.asarray(c, dtype=float)
+    for _ in range(m):
+        c = np.concatenate([np.zeros(c.shape[:-1] + (1,)), c / np.arange(1, c.shape[-1] + 1)], axis=-1)
+        c[..., 0] = -polyval(c, np.array([lbnd]))[..., 0]
+    return c
+
+
+def get_roots(c):
+    """
+    Данная функция находит корни многочленов как собственные значения сопровождающих матриц (сразу для массива
+    многочленов; многочлены группируются по фактической степени).
+    :param c: коэффициенты по возрастанию степеней: массив формы (..., степень + 1).
+    :return: комплексный массив формы (..., степень), лишние элементы (если фактическая степень меньше) равны NaN.
+    """
+    c = np.asarray(c, dtype=float)
+    n = c.shape[-1] - 1
+    flat = c.reshape(-1, n + 1)
+    roots = np.full((flat.shape[0], max(n, 0)), np.nan, dtype=complex)
+    nonzero = flat != 0
+    degrees = np.where(nonzero.any(axis=-1), n - np.argmax(nonzero[:, ::-1], axis=-1), 0)
+    for degree in range(1, n + 1):
+        rows = np.flatnonzero(degrees == degree)
+        if rows.size == 0:
+            continue
+        # Сопровождающая матрица приведенного многочлена.
+        monic = flat[rows, :degree] / flat[rows, degree:degree + 1]
+        companion = np.zeros((rows.size, degree, degree))
+        companion[:, np.arange(1, degree), np.arange(degree - 1)] = 1
+        companion[:, :, -1] = -monic
+        roots[rows, :degree] = np.linalg.eigvals(companion)
+    return roots.reshape(c.shape[:-1] + (max(n, 0),))
+
+
+def get_extremum(c, a, b):
+    """
+    Данная функция находит точный максимум модуля многочленов на отрезке [a, b]: он достигается либо на концах
+    отрезка, либо в вещественном корне производной (например, максимальный прогиб или максимальное напряжение).
+    :param c: коэффициенты по возрастанию степеней: массив формы (..., степень + 1).
+    :param a: левый конец отрезка.
+    :param b: правый конец отрезка.
+    :return: точки максимума и значения многочленов в них (со знаком): массивы формы (...).
+    """
+    c = np.asarray(c, dtype=float)
+    roots = get_roots(polyder(c)[..., :-1]) if c.shape[-1] > 1 else np.empty(c.shape[:-1] + (0,), dtype=complex)
+    real = (np.abs(roots.imag) <= 1e-12 * np.maximum(1, np.abs(roots.real))) & (roots.real >= a) & (roots.real <= b)
+    candidates = np.where(real, roots.real, a)
+    candidates = np.concatenate([candidates, np.broadcast_to([a, b], c.shape[:-1] + (2,))], axis=-1)
+    # Значения многочленов в точках-кандидатах (схема Горнера для своих точек у каждого многочлена).
+    values = np.zeros(candidates.shape)
+    for k in range(c.shape[-1] - 1, -1, -1):
+        values = values * candidates + c[..., k:k + 1]
+    index = np.argmax(np.abs(values), axis=-1)[..., None]
+    return np.take_along_axis(candidates, index, axis=-1)[..., 0], np.take_along_axis(values, index, axis=-1)[..., 0]
+
+
+def get_piecewise_extremum(c, breaks):
+    """
+    Данная функция находит точный максимум модуля кусочно-многочленных функций (например, максимальный прогиб
+    для всех теорий, см. theories.get_polynomials) на отрезке [breaks[0], breaks[-1]].
+    :param c: коэффициенты: массив формы (..., участок, m, степень + 1).
+    :param breaks: точки разбиения.
+    :return: точки максимума и значения функций в них (со знаком): массивы формы (..., m).
+    """
+    points, values = zip(*(get_extremum(c[..., k, :, :], breaks[k], breaks[k + 1]) for k in range(len(breaks) - 1)))
+    points, values = np.stack(points, axis=-1), np.stack(values, axis=-1)
+    index = np.argmax(np.abs(values), axis=-1)[..., None]
+    return np.take_along_axis(points, index, axis=-1)[..., 0], np.take_along_axis(values, index, axis=-1)[..., 0]
+
@@ -0,0 +1,216 @@
+import contextlib
+import cProfile
+import functools
+import json
+import pathlib
+import pstats
+import resource
+import time
+import tracemalloc
+
+# Количество функций с наибольшим суммарным временем, попадающих в отчет cProfile.
+TOP_FUNCTIONS = 30
+
+# Профилировщик, активный в текущем процессе (None - профилирование выключено).
+_profiler = None
+
+
+class Profiler:
+    """
+    Профилировщик одного запуска (например, расчета одного примера): время и количество вызовов каждого этапа,
+    пиковый объем памяти (по данным tracemalloc) и, при необходимости, полный профиль cProfile. Этапы могут быть
+    вложенными: этап 'compute/lambdify' - это вызовы lambdify внутри этапа 'compute'. Активируется конструкцией
+    with Profiler(): ..., после чего этапы отмечаются функцией stage или декоратором profiled.
+    """
+
+    def __init__(self, memory=False, cprofile=False):
+        """
+        :param memory: отслеживать пиковый объем памяти этапов (tracemalloc заметно замедляет расчет).
+        :param cprofile: собирать профиль cProfile.
+        """
+        self.memory = memory
+        self.cprofile = cprofile
+        self.stages = {}
+        self.time = 0
+        self._stack = []
+        self._profile = None
+        self._previous = None
+        self._tracing = False
+
+    def __enter__(self):
+        global _profiler
+        self._previous, _profiler = _profiler, self
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        if self.cprofile:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        global _profiler
+        self.time += time.perf_counter() - self._start
+        if self._profile is not None:
+            self._profile.disable()
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+        _profiler = self._previous
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """
+        Данная функция (контекстный менеджер) замеряет один вызов этапа.
+        :param name: название этапа (вложенные этапы получают составное название через '/').
+        """
+        path = self._stack[-1][0] + '/' + name if self._stack else name
+        self._update_peak()
+        # Название, время начала, время вложенных этапов и пиковый объем памяти.
+        frame = [path, time.perf_counter(), 0.0, 0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - frame[1]
+            self._stack.pop()
+            peak = max(frame[3], tracemalloc.get_traced_memory()[1]) if tracemalloc.is_tracing() else 0
+            record = self.stages.setdefault(path, {'calls': 0, 'time': 0.0, 'self_time': 0.0, 'peak_memory': 0})
+            record['calls'] += 1
+            record['time'] += elapsed
+            record['self_time'] += elapsed - frame[2]
+            record['peak_memory'] = max(record['peak_memory'], peak)
+            if self._stack:
+                self._stack[-1][2] += elapsed
+                self._stack[-1][3] = max(self._stack[-1][3], peak)
+
+    def _update_peak(self):
+        # Пик памяти с начала текущего этапа запоминается, после чего отсчет пика начинается заново для нового этапа.
+        if not tracemalloc.is_tracing():
+            return
+        if self._stack:
+            self._stack[-1][3] = max(self._stack[-1][3], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+
+    def get_functions(self, limit=TOP_FUNCTIONS):
+        """
+        Данная функция возвращает функции с наибольшим суммарным временем по данным cProfile.
+        :param limit: количество функций.
+        :return: список словарей: 'function' - файл, строка и имя функции, 'calls' - количество вызовов, 'time' -
+                 собственное время, 'cumulative_time' - время с учетом вызываемых функций.
+        """
+        if self._profile is None:
+            return []
+        stats = pstats.Stats(self._profile).stats
+        functions = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+        return [{'function': f"{file}:{line}({name})", 'calls': calls, 'time': own, 'cumulative_time': cumulative}
+                for (file, line, name), (_, calls, own, cumulative, _) in functions]
+
+    def dump_stats(self, path):
+        """
+        Данная функция сохраняет профиль cProfile (для просмотра модулем pstats, snakeviz и т. п.).
+        :param path: путь к файлу.
+        """
+        if self._profile is not None:
+            self._profile.dump_stats(path)
+
+    def get_report(self):
+        """
+        Данная функция возвращает результаты профилирования (JSON-совместимый словарь): общее время, максимальный
+        объем резидентной памяти процесса, этапы и функции cProfile.
+        """
+        return {'time': self.time, 'max_rss': get_max_rss(), 'memory': self.memory, 'stages': self.stages,
+                'functions': self.get_functions()}
+
+
+def get_max_rss():
+    # Максимальный объем резидентной памяти процесса, байт (ru_maxrss в Linux задается в килобайтах).
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def stage(name):
+    """
+    Данная функция отмечает этап для активного профилировщика (см. Profiler.stage); если профилирование выключено,
+    она ничего не делает.
+    :param name: название этапа.
+    """
+    return _profiler.stage(name) if _profiler is not None else contextlib.nullcontext()
+
+
+def profiled(name):
+    """
+    Декоратор: каждый вызов функции замеряется как этап name (см. stage).
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _profiler is None:
+                return func(*args, **kwargs)
+            with _profiler.stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_totals(reports):
+    """
+    Данная функция суммирует этапы по всем запускам.
+    :param reports: список результатов профилирования (см. Profiler.get_report).
+    :return: словарь этапов в формате Profiler.stages.
+    """
+    totals = {}
+    for report in reports:
+        for path, record in report['stages'].items():
+            total = totals.setdefault(path, {'calls': 0, 'time': 0.0, 'self_time': 0.0, 'peak_memory': 0})
+            for key in ('calls', 'time', 'self_time'):
+                total[key] += record[key]
+            total['peak_memory'] = max(total['peak_memory'], record['peak_memory'])
+    return totals
+
+
+def format_report(reports):
+    """
+    Данная функция формирует текстовый отчет.
+    :param reports: список результатов профилирования с названиями запусков (ключ 'name').
+    :return: строка.
+    """
+    lines = []
+
+    def add_stages(stages, total_time):
+        lines.append(f"    {'этап':<36}{'вызовы':>8}{'время, с':>11}{'собств., с':>12}{'доля':>8}{'память, МБ':>12}")
+        for path in sorted(stages):
+            record = stages[path]
+            name = '  ' * path.count('/') + path.rsplit('/', 1)[-1]
+            share = record['time'] / total_time * 100 if total_time else 0
+            memory = f"{record['peak_memory'] / 2 ** 20:.1f}" if record['peak_memory'] else '-'
+            lines.append(f"    {name:<36}{record['calls']:>8}{record['time']:>11.3f}{record['self_time']:>12.3f}"
+                         f"{share:>7.1f}%{memory:>12}")
+
+    for report in reports:
+        lines.append(f"{report['name']}: {report['time']:.3f} с, максимальная резидентная память процесса "
+                     f"{report['max_rss'] / 2 ** 20:.1f} МБ")
+        add_stages(report['stages'], report['time'])
+        for function in report['functions'][:10]:
+            lines.append(f"    {function['cumulative_time']:>9.3f} с {function['calls']:>9} {function['function']}")
+        lines.append('')
+
+    total_time = sum(report['time'] for report in reports)
+    lines.append(f"Всего: {len(reports)} запусков, {total_time:.3f} с")
+    add_stages(get_totals(reports), total_time)
+    return '\n'.join(lines) + '\n'
+
+
+def write_report(reports, path):
+    """
+    Данная функция сохраняет результаты профилирования в директорию path: profile.json (все данные) и profile.txt
+    (текстовый отчет).
+    :param reports: список результатов профилирования с названиями запусков (ключ 'name').
+    :param path: директория.
+    """
+    path = pathlib.Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    with open(path / 'profile.json', 'w', encoding='utf-8') as file:
+        json.dump({'runs': reports, 'totals': get_totals(reports)}, file, ensure_ascii=False, indent=2)
+    with open(path / 'profile.txt', 'w', encoding='utf-8') as file:
+        file.write(format_report(reports))
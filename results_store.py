@@ -0,0 +1,128 @@
+import ast
+import hashlib
+import json
+import os
+import pathlib
+import tempfile
+import numpy as np
+
+# Директория хранилища результатов расчета (по умолчанию .cache/results в корне репозитория).
+STORE_DIR = os.environ.get('PLATE_BANDING_STORE',
+                           str(pathlib.Path(__file__).parent.resolve()) + '/.cache/results')
+
+
+def get_dependencies(source):
+    """
+    Данная функция находит модули репозитория, от которых зависит заданный: сам модуль и все модули, которые он
+    импортирует (прямо или через другие модули репозитория). Сторонние библиотеки не учитываются.
+    :param source: путь к файлу модуля относительно корня репозитория (например, 'compute.py').
+    :return: кортеж путей к файлам в алфавитном порядке.
+    """
+    root = pathlib.Path(__file__).parent.resolve()
+    found, pending = set(), [source]
+    while pending:
+        source = pending.pop()
+        if source in found:
+            continue
+        found.add(source)
+        for node in ast.walk(ast.parse((root / source).read_bytes())):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and not node.level and node.module:
+                names = [node.module]
+            else:
+                continue
+            pending.extend(name + '.py' for name in names if (root / (name + '.py')).is_file())
+    return tuple(sorted(found))
+
+
+# Модули, от которых зависят вычисляемые кривые (compute.py и все импортируемые им модули репозитория): их изменение
+# делает сохраненные результаты недействительными.
+COMPUTE_SOURCES = get_dependencies('compute.py')
+
+
+def get_source_hash(sources):
+    """
+    Данная функция вычисляет хэш исходного кода (версию кода) для заданных файлов.
+    :param sources: пути к файлам (относительно корня репозитория или абсолютные).
+    :return: шестнадцатеричная строка SHA-256.
+    """
+    digest = hashlib.sha256()
+    root = pathlib.Path(__file__).parent.resolve()
+    for source in sources:
+        digest.update((root / source).read_bytes())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class ResultsStore:
+    """
+    Хранилище результатов расчета: для каждого примера кривые и эффективные модули сохраняются в NPZ-файл, имя которого
+    равно хэшу данных примера и версии кода. Кроме того, хранилище помнит, из каких результатов были построены графики,
+    что позволяет не перестраивать неизменившиеся графики.
+    """
+
+    def __init__(self, path=STORE_DIR):
+        self.path = pathlib.Path(path)
+        self.code_version = get_source_hash(COMPUTE_SOURCES)
+
+    def get_key(self, a):
+        """
+        Данная функция вычисляет ключ результатов расчета по данным примера и версии кода.
+        :param a: данные для примера (подробнее см. файл materials.py).
+        :return: ключ результатов расчета для данного примера.
+        """
+        digest = hashlib.sha256(json.dumps(a, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+        digest.update(self.code_version.encode('utf-8'))
+        return digest.hexdigest()
+
+    def __contains__(self, key):
+        return (self.path / (key + '.npz')).exists()
+
+    def save(self, key, result):
+        """
+        Данная функция сохраняет результаты расчета примера.
+        :param key: ключ (см. get_key).
+        :param result: словарь с массивами (см. compute.compute_material).
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        # Запись через временный файл, чтобы параллельные процессы не прочитали файл частично.
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix='.npz')
+        with os.fdopen(fd, 'wb') as file:
+            np.savez(file, **result)
+        os.replace(tmp_path, self.path / (key + '.npz'))
+
+    def load(self, key):
+        """
+        Данная функция загружает результаты расчета примера.
+        :param key: ключ (см. get_key).
+        :return: словарь с массивами или None, если результаты для данного ключа не найдены.
+        """
+        try:
+            with np.load(self.path / (key + '.npz')) as data:
+                return {name: data[name] for name in data.files}
+        except FileNotFoundError:
+            return None
+
+    def is_rendered(self, plot_path, render_key):
+        """
+        Данная функция проверяет, нужно ли перестраивать график.
+        :param plot_path: путь к файлу графика.
+        :param render_key: ключ, описывающий данные и параметры построения графика.
+        :return: True, если график существует и был построен с тем же ключом.
+        """
+        stamp = self._get_stamp_path(plot_path)
+        return os.path.exists(plot_path) and stamp.exists() and stamp.read_text() == render_key
+
+    def mark_rendered(self, plot_path, render_key):
+        """
+        Данная функция запоминает ключ, с которым был построен график.
+        :param plot_path: путь к файлу графика.
+        :param render_key: ключ, описывающий данные и параметры построения графика.
+        """
+        stamp = self._get_stamp_path(plot_path)
+        stamp.parent.mkdir(parents=True, exist_ok=True)
+        stamp.write_text(render_key)
+
+    def _get_stamp_path(self, plot_path):
+        return self.path / 'rendered' / (hashlib.sha256(str(plot_path).encode('utf-8')).hexdigest() + '.txt')
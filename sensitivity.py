@@ -0,0 +1,179 @@
+import numpy as np
+import asymptotic
+import moduli
+import stiffness
+import theories
+from polynomials import get_piecewise_extremum, polyval
+
+# Свойства компонент композита, по которым вычисляются производные эффективных модулей (см. moduli.get_modules_batch).
+INPUTS = ('E_c', 'nu_c', 'concentration', 'E_m', 'nu_m')
+
+# Комплексный шаг для производных эффективных модулей (см. get_modules_jacobian).
+STEP = 1e-30
+
+# Параметры асимптотической теории: эффективные модули, задающие матрицу податливости, и толщина пластины.
+PARAMETERS = stiffness.COMPLIANCE_MODULES + ('h',)
+
+# Величины, производные которых возвращает get_output_gradients: максимальный прогиб, напряжения σ11 на верхней грани
+# (z = 1/2) в сечении кривых σ11 и напряжения σ13 на срединной линии (z = 0) в сечении x = 0.25.
+OUTPUTS = ('w_max', 's11_surface', 's13_mid')
+
+# Прогиб асимптотической теории w = p f(x) / D1111 + p D111111 h² g(x) / D1111² и множители в производных
+# прогиба, через которые выражаются напряжения (см. theories.get_polynomials; совпадение кривых с theories.get_curves
+# проверяет benchmarks/checks.py):
+# σ11 = h P1111(z) (α p / D1111 + β p D111111 h² / D1111²) + h³ P111111(z) γ p / D1111, σ13 = h² P13111(z) δ p / D1111.
+SHAPES = {'uniform': {'f': (lambda x: x ** 4 / 24 - x ** 3 / 12 + x / 24,),
+                      'g': (lambda x: (x - x ** 2) / 2,),
+                      'alpha': -1 / 8, 'beta': -1, 'gamma': 1, 'delta': -1 / 4},
+          'focused': {'f': (lambda x: (3 * x - 4 * x ** 3) / 48,
+                            lambda x: (-1 + 9 * x - 12 * x ** 2 + 4 * x ** 3) / 48),
+                      'g': (lambda x: x / 2, lambda x: (1 - x) / 2),
+                      'alpha': -1 / 8, 'beta': 0, 'gamma': 0, 'delta': -1 / 2}}
+
+
+def get_modules_jacobian(E_c, nu_c, concentration, E_m, nu_m, type_code):
+    """
+    Данная функция вычисляет производные эффективных модулей по свойствам компонент сразу для массива композитов.
+    Формулы moduli.py содержат только арифметические операции, поэтому производные вычисляются методом комплексного
+    шага: f'(v) = Im f(v + i·STEP) / STEP без вычитания близких чисел, т. е. с машинной точностью.
+    :param E_c, nu_c, concentration, E_m, nu_m, type_code: см. moduli.get_modules_batch.
+    :return: массив формы (..., len(moduli.MODULES), len(INPUTS)); для неизвестной модели - NaN.
+    """
+    values = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (E_c, nu_c, concentration, E_m, nu_m)))
+    type_code = np.broadcast_to(np.asarray(type_code), values[0].shape)
+    jacobian = np.full(values[0].shape + (len(moduli.MODULES), len(INPUTS)), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for type, get in (('fiber', moduli.get_fiber_modules), ('polydisperse', moduli.get_polydisperse_modules)):
+            mask = type_code == moduli.TYPE_CODES[type]
+            if not mask.any():
+                continue
+            selected = [v[mask] for v in values]
+            for k in range(len(INPUTS)):
+                arguments = list(selected)
+                arguments[k] = arguments[k] + 1j * STEP
+                for j, module in enumerate(get(*arguments)):
+                    jacobian[..., j, k][mask] = np.imag(module) / STEP
+    return jacobian
+
+
+def get_curve_jacobians(modules, h, type_of_loading, x=theories.X, z=theories.Z):
+    """
+    Данная функция вычисляет прогиб w(x) и напряжения σ11(z), σ13(z) асимптотической теории (как в
+    theories.get_curves) вместе с их точными производными по параметрам PARAMETERS. Производные получаются по
+    цепочке: эффективные модули -> матрица податливости -> C1111, C1133, C3333, C1313 (stiffness.py) -> D1111,
+    D111111 и многочлены P (символьные производные, asymptotic.py) -> кривые.
+    :param modules: эффективные модули (структурированный массив или словарь массивов формы (...)).
+    :param h: толщина пластины (массив, совместимый по форме с modules).
+    :param type_of_loading: вид нагрузки: 'uniform' или 'focused'.
+    :param x: точки, в которых вычисляется прогиб.
+    :param z: точки, в которых вычисляются напряжения.
+    :return: словарь: 'w' формы (..., len(x)), 's11' и 's13' формы (..., len(z)) и производные 'dw', 'ds11', 'ds13'
+             той же формы с дополнительной последней осью len(PARAMETERS).
+    """
+    if type_of_loading not in SHAPES:
+        raise ValueError(f"Вид нагрузки не найден: {type_of_loading}")
+    shape = SHAPES[type_of_loading]
+    x, z = np.asarray(x, dtype=float), np.asarray(z, dtype=float)
+    p = theories.p
+
+    result = stiffness.get_stiffness_batch(modules)
+    C = stiffness.get_plate_stiffness(result['stiffness'])
+    h = np.broadcast_to(np.asarray(h, dtype=float), C[0].shape)
+    dC = stiffness.get_plate_stiffness_jacobian(modules, result['stiffness'])
+    coefficients = asymptotic.get_coefficients(*C)
+    jacobians = asymptotic.get_coefficient_jacobians(*C)
+    D, D6 = coefficients['D1111'][..., None], coefficients['D111111'][..., None]
+    dD, dD6 = jacobians['D1111'][..., None, :], jacobians['D111111'][..., None, :]
+    hh = h[..., None]
+
+    def get_polynomial(name):
+        # Значения многочлена P в точках z и их производные по C (..., len(z), 4).
+        return polyval(coefficients[name], z), np.moveaxis(polyval(np.moveaxis(jacobians[name], -1, -2), z), -2, -1)
+
+    # Производные по C переводятся в производные по эффективным модулям, к ним добавляется производная по h.
+    def get_derivatives(by_C, by_h):
+        return np.concatenate([np.einsum('...nk,...kj->...nj', by_C, dC), by_h[..., None]], axis=-1)
+
+    # Прогиб.
+    if len(shape['f']) == 1:
+        f, g = shape['f'][0](x), shape['g'][0](x)
+    else:
+        left = x < 1 / 2
+        f = np.where(left, shape['f'][0](x), shape['f'][1](x))
+        g = np.where(left, shape['g'][0](x), shape['g'][1](x))
+    w = p * f / D + p * D6 * hh ** 2 * g / D ** 2
+    w_D = -p * f / D ** 2 - 2 * p * D6 * hh ** 2 * g / D ** 3
+    w_D6 = p * hh ** 2 * g / D ** 2
+    dw = get_derivatives(w_D[..., None] * dD + w_D6[..., None] * dD6, 2 * p * D6 * hh * g / D ** 2)
+
+    # Напряжения σ11.
+    alpha, beta, gamma, delta = (shape[key] for key in ('alpha', 'beta', 'gamma', 'delta'))
+    P1, dP1 = get_polynomial('P1111')
+    P6, dP6 = get_polynomial('P111111')
+    m = alpha * p / D + beta * p * D6 * hh ** 2 / D ** 2
+    n = gamma * p / D
+    s11 = hh * P1 * m + hh ** 3 * P6 * n
+    s11_D = hh * P1 * (-alpha * p / D ** 2 - 2 * beta * p * D6 * hh ** 2 / D ** 3) - hh ** 3 * P6 * gamma * p / D ** 2
+    s11_D6 = hh * P1 * beta * p * hh ** 2 / D ** 2
+    s11_C = (hh * m)[..., None] * dP1 + (hh ** 3 * n)[..., None] * dP6 + s11_D[..., None] * dD + s11_D6[..., None] * dD6
+    s11_h = P1 * m + hh * P1 * 2 * beta * p * D6 * hh / D ** 2 + 3 * hh ** 2 * P6 * n
+    ds11 = get_derivatives(s11_C, s11_h)
+
+    # Напряжения σ13.
+    P13, dP13 = get_polynomial('P13111')
+    s13 = hh ** 2 * P13 * delta * p / D
+    s13_C = (hh ** 2 * delta * p / D)[..., None] * dP13 - (hh ** 2 * P13 * delta * p / D ** 2)[..., None] * dD
+    ds13 = get_derivatives(s13_C, 2 * hh * P13 * delta * p / D)
+
+    return {'w': w, 's11': s11, 's13': s13, 'dw': dw, 'ds11': ds11, 'ds13': ds13}
+
+
+def get_input_curve_jacobians(table, h, type_of_loading, x=theories.X, z=theories.Z):
+    """
+    Данная функция вычисляет кривые асимптотической теории (см. get_curve_jacobians) и их производные по свойствам
+    компонент композита INPUTS и толщине пластины.
+    :param table: таблица материалов (см. moduli.get_material_table): массивы E_c, nu_c, concentration, E_m, nu_m
+                  и type.
+    :param h: толщина пластины (массив, совместимый по форме с таблицей).
+    :param type_of_loading: вид нагрузки: 'uniform' или 'focused'.
+    :param x: точки, в которых вычисляется прогиб.
+    :param z: точки, в которых вычисляются напряжения.
+    :return: словарь в формате get_curve_jacobians, производные - по INPUTS + ('h',); 'flags' - признаки
+             некорректных входных данных (см. moduli.get_modules_batch).
+    """
+    arguments = [table[key] for key in INPUTS] + [table['type']]
+    modules = moduli.get_modules_batch(*arguments)
+    result = get_curve_jacobians(modules, h, type_of_loading, x, z)
+    # Производные эффективных модулей (без n_21, который в матрицу податливости не входит) по свойствам компонент.
+    rows = [moduli.MODULES.index(name) for name in stiffness.COMPLIANCE_MODULES]
+    dm = get_modules_jacobian(*arguments)[..., rows, :]
+    for key in ('dw', 'ds11', 'ds13'):
+        value = result[key]
+        result[key] = np.concatenate([np.einsum('...nk,...kj->...nj', value[..., :-1], dm), value[..., -1:]],
+                                     axis=-1)
+    result['flags'] = modules['flags']
+    return result
+
+
+def get_output_gradients(table, h, type_of_loading):
+    """
+    Данная функция вычисляет величины OUTPUTS асимптотической теории и их точные градиенты по свойствам компонент
+    композита и толщине пластины сразу для массива материалов. Точка максимума прогиба находится точно (через корни
+    производной, как в theories.get_extrema), а производная максимума равна производной прогиба в этой точке
+    (теорема об огибающей: смещение точки максимума вклада в первую производную не дает).
+    :param table: таблица материалов (см. moduli.get_material_table).
+    :param h: толщина пластины (массив, совместимый по форме с таблицей).
+    :param type_of_loading: вид нагрузки: 'uniform' или 'focused'.
+    :return: словарь: значения OUTPUTS (массивы формы (...)), их градиенты 'd' + имя формы (..., len(INPUTS) + 1)
+             (по INPUTS и h), 'x_max' - точка максимального прогиба и 'flags' (см. moduli.get_modules_batch).
+    """
+    modules = moduli.get_modules_batch(*(table[key] for key in INPUTS), table['type'])
+    h = np.broadcast_to(np.asarray(h, dtype=float), modules.shape)
+    # Максимум ищется только для асимптотической теории (а не для всех теорий, как в theories.get_extrema).
+    polynomials = theories.get_polynomials(modules, h, type_of_loading)
+    index = theories.THEORIES.index('asymptotic')
+    x_max = get_piecewise_extremum(polynomials['w'][..., index:index + 1, :], polynomials['breaks'])[0][..., 0]
+    result = get_input_curve_jacobians(table, h, type_of_loading, x_max[..., None], np.array([1 / 2, 0]))
+    return {'w_max': result['w'][..., 0], 's11_surface': result['s11'][..., 0], 's13_mid': result['s13'][..., 1],
+            'dw_max': result['dw'][..., 0, :], 'ds11_surface': result['ds11'][..., 0, :],
+            'ds13_mid': result['ds13'][..., 1, :], 'x_max': x_max, 'flags': result['flags']}
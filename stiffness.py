@@ -0,0 +1,121 @@
+import numpy as np
+
+# Эффективные модули, задающие ортотропную матрицу податливости (см. moduli.MODULES; n_21 вычисляется из симметрии).
+COMPLIANCE_MODULES = ('E_1', 'E_2', 'E_3', 'n_12', 'n_13', 'n_23', 'G_12', 'G_13', 'G_23')
+
+# Флаги некорректных матриц (побитовые).
+FLAG_NOT_FINITE = 1
+FLAG_NOT_POSITIVE_DEFINITE = 2
+
+
+def get_compliance(E_1, E_2, E_3, n_12, n_13, n_23, G_12, G_13, G_23):
+    """
+    Данная функция строит матрицы податливости ортотропного материала 6 × 6 в обозначениях Фойгта (порядок
+    компонент 11, 22, 33, 23, 13, 12) сразу для массива материалов.
+    :param E_1, E_2, E_3, n_12, n_13, n_23, G_12, G_13, G_23: эффективные модули (скаляры или массивы NumPy).
+    :return: массив формы (..., 6, 6).
+    """
+    E_1, E_2, E_3, n_12, n_13, n_23, G_12, G_13, G_23 = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (E_1, E_2, E_3, n_12, n_13, n_23, G_12, G_13, G_23)))
+    compliance = np.zeros(E_1.shape + (6, 6))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        compliance[..., 0, 0] = 1 / E_1
+        compliance[..., 1, 1] = 1 / E_2
+        compliance[..., 2, 2] = 1 / E_3
+        compliance[..., 0, 1] = compliance[..., 1, 0] = -n_12 / E_1
+        compliance[..., 0, 2] = compliance[..., 2, 0] = -n_13 / E_1
+        compliance[..., 1, 2] = compliance[..., 2, 1] = -n_23 / E_2
+        compliance[..., 3, 3] = 1 / G_23
+        compliance[..., 4, 4] = 1 / G_13
+        compliance[..., 5, 5] = 1 / G_12
+    return compliance
+
+
+def get_stiffness_batch(modules):
+    """
+    Данная функция вычисляет матрицы упругих модулей (жесткости) как обратные к матрицам податливости сразу для
+    массива материалов. Для каждой матрицы проверяется положительная определенность (по собственным значениям)
+    и вычисляется число обусловленности.
+    :param modules: эффективные модули: структурированный массив (см. moduli.get_modules_batch) или словарь
+                    с массивами E_1, ..., G_23.
+    :return: словарь с массивами: 'compliance' и 'stiffness' формы (..., 6, 6), 'eigenvalues' - собственные значения
+             матрицы податливости (..., 6), 'condition' - число обусловленности (...), 'flags' - побитовые признаки
+             некорректных матриц (FLAG_*). Для строк с ненулевыми флагами матрица жесткости и число обусловленности
+             равны NaN.
+    """
+    compliance = get_compliance(*(modules[name] for name in COMPLIANCE_MODULES))
+    shape = compliance.shape[:-2]
+    flags = np.zeros(shape, dtype=np.uint8)
+    finite = np.isfinite(compliance).all(axis=(-2, -1))
+    flags[~finite] |= FLAG_NOT_FINITE
+
+    # Блок нормальных компонент и сдвиговые податливости; строки с бесконечными или NaN значениями заменяются
+    # единичными, чтобы обрабатывать весь массив без выборки строк.
+    normal = np.where(finite[..., None, None], compliance[..., :3, :3], np.eye(3))
+    shear = np.where(finite[..., None], np.diagonal(compliance[..., 3:, 3:], axis1=-2, axis2=-1), 1.0)
+
+    # Собственные значения: блока нормальных компонент и диагональные элементы сдвигового блока.
+    eigenvalues = np.concatenate([np.linalg.eigvalsh(normal), shear], axis=-1)
+    flags[finite & ~(eigenvalues.min(axis=-1) > 0)] |= FLAG_NOT_POSITIVE_DEFINITE
+    valid = flags == 0
+    eigenvalues[~finite] = np.nan
+
+    # Матрица податливости ортотропного материала блочно-диагональна, поэтому обращается блок 3 × 3, а сдвиговые
+    # модули - поэлементно.
+    stiffness = np.zeros(compliance.shape)
+    normal[~valid] = np.eye(3)
+    stiffness[..., :3, :3] = np.linalg.inv(normal)
+    with np.errstate(divide='ignore'):
+        stiffness[..., [3, 4, 5], [3, 4, 5]] = 1 / shear
+    stiffness[~valid] = np.nan
+    # Для симметричной положительно определенной матрицы число обусловленности (в норме 2) равно отношению
+    # наибольшего и наименьшего собственных значений; у матрицы жесткости оно то же.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        condition = np.where(valid, eigenvalues.max(axis=-1) / eigenvalues.min(axis=-1), np.nan)
+    return {'compliance': compliance, 'stiffness': stiffness, 'eigenvalues': eigenvalues, 'condition': condition,
+            'flags': flags}
+
+
+def get_plate_stiffness(stiffness):
+    """
+    Данная функция выбирает из матриц жесткости упругие модули пластины, необходимые для асимптотической теории.
+    :param stiffness: матрицы жесткости формы (..., 6, 6) (см. get_stiffness_batch).
+    :return: C1111, C1133, C3333, C1313: массивы формы (...).
+    """
+    return stiffness[..., 0, 0], stiffness[..., 0, 2], stiffness[..., 2, 2], stiffness[..., 4, 4]
+
+
+def get_plate_stiffness_jacobian(modules, stiffness):
+    """
+    Данная функция вычисляет производные модулей пластины C1111, C1133, C3333, C1313 по эффективным модулям
+    COMPLIANCE_MODULES: производная обратной матрицы dC = -C dS C, где dS - производная матрицы податливости.
+    :param modules: эффективные модули (см. get_stiffness_batch).
+    :param stiffness: матрицы жесткости формы (..., 6, 6) (см. get_stiffness_batch).
+    :return: массив формы (..., 4, len(COMPLIANCE_MODULES)).
+    """
+    E_1, E_2, E_3, n_12, n_13, n_23, G_12, G_13, G_23 = np.broadcast_arrays(
+        *(np.asarray(modules[name], dtype=float) for name in COMPLIANCE_MODULES))
+    shape = E_1.shape
+
+    # Производные блока нормальных компонент матрицы податливости (см. get_compliance) по E_1, E_2, E_3, n_12,
+    # n_13, n_23; от модулей сдвига этот блок не зависит.
+    dS = np.zeros(shape + (len(COMPLIANCE_MODULES), 3, 3))
+    dS[..., 0, 0, 0] = -1 / E_1 ** 2
+    dS[..., 0, 0, 1] = dS[..., 0, 1, 0] = n_12 / E_1 ** 2
+    dS[..., 0, 0, 2] = dS[..., 0, 2, 0] = n_13 / E_1 ** 2
+    dS[..., 1, 1, 1] = -1 / E_2 ** 2
+    dS[..., 1, 1, 2] = dS[..., 1, 2, 1] = n_23 / E_2 ** 2
+    dS[..., 2, 2, 2] = -1 / E_3 ** 2
+    dS[..., 3, 0, 1] = dS[..., 3, 1, 0] = -1 / E_1
+    dS[..., 4, 0, 2] = dS[..., 4, 2, 0] = -1 / E_1
+    dS[..., 5, 1, 2] = dS[..., 5, 2, 1] = -1 / E_2
+    C = stiffness[..., None, :3, :3]
+    dC = -C @ dS @ C
+
+    jacobian = np.zeros(shape + (4, len(COMPLIANCE_MODULES)))
+    jacobian[..., 0, :] = dC[..., 0, 0]
+    jacobian[..., 1, :] = dC[..., 0, 2]
+    jacobian[..., 2, :] = dC[..., 2, 2]
+    # C1313 = G_13.
+    jacobian[..., 3, COMPLIANCE_MODULES.index('G_13')] = 1
+    return jacobian
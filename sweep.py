@@ -0,0 +1,89 @@
+import numpy as np
+import moduli
+import theories
+
+# Наибольший объем результатов sweep (в байтах), который хранится в оперативной памяти; результаты для больших сеток
+# записываются на диск (параметр path) или перебираются по частям (iter_sweep).
+MAX_MEMORY = 2 ** 30
+
+
+def iter_sweep(a, E_c, concentration, h, type_of_loading=theories.LOADINGS, x=theories.X, z=theories.Z,
+               chunk_size=4096):
+    """
+    Данная функция перебирает сетку параметров по частям (чтобы объем используемой памяти оставался ограниченным) и
+    для каждой части вычисляет прогибы и напряжения для всех теорий.
+    :param a: данные для примера (подробнее см. файл materials.py), из которых берутся тип композита, nu_c, E_m и nu_m.
+    :param E_c: значения модуля Юнга включений.
+    :param concentration: значения концентрации включений.
+    :param h: значения толщины пластины.
+    :param type_of_loading: виды нагрузки ('uniform' и/или 'focused').
+    :param x: точки, в которых вычисляется прогиб.
+    :param z: точки, в которых вычисляются напряжения.
+    :param chunk_size: количество комбинаций (E_c, concentration, h), обрабатываемых за один раз.
+    :return: генератор кортежей (start, stop, k, curves): комбинации с номерами start:stop (в порядке C, т.е. по
+             сетке E_c × concentration × h), k - номер вида нагрузки, curves - результат theories.get_curves.
+    """
+    E_c, concentration, h = (np.atleast_1d(np.asarray(v, dtype=float)) for v in (E_c, concentration, h))
+    type_of_loading = [type_of_loading] if isinstance(type_of_loading, str) else list(type_of_loading)
+    shape = (E_c.size, concentration.size, h.size)
+    size = int(np.prod(shape))
+    for start in range(0, size, chunk_size):
+        stop = min(start + chunk_size, size)
+        i, j, k = np.unravel_index(np.arange(start, stop), shape)
+        modules = moduli.get_modules_batch(E_c[i], a['nu_c'], concentration[j], a['E_m'], a['nu_m'],
+                                           moduli.TYPE_CODES.get(a['type'], -1))
+        for n, loading in enumerate(type_of_loading):
+            yield start, stop, n, theories.get_curves(modules, h[k], loading, x, z)
+
+
+def sweep(a, E_c, concentration, h, type_of_loading=theories.LOADINGS, x=theories.X, z=theories.Z,
+          chunk_size=4096, path=None):
+    """
+    Данная функция вычисляет прогибы w(x) и напряжения σ11(z), σ13(z) для всех теорий на сетке параметров
+    E_c × concentration × h × type_of_loading. Вычисления ведутся по частям (см. iter_sweep).
+    :param a: данные для примера (подробнее см. файл materials.py), из которых берутся тип композита, nu_c, E_m и nu_m.
+    :param E_c: значения модуля Юнга включений.
+    :param concentration: значения концентрации включений.
+    :param h: значения толщины пластины.
+    :param type_of_loading: виды нагрузки ('uniform' и/или 'focused').
+    :param x: точки, в которых вычисляется прогиб.
+    :param z: точки, в которых вычисляются напряжения.
+    :param chunk_size: количество комбинаций (E_c, concentration, h), обрабатываемых за один раз.
+    :param path: директория, в которой результаты сохраняются в виде .npy файлов, отображаемых в память (если не
+                 задана, результаты хранятся в оперативной памяти, если их объем не превышает MAX_MEMORY).
+    :return: словарь с массивами 'w' формы (len(E_c), len(concentration), len(h), len(type_of_loading), 4, len(x)),
+             's11' и 's13' формы (..., 4, len(z)) (теории в порядке theories.THEORIES), 'flags' формы
+             (len(E_c), len(concentration)) (см. moduli.get_modules_batch), а также осями сетки.
+    """
+    E_c, concentration, h = (np.atleast_1d(np.asarray(v, dtype=float)) for v in (E_c, concentration, h))
+    type_of_loading = [type_of_loading] if isinstance(type_of_loading, str) else list(type_of_loading)
+    x, z = np.asarray(x, dtype=float), np.asarray(z, dtype=float)
+    grid = (E_c.size, concentration.size, h.size, len(type_of_loading), len(theories.THEORIES))
+    memory = int(np.prod(grid)) * (x.size + 2 * z.size) * np.dtype(float).itemsize
+    if path is None and memory > MAX_MEMORY:
+        raise ValueError(f"Результаты сетки занимают {memory / 2 ** 30:.1f} ГБ (больше MAX_MEMORY): задайте директорию "
+                         f"path для записи на диск или перебирайте сетку по частям с помощью iter_sweep")
+
+    result = {}
+    for key, n in (('w', x.size), ('s11', z.size), ('s13', z.size)):
+        if path is None:
+            result[key] = np.empty(grid + (n,))
+        else:
+            result[key] = np.lib.format.open_memmap(f"{path}/{key}.npy", mode='w+', shape=grid + (n,))
+
+    # Массивы в форме (комбинация, нагрузка, теория, точка), в которые записываются результаты очередной части.
+    flat = {key: value.reshape((-1,) + grid[3:] + value.shape[-1:]) for key, value in result.items()}
+    for start, stop, n, curves in iter_sweep(a, E_c, concentration, h, type_of_loading, x, z, chunk_size):
+        for key, value in curves.items():
+            flat[key][start:stop, n] = value
+
+    if path is not None:
+        for value in result.values():
+            value.flush()
+
+    table = np.meshgrid(E_c, concentration, indexing='ij')
+    result['flags'] = moduli.get_modules_batch(table[0], a['nu_c'], table[1], a['E_m'], a['nu_m'],
+                                               moduli.TYPE_CODES.get(a['type'], -1))['flags']
+    result.update({'E_c': E_c, 'concentration': concentration, 'h': h, 'type_of_loading': type_of_loading,
+                   'theories': theories.THEORIES, 'x': x, 'z': z})
+    return result
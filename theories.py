@@ -0,0 +1,163 @@
+import numpy as np
+import asymptotic
+import stiffness
+from polynomials import get_extremum, get_piecewise_extremum, piecewise_polyval, polyval
+
+# Теории изгиба пластины (в порядке построения графиков в plot.py).
+THEORIES = ('kirchhoff_love', 'reissner', 'third_order', 'asymptotic')
+# Виды нагрузки.
+LOADINGS = ('uniform', 'focused')
+
+# Горизонтальная координата x (она же x_1) и вертикальная "быстрая" (приведенная) координата z.
+X = np.arange(0, 1, 0.001)
+Z = np.arange(-1 / 2, 1 / 2, 0.001)
+
+# Модуль нагрузки.
+p = 1
+
+# Точки разбиения оси x на участки, на каждом из которых прогиб - многочлен (для сосредоточенной нагрузки прогиб
+# задается разными многочленами слева и справа от точки приложения нагрузки x = 0.5).
+BREAKS = {'uniform': np.array([0, 1]), 'focused': np.array([0, 1 / 2, 1])}
+
+
+def get_curves(modules, h, type_of_loading, x=X, z=Z, coefficients=None):
+    """
+    Данная функция вычисляет прогибы и напряжения для всех теорий сразу для массива материалов: многочлены
+    (см. get_polynomials) вычисляются в заданных точках по схеме Горнера. Прогиб w(x), напряжения σ11(z) в сечении
+    x = 0.5 (x = 0.25 для сосредоточенной нагрузки) и σ13(z) в сечении x = 0.25 совпадают с графиками plot.py.
+    :param modules: структурированный массив эффективных модулей (см. moduli.get_modules_batch) формы (...).
+    :param h: толщина пластины (массив, совместимый по форме с modules).
+    :param type_of_loading: вид нагрузки: 'uniform' или 'focused'.
+    :param x: точки, в которых вычисляется прогиб.
+    :param z: точки, в которых вычисляются напряжения.
+    :param coefficients: готовые величины асимптотической теории (см. get_polynomials).
+    :return: словарь с массивами 'w' формы (..., 4, len(x)), 's11' и 's13' формы (..., 4, len(z)); теории
+             перечислены в порядке THEORIES.
+    """
+    polynomials = get_polynomials(modules, h, type_of_loading, coefficients)
+    return {'w': piecewise_polyval(polynomials['w'], polynomials['breaks'], x),
+            's11': polyval(polynomials['s11'], z),
+            's13': polyval(polynomials['s13'], z)}
+
+
+def get_extrema(modules, h, type_of_loading):
+    """
+    Данная функция находит точные (через корни производных многочленов) максимумы модуля прогиба w(x) на [0, 1] и
+    напряжений σ11(z), σ13(z) на [-1/2, 1/2] для всех теорий.
+    :param modules: структурированный массив эффективных модулей (см. moduli.get_modules_batch) формы (...).
+    :param h: толщина пластины (массив, совместимый по форме с modules).
+    :param type_of_loading: вид нагрузки: 'uniform' или 'focused'.
+    :return: словарь: для 'w', 's11', 's13' - пары массивов формы (..., 4): точки максимума и значения (со знаком).
+    """
+    polynomials = get_polynomials(modules, h, type_of_loading)
+    return {'w': get_piecewise_extremum(polynomials['w'], polynomials['breaks']),
+            's11': get_extremum(polynomials['s11'], -1 / 2, 1 / 2),
+            's13': get_extremum(polynomials['s13'], -1 / 2, 1 / 2)}
+
+
+def get_polynomials(modules, h, type_of_loading, coefficients=None):
+    """
+    Данная функция представляет прогибы и напряжения всех теорий (в порядке THEORIES) в виде коэффициентов многочленов
+    по возрастанию степеней: прогиб w - многочлен по x на каждом участке BREAKS[type_of_loading], напряжения σ11
+    (в сечении x = 0.5, для сосредоточенной нагрузки x = 0.25) и σ13 (в сечении x = 0.25) - многочлены по z. Для σ13
+    первой (вместо теории Кирхгофа-Лява) идет формула Журавского. Формулы совпадают с используемыми в plot.py.
+    :param modules: структурированный массив эффективных модулей (см. moduli.get_modules_batch) формы (...).
+    :param h: толщина пластины (массив, совместимый по форме с modules).
+    :param type_of_loading: вид нагрузки: 'uniform' или 'focused'.
+    :param coefficients: величины асимптотической теории для modules (см. asymptotic.get_coefficients), если они уже
+                         вычислены (например, compute.get_material); по умолчанию вычисляются по modules.
+    :return: словарь: 'breaks' - точки разбиения оси x, 'w' - массив формы (..., участок, 4, 5), 's11' - массив
+             формы (..., 4, 4), 's13' - массив формы (..., 4, 3).
+    """
+    E_1, n_12, n_21, G_13 = (np.asarray(modules[name]) for name in ('E_1', 'n_12', 'n_21', 'G_13'))
+    h = np.asarray(h, dtype=float)
+
+    # Коэффициенты асимптотической теории.
+    # Упругие модули - обращение матриц податливости (для некорректных материалов NaN, см. stiffness.py).
+    if coefficients is None:
+        C = stiffness.get_stiffness_batch(modules)['stiffness']
+        coefficients = asymptotic.get_coefficients(*stiffness.get_plate_stiffness(C))
+    D1111, D111111 = coefficients['D1111'], coefficients['D111111']
+    P1111, P13111, P111111 = (coefficients[name] for name in ('P1111', 'P13111', 'P111111'))
+
+    # Податливость при изгибе (1 - n_12 * n_21) / E_1.
+    a = (1 - n_12 * n_21) / E_1
+    # Слагаемые прогибов, обусловленные сдвигом (асимптотическая теория и теория Рейсснера-Миндлина).
+    shear = p * D111111 * h ** 2 / (2 * D1111 ** 2)
+    shear_RM = 3 * p * h ** 2 / (5 * G_13)
+    # Коэффициент формулы Журавского (множитель (2 * (z / 20) / h) ** 2 сохранен как в plot.py).
+    zhuravsky = (2 / 20 / h) ** 2
+
+    if type_of_loading == 'uniform':
+        # Прогиб в рамках асимптотической теории: p / D1111 * (x^4 / 24 - x^3 / 12 + x / 24) + shear * (x - x^2).
+        w = _stack(0, p / (24 * D1111) + shear, -shear, -p / (12 * D1111), p / (24 * D1111))
+        w_xx = p / D1111 * (-1 / 8) - p * D111111 * h ** 2 / D1111 ** 2
+        w_xxx = p / D1111 * (1 / 4 - 1 / 2)
+        w_xxxx = p / D1111
+        s11 = h[..., None] * _pad(P1111, 4) * w_xx[..., None] + h[..., None] ** 3 * _pad(P111111, 4) * w_xxxx[..., None]
+        s13 = h[..., None] ** 2 * _pad(P13111, 3) * w_xxx[..., None]
+
+        # Прогибы для теорий Кирхгофа-Лява, Рейсснера-Миндлина и Редди: -p * a / 2 * (x^4 - 2 x^3 + x) и
+        # поправка на сдвиг 3 * p * h^2 * (x^2 - x) / (5 * G_13).
+        w_KL = _stack(0, -p * a / 2, 0, p * a, -p * a / 2)
+        w_RM = w_KL + _stack(0, -shear_RM, shear_RM, 0, 0)
+        w_R = w_RM
+        w_KL_xx = -p * a / 2 * (12 * (1 / 2) ** 2 - 12 * (1 / 2))
+        w_RM_xx = w_KL_xx + 6 * p * h ** 2 / (5 * G_13)
+        w_R_xx = w_RM_xx
+
+        # Компоненты напряжений для различных теорий.
+        s11_KL = _stack(0, -h * w_KL_xx / a, 0, 0)
+        s11_RM = _stack(0, h * (6 * h ** 2 * p / (5 * G_13) - w_RM_xx) / a, 0, 0)
+        s11_R = _stack(0, h * (3 * p * h ** 2 / (2 * G_13) - w_R_xx) / a, 0, -2 * h ** 3 / (G_13 * a))
+        s13_RM = 3 * p * h ** 2 * (1 / 4 - 1 / 2) / 2
+        s13_RM = _stack(s13_RM, 0, -s13_RM * zhuravsky)
+        s13_R = s13_RM
+        # Участки прогиба (один участок).
+        w, w_KL, w_RM, w_R = (f[..., None, :] for f in (w, w_KL, w_RM, w_R))
+    elif type_of_loading == 'focused':
+        # Прогиб в рамках асимптотической теории: левая (x < 0.5) и правая половины пластины.
+        w = np.stack([_stack(0, 3 * p / (48 * D1111) + shear, 0, -4 * p / (48 * D1111), 0),
+                      _stack(-p / (48 * D1111) + shear, 9 * p / (48 * D1111) - shear, -12 * p / (48 * D1111),
+                             4 * p / (48 * D1111), 0)], axis=-2)
+        w_xx = p / (48 * D1111) * (-24 * (1 / 4))
+        w_xxx = p / (48 * D1111) * (-24)
+        s11 = h[..., None] * _pad(P1111, 4) * w_xx[..., None]
+        s13 = h[..., None] ** 2 * _pad(P13111, 3) * w_xxx[..., None]
+
+        # Прогибы для теорий Кирхгофа-Лява и Рейсснера-Миндлина (теория Редди дает тот же прогиб).
+        w_KL = np.stack([_stack(0, -3 * p * a / 4, 0, p * a, 0),
+                         _stack(p * a / 4, -9 * p * a / 4, 3 * p * a, -p * a, 0)], axis=-2)
+        w_RM = w_KL - np.stack([_stack(0, shear_RM, 0, 0, 0), _stack(shear_RM, -shear_RM, 0, 0, 0)], axis=-2)
+        w_R = w_RM
+        w_KL_xx = -p * a / 4 * (-24 * (1 / 4))
+
+        # Компоненты напряжений для различных теорий.
+        s11_KL = _stack(0, -h * w_KL_xx / a, 0, 0)
+        s11_RM = _stack(0, 12 * h * (-(1 / 4) * h ** 3 / 2) / h ** 3, 0, 0)
+        s11_R = s11_RM
+        s13_RM = -3 * p * h ** 2 / 4
+        s13_RM = _stack(s13_RM, 0, -s13_RM * zhuravsky)
+        s13_R = s13_RM
+    else:
+        raise ValueError(f"Вид нагрузки не найден: {type_of_loading}")
+
+    return {'breaks': BREAKS[type_of_loading],
+            'w': _stack_theories([w_KL, w_RM, w_R, w]),
+            's11': _stack_theories([s11_KL, s11_RM, s11_R, s11]),
+            's13': _stack_theories([s13_RM, s13_RM, s13_R, s13])}
+
+
+def _stack(*coefficients):
+    # Коэффициенты (числа или массивы формы (...)) в массив формы (..., количество коэффициентов).
+    return np.stack(np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in coefficients)), axis=-1)
+
+
+def _pad(c, n):
+    # Дополнение коэффициентов нулями до n.
+    return np.concatenate([c, np.zeros(c.shape[:-1] + (n - c.shape[-1],))], axis=-1)
+
+
+def _stack_theories(polynomials):
+    # Многочлены теорий (в порядке THEORIES) в один массив: ось теорий - предпоследняя.
+    return np.stack(np.broadcast_arrays(*polynomials), axis=-2)
@@ -0,0 +1,238 @@
+import concurrent.futures
+import multiprocessing
+import os
+import numpy as np
+import moduli
+import theories
+from polynomials import piecewise_polyval, polyval
+
+# Допуски на свойства компонент по умолчанию: распределение ('normal' - среднеквадратичное отклонение, 'uniform' -
+# половина ширины интервала) и его параметр относительно номинального значения из materials.py.
+TOLERANCES = {'E_c': ('normal', 0.05), 'nu_c': ('uniform', 0.02), 'concentration': ('normal', 0.05),
+              'E_m': ('normal', 0.1), 'nu_m': ('uniform', 0.001)}
+# Распределения, которыми задаются допуски.
+DISTRIBUTIONS = ('normal', 'uniform')
+
+# Процентили, которые вычисляются для каждой точки кривых (крайние задают огибающую на графиках).
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Точки, в которых вычисляются процентили прогиба w(x) и напряжений σ11(z), σ13(z).
+X = np.linspace(0, 1, 41)
+Z = np.linspace(-1 / 2, 1 / 2, 41)
+
+# Количество выборок, обрабатываемых за один раз, и количество интервалов гистограмм, по которым считаются процентили.
+CHUNK_SIZE = 65536
+BINS = 4096
+# Интервал гистограммы в каждой точке задается по первой части выборки: между ее процентилями min(percentiles) / 2 и
+# (100 + max(percentiles)) / 2 с запасом MARGIN (в долях этого интервала с каждой стороны). Значения за его пределами
+# попадают в крайние интервалы: это не влияет на процентили внутри, а ширина интервалов определяется основной массой
+# значений, а не редкими выбросами (например, при малых E_m).
+MARGIN = 0.5
+
+
+def sample(a, size, tolerances=TOLERANCES, rng=None):
+    """
+    Данная функция строит выборку свойств компонент композита вокруг номинальных значений примера.
+    :param a: данные для примера (подробнее см. файл materials.py).
+    :param size: объем выборки.
+    :param tolerances: допуски (см. TOLERANCES); свойства без допуска равны номинальным.
+    :param rng: генератор случайных чисел NumPy.
+    :return: таблица материалов (см. moduli.get_material_table) и толщины h: словарь массивов формы (size,).
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    table = {}
+    for key in ('E_c', 'nu_c', 'concentration', 'E_m', 'nu_m', 'h'):
+        if key not in tolerances:
+            table[key] = np.full(size, float(a[key]))
+            continue
+        distribution, value = tolerances[key]
+        if distribution == 'normal':
+            table[key] = a[key] * (1 + value * rng.standard_normal(size))
+        elif distribution == 'uniform':
+            table[key] = a[key] * (1 + value * rng.uniform(-1, 1, size))
+        else:
+            raise ValueError(f"Распределение не найдено: {distribution}")
+    table['type'] = np.full(size, moduli.TYPE_CODES.get(a['type'], -1), dtype=np.int8)
+    return table
+
+
+def get_curves(table, type_of_loading, x=X, z=Z):
+    """
+    Данная функция вычисляет кривые всех теорий для выборки (как theories.get_curves) и отбрасывает некорректные
+    материалы. Многочлены вычисляются в одинарной точности: ее с запасом хватает для гистограмм (см. BINS), а объем
+    вычислений и памяти вдвое меньше.
+    :return: словарь массивов 'w', 's11', 's13' формы (количество корректных выборок, 4, количество точек).
+    """
+    modules = moduli.get_modules_batch(*(table[key] for key in ('E_c', 'nu_c', 'concentration', 'E_m', 'nu_m')),
+                                       table['type'])
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        polynomials = theories.get_polynomials(modules, table['h'], type_of_loading)
+    valid = modules['flags'] == 0
+    for key in ('w', 's11', 's13'):
+        valid &= np.isfinite(polynomials[key]).all(axis=tuple(range(1, polynomials[key].ndim)))
+    x, z = np.asarray(x, dtype=np.float32), np.asarray(z, dtype=np.float32)
+    return {'w': piecewise_polyval(polynomials['w'][valid].astype(np.float32), polynomials['breaks'], x),
+            's11': polyval(polynomials['s11'][valid].astype(np.float32), z),
+            's13': polyval(polynomials['s13'][valid].astype(np.float32), z)}
+
+
+def get_histograms(curves, edges, bins=BINS):
+    """
+    Данная функция добавляет кривые части выборки в гистограммы (для каждой теории и точки отдельно).
+    :param curves: кривые (см. get_curves).
+    :param edges: границы гистограмм: словарь пар массивов (нижняя граница, ширина интервала) формы (4, точки).
+    :param bins: количество интервалов.
+    :return: словарь массивов количества значений формы (4 * точки, bins).
+    """
+    histograms = {}
+    for key, value in curves.items():
+        lower, width = edges[key]
+        series = lower.size
+        scale = np.divide(1, width, out=np.zeros_like(width), where=width > 0).astype(value.dtype)
+        lower = lower.astype(value.dtype)
+        # Номер интервала вычисляется на месте, чтобы не создавать лишних массивов размера части выборки.
+        index = value - lower
+        index *= scale
+        np.clip(index, 0, bins - 1, out=index)
+        index = index.astype(np.int64)
+        index += np.arange(series).reshape(lower.shape) * bins
+        histograms[key] = np.bincount(index.ravel(), minlength=series * bins).reshape(series, bins)
+    return histograms
+
+
+def get_percentiles(histogram, lower, width, percentiles=PERCENTILES):
+    """
+    Данная функция вычисляет процентили по гистограммам (с линейной интерполяцией внутри интервала).
+    :param histogram: количества значений формы (ряды, bins).
+    :param lower: нижние границы гистограмм формы (ряды,).
+    :param width: ширина интервала формы (ряды,).
+    :param percentiles: процентили.
+    :return: массив формы (len(percentiles), ряды).
+    """
+    cumulative = np.cumsum(histogram, axis=-1)
+    total = cumulative[:, -1:]
+    result = []
+    for q in percentiles:
+        target = q / 100 * total
+        index = np.minimum(np.sum(cumulative < target, axis=-1, keepdims=True), histogram.shape[-1] - 1)
+        before = np.take_along_axis(cumulative, index, axis=-1) - np.take_along_axis(histogram, index, axis=-1)
+        count = np.take_along_axis(histogram, index, axis=-1)
+        fraction = np.divide(target - before, count, out=np.zeros(target.shape), where=count > 0)
+        result.append(lower + (index[:, 0] + fraction[:, 0]) * width)
+    return np.stack(result)
+
+
+def accumulate(a, type_of_loading, edges, seeds, samples, tolerances=TOLERANCES, x=X, z=Z, chunk_size=CHUNK_SIZE,
+               bins=BINS):
+    """
+    Данная функция обрабатывает несколько частей выборки (каждая - со своим генератором случайных чисел, поэтому
+    результат не зависит от распределения частей по процессам) и суммирует их гистограммы.
+    :param seeds: последовательности np.random.SeedSequence для частей.
+    :param samples: объемы частей.
+    :return: гистограммы (см. get_histograms), суммы значений (для средних) и количество корректных выборок.
+    """
+    histograms = {key: np.zeros((lower.size, bins), dtype=np.int64) for key, (lower, _) in edges.items()}
+    sums = {key: np.zeros(lower.size) for key, (lower, _) in edges.items()}
+    valid = 0
+    for seed, size in zip(seeds, samples):
+        curves = get_curves(sample(a, size, tolerances, np.random.default_rng(seed)), type_of_loading, x, z)
+        valid += add(histograms, sums, curves, edges, bins)
+    return histograms, sums, valid
+
+
+def add(histograms, sums, curves, edges, bins=BINS):
+    # Добавляет кривые части выборки к гистограммам и суммам; возвращает количество добавленных выборок.
+    for key, value in get_histograms(curves, edges, bins).items():
+        histograms[key] += value
+        sums[key] += curves[key].sum(axis=0, dtype=float).ravel()
+    return len(curves['w'])
+
+
+def propagate(a, type_of_loading=None, samples=10 ** 6, tolerances=TOLERANCES, percentiles=PERCENTILES, x=X, z=Z,
+              seed=0, workers=1, chunk_size=CHUNK_SIZE, bins=BINS):
+    """
+    Данная функция распространяет неопределенность свойств компонент (метод Монте-Карло) через эффективные модули и
+    все теории изгиба: выборка обрабатывается частями по chunk_size, а процентили кривых в каждой точке вычисляются по
+    гистограммам, поэтому объем памяти не зависит от объема выборки. Границы гистограмм задаются по первой части
+    выборки (см. MARGIN).
+    :param a: данные для примера (подробнее см. файл materials.py).
+    :param type_of_loading: вид нагрузки (по умолчанию из примера).
+    :param samples: объем выборки.
+    :param tolerances: допуски (см. TOLERANCES).
+    :param percentiles: процентили.
+    :param x: точки, в которых вычисляются процентили прогиба.
+    :param z: точки, в которых вычисляются процентили напряжений.
+    :param seed: начальное значение генератора случайных чисел.
+    :param workers: количество параллельных процессов (0 - по числу ядер).
+    :param chunk_size: объем части выборки.
+    :param bins: количество интервалов гистограмм.
+    :return: словарь: 'w', 's11', 's13' - процентили формы (len(percentiles), 4, точки) (теории в порядке
+             theories.THEORIES), 'mean' - средние значения, 'nominal' - кривые для номинальных значений, а также
+             'x', 'z', 'percentiles', 'samples' и 'valid' - объем выборки и количество корректных материалов в ней.
+    """
+    type_of_loading = type_of_loading or a['type_of_loading']
+    workers = workers or os.cpu_count()
+    x, z = np.asarray(x, dtype=float), np.asarray(z, dtype=float)
+    sizes = [min(chunk_size, samples - start) for start in range(0, samples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    # Границы гистограмм - по первой части выборки (она затем обрабатывается вместе с остальными).
+    curves = get_curves(sample(a, sizes[0], tolerances, np.random.default_rng(seeds[0])), type_of_loading, x, z)
+    if not len(curves['w']):
+        raise ValueError("В выборке нет корректных материалов (см. moduli.get_modules_batch)")
+    edges = {}
+    for key, value in curves.items():
+        low, high = np.percentile(value, (min(percentiles) / 2, (100 + max(percentiles)) / 2), axis=0)
+        span = high - low
+        edges[key] = (low - MARGIN * span, span * (1 + 2 * MARGIN) / bins)
+
+    arguments = (tolerances, x, z, chunk_size, bins)
+    histograms, sums, valid = accumulate(a, type_of_loading, edges, [], [], *arguments)
+    valid += add(histograms, sums, curves, edges, bins)
+    parts = []
+    if workers == 1 or len(sizes) <= 2:
+        parts.append(accumulate(a, type_of_loading, edges, seeds[1:], sizes[1:], *arguments))
+    else:
+        # Остальные части выборки распределяются по процессам поровну; каждый процесс строит свои выборки сам.
+        groups = np.array_split(np.arange(1, len(sizes)), min(workers, len(sizes) - 1))
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers,
+                                                    mp_context=multiprocessing.get_context('spawn')) as executor:
+            futures = [executor.submit(accumulate, a, type_of_loading, edges, [seeds[k] for k in group],
+                                       [sizes[k] for k in group], *arguments) for group in groups]
+            parts = [future.result() for future in futures]
+    for part in parts:
+        for key in histograms:
+            histograms[key] += part[0][key]
+            sums[key] += part[1][key]
+        valid += part[2]
+
+    result = {'mean': {}}
+    for key, (lower, width) in edges.items():
+        shape = lower.shape
+        result[key] = get_percentiles(histograms[key], lower.ravel(), width.ravel(), percentiles).reshape(
+            (len(percentiles),) + shape)
+        result['mean'][key] = (sums[key] / valid).reshape(shape)
+
+    modules = moduli.get_modules_batch(a['E_c'], a['nu_c'], a['concentration'], a['E_m'], a['nu_m'],
+                                       moduli.TYPE_CODES.get(a['type'], -1))
+    result['nominal'] = theories.get_curves(modules, a['h'], type_of_loading, x, z)
+    result.update({'x': x, 'z': z, 'percentiles': tuple(percentiles), 'samples': samples, 'valid': valid,
+                   'type_of_loading': type_of_loading})
+    return result
+
+
+def get_bands(result, x, z):
+    """
+    Данная функция возвращает огибающие (крайние процентили) для построения графиков, интерполированные на точки
+    графиков (см. plot.render_material).
+    :param result: результат propagate.
+    :param x: точки графика прогиба.
+    :param z: точки графиков напряжений.
+    :return: словарь: для 'w', 's11', 's13' - списки пар (нижняя, верхняя огибающая) для каждой теории.
+    """
+    bands = {}
+    for key, points, axis in (('w', x, result['x']), ('s11', z, result['z']), ('s13', z, result['z'])):
+        lower, upper = result[key][0], result[key][-1]
+        bands[key] = [(np.interp(points, axis, lower[k]), np.interp(points, axis, upper[k]))
+                      for k in range(len(theories.THEORIES))]
+    return bands
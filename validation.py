@@ -0,0 +1,118 @@
+import argparse
+import csv
+import pathlib
+import numpy as np
+import ansys_catalog
+import ansys_io
+import materials
+import moduli
+import theories
+
+# Величины: название в каталоге ANSYS, ключ в результатах theories.get_curves и масштабирование оси x файла ANSYS
+# (коэффициент растяжения задается как функция толщины пластины, см. plot.render_material).
+QUANTITIES = (('W', 'w', lambda h: (1, 0)),
+              ('SX', 's11', lambda h: (1 / h, 0.5)),
+              ('SXY', 's13', lambda h: (1 / h, 0.5)))
+
+# Столбцы итоговой таблицы.
+COLUMNS = ('name', 'ansys_file_name', 'type', 'concentration', 'h', 'type_of_loading', 'quantity', 'theory',
+           'points', 'l2', 'relative_l2', 'linf', 'relative_linf', 'relative_max')
+
+
+def get_errors(y, fem_x, fem_y):
+    """
+    Данная функция вычисляет отклонения кривых теорий от результатов МКЭ (для массивов NumPy).
+    :param y: значения теорий в точках fem_x: массив формы (..., len(fem_x)).
+    :param fem_x: абсциссы точек МКЭ (по возрастанию).
+    :param fem_y: значения МКЭ.
+    :return: словарь с массивами формы (...): 'l2' - норма L2 отклонения (интеграл по методу трапеций),
+             'relative_l2' - та же норма, деленная на норму L2 результатов МКЭ, 'linf' - максимальное отклонение,
+             'relative_linf' - максимальное отклонение, деленное на максимум модуля результатов МКЭ, 'relative_max' -
+             относительное отклонение максимума модуля (для прогибов - максимального прогиба).
+    """
+    fem_x, fem_y = np.asarray(fem_x, dtype=float), np.asarray(fem_y, dtype=float)
+    error = y - fem_y
+    dx = np.diff(fem_x)
+
+    def norm_l2(f):
+        return np.sqrt(np.sum((f[..., 1:] ** 2 + f[..., :-1] ** 2) / 2 * dx, axis=-1))
+
+    fem_max = np.max(np.abs(fem_y))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {'l2': norm_l2(error),
+                'relative_l2': norm_l2(error) / norm_l2(fem_y),
+                'linf': np.max(np.abs(error), axis=-1),
+                'relative_linf': np.max(np.abs(error), axis=-1) / fem_max,
+                'relative_max': (np.max(np.abs(y), axis=-1) - fem_max) / fem_max}
+
+
+def validate(data=materials.data, catalog=None):
+    """
+    Данная функция сравнивает все теории с результатами ANSYS для всех примеров, не строя графиков. Теории вычисляются
+    непосредственно в абсциссах точек МКЭ (см. theories.get_curves).
+    :param data: список примеров (подробнее см. файл materials.py).
+    :param catalog: каталог файлов с результатами ANSYS (по умолчанию ansys_catalog.get_catalog()).
+    :return: список строк итоговой таблицы (словари со столбцами COLUMNS). Примеры и величины без результатов ANSYS
+             пропускаются с сообщением об ошибке.
+    """
+    data = list(data)
+    catalog = ansys_catalog.get_catalog() if catalog is None else catalog
+
+    # Эффективные модули сразу для всех примеров.
+    table = moduli.get_material_table(data)
+    modules = moduli.get_modules_batch(table['E_c'], table['nu_c'], table['concentration'], table['E_m'],
+                                       table['nu_m'], table['type'])
+
+    rows = []
+    for n, a in enumerate(data):
+        if modules['flags'][n]:
+            print(f"ERROR: некорректные данные примера {a['ansys_file_name']} (flags={modules['flags'][n]})")
+            continue
+        if a['type_of_loading'] not in theories.LOADINGS:
+            print("ERROR: вид нагрузки не найден.")
+            continue
+        for quantity, key, get_scale in QUANTITIES:
+            path = catalog.get_path(a['ansys_file_name'], a['concentration'], a['h'], quantity, a['type_of_loading'])
+            if path is None:
+                print(f"ERROR: нет результатов ANSYS ({quantity}) для примера {a['ansys_file_name']} "
+                      f"(concentration={a['concentration']}, h={a['h']}, {a['type_of_loading']})")
+                continue
+            fem_x, fem_y = ansys_io.load_results(path, *get_scale(a['h']))
+            curves = theories.get_curves(modules[n], a['h'], a['type_of_loading'], x=fem_x, z=fem_x)
+            errors = get_errors(curves[key], fem_x, fem_y)
+            for k, theory in enumerate(theories.THEORIES):
+                row = {column: a[column] for column in COLUMNS[:6]}
+                row.update({'quantity': quantity, 'theory': theory, 'points': fem_x.size})
+                row.update({name: float(value[k]) for name, value in errors.items()})
+                rows.append(row)
+    return rows
+
+
+def write_table(rows, path):
+    """
+    Данная функция записывает итоговую таблицу в CSV-файл.
+    :param rows: строки таблицы (см. validate).
+    :param path: путь к файлу.
+    """
+    pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Сравнение теорий с результатами ANSYS для примеров из "
+                                                 "materials.py (без построения графиков).")
+    parser.add_argument('-o', '--output',
+                        default=str(pathlib.Path(__file__).parent.resolve()) + '/results/validation.csv',
+                        help="путь к итоговой таблице (CSV)")
+    args = parser.parse_args(argv)
+
+    rows = validate()
+    write_table(rows, args.output)
+    print(f"Записано строк: {len(rows)}, таблица: {args.output}")
+
+
+if __name__ == '__main__':
+    main()